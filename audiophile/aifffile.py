@@ -0,0 +1,119 @@
+"""Native parsing of uncompressed AIFF and AIFF-C files.
+
+Headers are described with a `wavefile.WaveInfo`, such that samples can be
+memory-mapped and decoded exactly as for wave files.
+"""
+
+import os
+import struct
+
+import audiophile.wavefile as wavefile
+
+# AIFF-C compression types of uncompressed data, as (byteorder, floating).
+COMPRESSION_TYPES = {
+    b'NONE': ('>', False),
+    b'twos': ('>', False),
+    b'sowt': ('<', False),
+    b'fl32': ('>', True),
+    b'FL32': ('>', True),
+    b'fl64': ('>', True),
+    b'FL64': ('>', True),
+}
+
+
+def _unpack_extended(data):
+    """Unpack an 80-bit IEEE 754 extended precision float.
+
+    Parameters
+    ----------
+    data : bytes
+        Ten big-endian bytes.
+
+    Returns
+    -------
+    value : float
+    """
+    exponent, mantissa = struct.unpack('>HQ', data)
+    sign = -1.0 if exponent & 0x8000 else 1.0
+    exponent &= 0x7FFF
+    if exponent == 0 and mantissa == 0:
+        return 0.0
+    return sign * mantissa * 2.0 ** (exponent - 16383 - 63)
+
+
+def parse_header(filepath):
+    """Parse the header of an AIFF or AIFF-C file.
+
+    Parameters
+    ----------
+    filepath : str
+        Path to an AIFF or AIFF-C file.
+
+    Returns
+    -------
+    info : wavefile.WaveInfo
+        Sample format and location of the sound data.
+
+    Raises
+    ------
+    ValueError
+        If the file is not an uncompressed AIFF / AIFF-C file.
+    """
+    file_size = os.path.getsize(filepath)
+    comm, data_offset = None, None
+    with open(filepath, 'rb') as fp:
+        form = fp.read(12)
+        if len(form) < 12 or form[:4] != b'FORM' or \
+                form[8:] not in [b'AIFF', b'AIFC']:
+            raise ValueError("Not an AIFF file: {}".format(filepath))
+        is_aifc = form[8:] == b'AIFC'
+
+        # The COMM and SSND chunks may appear in either order.
+        while comm is None or data_offset is None:
+            chunk_header = fp.read(8)
+            if len(chunk_header) < 8:
+                break
+            chunk_id, chunk_size = struct.unpack('>4sI', chunk_header)
+            chunk_start = fp.tell()
+
+            if chunk_id == b'COMM':
+                comm = fp.read(chunk_size)
+            elif chunk_id == b'SSND':
+                offset, _ = struct.unpack('>II', fp.read(8))
+                data_offset = chunk_start + 8 + offset
+                data_size = chunk_size - 8 - offset
+            fp.seek(chunk_start + chunk_size + chunk_size % 2)
+
+    if comm is None or data_offset is None:
+        raise ValueError("Missing COMM or SSND chunk: {}".format(filepath))
+    elif len(comm) < 18:
+        raise ValueError("Truncated COMM chunk: {}".format(filepath))
+
+    channels, num_frames, bits = struct.unpack('>hIh', comm[:8])
+    samplerate = _unpack_extended(comm[8:18])
+    byteorder, floating = '>', False
+    if is_aifc:
+        compression = comm[18:22]
+        if compression not in COMPRESSION_TYPES:
+            raise ValueError("Unsupported AIFF-C compression {!r}: {}"
+                             "".format(compression, filepath))
+        byteorder, floating = COMPRESSION_TYPES[compression]
+
+    # Samples are left-justified in whole bytes.
+    bytedepth = (bits + 7) // 8
+    if floating:
+        # Float types imply their own sample size.
+        bytedepth = 8 if compression.lower() == b'fl64' else 4
+    elif bytedepth not in [1, 2, 3, 4]:
+        raise ValueError("Unsupported bitdepth {}: {}".format(bits, filepath))
+    if channels < 1:
+        raise ValueError("Invalid channel count: {}".format(filepath))
+
+    # Trust neither header nor chunk sizes over the file's actual length.
+    block_align = channels * bytedepth
+    data_size = min(data_size, file_size - data_offset)
+    return wavefile.WaveInfo(
+        samplerate=samplerate, channels=channels, bytedepth=bytedepth,
+        floating=floating, data_offset=data_offset,
+        num_samples=max(0, min(num_frames, data_size // block_align)),
+        byteorder=byteorder, signed=True, channel_mask=None)
@@ -0,0 +1,176 @@
+"""Asynchronous counterparts of the SoX utilities, for use with asyncio.
+
+Each function runs SoX as an asyncio subprocess, which is killed if the
+awaiting task is cancelled or its timeout expires. Arguments and return values
+match those of the functions of the same name in `audiophile.sox`, plus a
+`timeout` in seconds.
+
+This module requires Python 3.5 or later, and is not imported by
+`audiophile` itself:
+
+    >>> import asyncio
+    >>> import audiophile.asox as asox
+    >>> asyncio.get_event_loop().run_until_complete(
+    ...     asox.convert('input.flac', 'output.wav', samplerate=16000))
+"""
+
+import asyncio
+import logging
+import os
+
+import audiophile.formats as formats
+import audiophile.sox as sox
+import audiophile.util as util
+
+logger = logging.getLogger(__name__)
+
+
+async def _assert_sox():
+    """`sox.assert_sox`, probing for SoX in an executor on first use so that
+    the event loop is never blocked.
+    """
+    if sox.__SOX_HELP__ is None:
+        await asyncio.get_event_loop().run_in_executor(None, sox._sox_help)
+    sox.assert_sox()
+
+
+async def _sox(args, timeout=None):
+    """Pass an argument list to SoX, without blocking the event loop.
+
+    Parameters
+    ----------
+    args : list
+        Argument list for SoX; see `sox._sox`.
+
+    timeout : float, default=None
+        Maximum time in seconds to wait for SoX.
+
+    Returns
+    -------
+    status : bool
+        True on success.
+
+    Raises
+    ------
+    asyncio.TimeoutError
+        If SoX does not finish within `timeout`.
+    """
+    await _assert_sox()
+    if args[0].lower() != "sox":
+        args.insert(0, "sox")
+    else:
+        args[0] = "sox"
+
+    logger.debug("Executing: %s", " ".join(args))
+    try:
+        process = await asyncio.create_subprocess_exec(
+            *args, stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.PIPE)
+    except OSError as error_msg:
+        logger.error("OSError: SoX failed! %s", error_msg)
+        return False
+
+    _, stderr = await _communicate(process, timeout)
+    if process.returncode != 0:
+        logger.error("SoX failed: %s",
+                     stderr.decode("utf-8", "replace").strip())
+    return process.returncode == 0
+
+
+async def _communicate(process, timeout=None):
+    """Wait for an asyncio subprocess, killing it if interrupted."""
+    try:
+        return await asyncio.wait_for(process.communicate(), timeout)
+    except BaseException:
+        if process.returncode is None:
+            process.kill()
+            await process.wait()
+        raise
+
+
+async def convert(input_file, output_file, samplerate=None, channels=None,
+                  bytedepth=None, start_time=None, duration=None,
+                  timeout=None):
+    """Asynchronous `sox.convert`."""
+    if output_file is None:
+        output_file = util.temp_file(formats.WAVE)
+    return await _sox(
+        sox._convert_args(input_file, output_file, samplerate=samplerate,
+                          channels=channels, bytedepth=bytedepth,
+                          start_time=start_time, duration=duration),
+        timeout=timeout)
+
+
+async def trim(input_file, output_file, start_time, end_time, timeout=None):
+    """Asynchronous `sox.trim`."""
+    inplace = not bool(output_file)
+    if inplace:
+        output_file = util.temp_file(os.path.splitext(input_file)[-1])
+
+    status = await _sox(sox._trim_args(input_file, output_file, start_time,
+                                       end_time), timeout=timeout)
+    if inplace and status:
+        os.rename(output_file, input_file)
+    return status
+
+
+async def pad(input_file, output_file, start_duration=0, end_duration=0,
+              timeout=None):
+    """Asynchronous `sox.pad`."""
+    return await _sox(sox._pad_args(input_file, output_file, start_duration,
+                                    end_duration), timeout=timeout)
+
+
+async def fade(input_file, output_file, fade_in_time=1, fade_out_time=8,
+               fade_shape='q', timeout=None):
+    """Asynchronous `sox.fade`."""
+    return await _sox(sox._fade_args(input_file, output_file, fade_in_time,
+                                     fade_out_time, fade_shape),
+                      timeout=timeout)
+
+
+async def mix(file_list, output_file, timeout=None):
+    """Asynchronous `sox.mix`."""
+    return await _sox(sox._mix_args(file_list, output_file), timeout=timeout)
+
+
+async def concatenate(file_list, output_file, timeout=None):
+    """Asynchronous `sox.concatenate`."""
+    return await _sox(sox._concatenate_args(file_list, output_file),
+                      timeout=timeout)
+
+
+async def normalize(input_file, output_file, db_level=-3, timeout=None):
+    """Asynchronous `sox.normalize`."""
+    return await _sox(sox._normalize_args(input_file, output_file, db_level),
+                      timeout=timeout)
+
+
+async def apply(chain, input_file, output_file, samplerate=None,
+                channels=None, bytedepth=None, timeout=None):
+    """Asynchronous `sox.EffectsChain.apply`.
+
+    Parameters
+    ----------
+    chain : sox.EffectsChain
+        Effects to run over the file, in a single SoX process.
+    """
+    return await _sox(chain._command(input_file, output_file, samplerate,
+                                     channels, bytedepth), timeout=timeout)
+
+
+async def soxi(filepath, argument=None, timeout=None):
+    """Asynchronous `sox.soxi`."""
+    args = sox._soxi_args(filepath, argument)
+    try:
+        process = await asyncio.create_subprocess_exec(
+            *args, stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE)
+    except OSError as error_msg:
+        raise ValueError("Soxi could not be run: {}".format(error_msg))
+    shell_output, stderr = await _communicate(process, timeout)
+    if process.returncode != 0:
+        logger.info("Soxi error message: {}".format(stderr))
+        raise ValueError("Soxi failed with exit code {}"
+                         "".format(process.returncode))
+    return sox._parse_soxi(shell_output, argument)
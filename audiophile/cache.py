@@ -0,0 +1,307 @@
+"""Persistent, content-addressed cache of SoX conversions.
+
+Converted wave files are stored under a key derived from the source file's
+path, size and modification time, and the conversion parameters. The cache is
+opt-in; once enabled, every conversion `audiophile.fileio` performs checks it
+first:
+
+    >>> import audiophile.cache
+    >>> audiophile.cache.enable('/scratch/audiophile', max_bytes=50 * 2 ** 30)
+
+Entries are published with atomic renames, and eviction is serialized with a
+lock file, so several processes may safely share one cache directory.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+import audiophile.formats as formats
+import audiophile.sox as sox
+
+logger = logging.getLogger(__name__)
+
+__DEFAULT_CACHE__ = None
+
+LOCK_FILE = '.lock'
+
+# Number of times to convert an entry that is evicted before it is opened.
+OPEN_ATTEMPTS = 3
+
+# Atomic rename, replacing any existing file; os.rename on python 2.
+_replace = getattr(os, 'replace', os.rename)
+
+
+class ConversionCache(object):
+    """A directory of converted wave files with a size budget."""
+
+    def __init__(self, directory, max_bytes=None):
+        """Create (or attach to) a cache directory.
+
+        Parameters
+        ----------
+        directory : str
+            Directory in which to store converted files; created if needed.
+
+        max_bytes : int, default=None
+            Total size budget. When exceeded, the least-recently used entries
+            are evicted. If None, the cache grows without bound.
+        """
+        self._directory = os.path.abspath(directory)
+        self._max_bytes = max_bytes
+        if not os.path.isdir(self._directory):
+            os.makedirs(self._directory)
+
+    @property
+    def directory(self):
+        return self._directory
+
+    @property
+    def max_bytes(self):
+        return self._max_bytes
+
+    def key(self, filepath, **conversion):
+        """Compute the cache key for a conversion of a file.
+
+        Parameters
+        ----------
+        filepath : str
+            Source file.
+
+        conversion : dict
+            Keyword arguments to `sox.convert`.
+
+        Returns
+        -------
+        key : str
+            Hex digest identifying the source contents and conversion.
+        """
+        stat = os.stat(filepath)
+        identity = dict(filepath=os.path.abspath(filepath),
+                        size=stat.st_size, mtime=stat.st_mtime,
+                        conversion=conversion)
+        return hashlib.sha1(json.dumps(
+            identity, sort_keys=True).encode('utf-8')).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self._directory,
+                            "{}.{}".format(key, formats.WAVE))
+
+    def lookup(self, filepath, **conversion):
+        """Find a cached conversion of a file, without converting it.
+
+        Returns
+        -------
+        cached_filepath : str, or None
+            Path to the converted wave file, if present.
+        """
+        path = self._path(self.key(filepath, **conversion))
+        try:
+            # Refresh the entry's recency for LRU eviction.
+            os.utime(path, None)
+        except OSError:
+            return None
+        return path
+
+    def convert(self, filepath, **conversion):
+        """Return a converted copy of a file, converting only on a miss.
+
+        Parameters
+        ----------
+        filepath : str
+            Source file.
+
+        conversion : dict
+            Keyword arguments to `sox.convert`.
+
+        Returns
+        -------
+        cached_filepath : str
+            Path to the converted wave file within the cache.
+        """
+        key = self.key(filepath, **conversion)
+        path = self._path(key)
+        try:
+            os.utime(path, None)
+            logger.debug("Cache hit for %s: %s", filepath, path)
+            return path
+        except OSError:
+            pass
+
+        logger.debug("Cache miss for %s; converting.", filepath)
+        handle, temp_path = tempfile.mkstemp(
+            prefix='.', suffix='.' + formats.WAVE, dir=self._directory)
+        os.close(handle)
+        try:
+            if not sox.convert(input_file=filepath, output_file=temp_path,
+                               **conversion):
+                raise ValueError("SoX conversion failed for '{}'."
+                                 "".format(filepath))
+            # Publish atomically; concurrent writers of a key are harmless.
+            try:
+                _replace(temp_path, path)
+            except OSError:
+                # Without os.replace, Windows cannot rename onto an entry
+                # another process has just published; use theirs.
+                if not os.path.exists(path):
+                    raise
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+        self.evict(keep=[path])
+        return path
+
+    def open(self, filepath, opener, **conversion):
+        """Convert a file only on a miss, and open the cached conversion.
+
+        Another process may evict an entry after `convert` returns its path
+        but before it is opened, in which case it is converted again.
+
+        Parameters
+        ----------
+        filepath : str
+            Source file.
+
+        opener : callable
+            Opens a cached path, e.g. `wavefile.MappedWave`. Once open, an
+            entry stays readable even if evicted.
+
+        conversion : dict
+            Keyword arguments to `sox.convert`.
+
+        Returns
+        -------
+        cached_filepath : str
+            Path to the converted wave file within the cache.
+
+        handle : object
+            Return value of `opener` for `cached_filepath`.
+        """
+        for attempt in range(OPEN_ATTEMPTS):
+            path = self.convert(filepath, **conversion)
+            try:
+                return path, opener(path)
+            except (IOError, OSError):
+                if os.path.exists(path) or attempt + 1 == OPEN_ATTEMPTS:
+                    raise
+                logger.debug("%s was evicted before it was opened.", path)
+
+    def entries(self):
+        """List cached files, from least to most recently used.
+
+        Returns
+        -------
+        entries : list of tuples
+            (path, size, last_used) for each cached file.
+        """
+        entries = []
+        for name in os.listdir(self._directory):
+            if name.startswith('.'):
+                continue
+            path = os.path.join(self._directory, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                # Evicted by another process.
+                continue
+            entries.append((path, stat.st_size, stat.st_mtime))
+        return sorted(entries, key=lambda entry: entry[2])
+
+    def size(self):
+        """Total size in bytes of all cached files."""
+        return sum(entry[1] for entry in self.entries())
+
+    def evict(self, keep=None):
+        """Remove least-recently used files until within the size budget.
+
+        Parameters
+        ----------
+        keep : list of str, default=None
+            Paths that must not be evicted, e.g. one just added.
+        """
+        if self._max_bytes is None:
+            return
+        keep = set(keep or [])
+        with _Lock(os.path.join(self._directory, LOCK_FILE)):
+            entries = self.entries()
+            total = sum(entry[1] for entry in entries)
+            for path, size, _ in entries:
+                if total <= self._max_bytes:
+                    break
+                if path in keep:
+                    continue
+                try:
+                    os.remove(path)
+                    logger.debug("Evicted %s", path)
+                except OSError:
+                    pass
+                total -= size
+
+    def clear(self):
+        """Remove every cached file."""
+        with _Lock(os.path.join(self._directory, LOCK_FILE)):
+            for path, _, _ in self.entries():
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+
+class _Lock(object):
+    """Exclusive advisory file lock; a no-op where fcntl is unavailable."""
+
+    def __init__(self, lockfile):
+        self._lockfile = lockfile
+        self._handle = None
+
+    def __enter__(self):
+        self._handle = open(self._lockfile, 'a')
+        if fcntl is not None:
+            fcntl.flock(self._handle, fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, *exc):
+        if fcntl is not None:
+            fcntl.flock(self._handle, fcntl.LOCK_UN)
+        self._handle.close()
+        self._handle = None
+
+
+def enable(directory, max_bytes=None):
+    """Route all conversions through a cache in the given directory.
+
+    Parameters
+    ----------
+    directory : str
+        Cache directory; see ConversionCache.
+
+    max_bytes : int, default=None
+        Size budget; see ConversionCache.
+
+    Returns
+    -------
+    cache : ConversionCache
+        The newly active cache.
+    """
+    global __DEFAULT_CACHE__
+    __DEFAULT_CACHE__ = ConversionCache(directory, max_bytes=max_bytes)
+    return __DEFAULT_CACHE__
+
+
+def disable():
+    """Stop caching conversions; cached files are left in place."""
+    global __DEFAULT_CACHE__
+    __DEFAULT_CACHE__ = None
+
+
+def get_default():
+    """Return the active ConversionCache, or None if caching is disabled."""
+    return __DEFAULT_CACHE__
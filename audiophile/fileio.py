@@ -1,23 +1,38 @@
 """Interfaces for dealing with audio files."""
 
+import collections
+import itertools
 import logging
 import numpy as np
 import os
+import six
 import warnings
-import wave
 
+import audiophile.cache as cache
 import audiophile.formats as formats
+import audiophile.ops as ops
 import audiophile.sox as sox
+import audiophile.soxstream as soxstream
 import audiophile.util as util
+import audiophile.wavefile as wavefile
 
 logger = logging.getLogger(__name__)
 
+# Number of samples decoded at a time when reading whole files; bounds the
+# size of any intermediate buffers.
+BLOCK_SIZE = 2 ** 16
+
+# Signals of at least this many bytes are returned from `read_many` workers
+# through shared memory rather than by pickling.
+SHARED_MEMORY_THRESHOLD = 2 ** 20
+
 
 class AudioFile(object):
     """Abstract AudioFile base class."""
 
     def __init__(self, filepath, samplerate=None, channels=None,
-                 bytedepth=None, mode="r"):
+                 bytedepth=None, mode="r", start=None, duration=None,
+                 stream=False):
         """Base class for interfacing with audio files.
 
         When writing audio files, samplerate, channels, and bytedepth must be
@@ -40,13 +55,38 @@ class AudioFile(object):
             audio has a bytedepth of 2 (16-bit).
 
         mode : str, default='r'
-            Open the file for [r]eading or [w]riting.
+            Open the file for [r]eading, [w]riting or [a]ppending. When
+            writing or appending, blocks of samples are encoded as they are
+            passed to `write`, so memory use is independent of the length of
+            the file. Only wave files may be appended to, and they must match
+            the given sample format.
+
+        start : float, default=None
+            When reading, time in seconds at which the file begins; earlier
+            samples are never decoded.
+
+        duration : float, default=None
+            When reading, maximum duration in seconds of the file, from
+            `start`; defaults to the remainder of the file.
+
+        stream : bool, default=False
+            When reading a file that requires conversion, decode it through a
+            pipe from SoX rather than converting it to a temporary file first.
+            Samples are then available immediately, but only in increasing
+            order; the first out-of-order read falls back to a full
+            conversion.
         """
         logger.debug(util.classy_print(AudioFile, "Constructor."))
         if not sox.is_valid_file_format(filepath):
             raise ValueError("Cannot handle this filetype: {}"
                              "".format(filepath))
-        if mode == "w":
+        if mode not in ["r", "w", "a"]:
+            raise ValueError("Unsupported mode: {}".format(mode))
+        elif mode == "a" and \
+                os.path.splitext(filepath)[-1].strip('.') != formats.WAVE:
+            raise ValueError("Only wave files may be appended to: {}"
+                             "".format(filepath))
+        elif mode in ["w", "a"]:
             # TODO: If/raise
             assert samplerate, "Writing audiofiles requires a samplerate."
             assert channels, "Writing audiofiles requires channels."
@@ -55,15 +95,19 @@ class AudioFile(object):
         self._filepath = filepath
         self._wave_handle = None
         self._temp_filepath = util.temp_file(formats.WAVE)
+        self._converted_filepath = None
 
         self._mode = mode
+        self._stream = stream
         logger.debug(util.classy_print(AudioFile, "Opening wave file."))
-        self.__get_handle__(self.filepath, samplerate, channels, bytedepth)
+        self.__get_handle__(self.filepath, samplerate, channels, bytedepth,
+                            start, duration)
         logger.debug(util.classy_print(AudioFile, "Success!"))
-        if self.duration == 0:
+        if self._mode == 'r' and self.duration == 0:
             warnings.warn("Caution: You have opened an empty sound file!")
 
-    def __get_handle__(self, filepath, samplerate, channels, bytedepth):
+    def __get_handle__(self, filepath, samplerate, channels, bytedepth,
+                       start=None, duration=None):
         """Get hooks into a wave object for reading or writing.
 
         Parameters
@@ -72,9 +116,14 @@ class AudioFile(object):
         samplerate : float
         channels : int
         bytedepth : int
+        start : float
+        duration : float
 
         On success, creates an open wave file handle corresponding to
-        filepath, or a tempfile after a successful SoX conversion.
+        filepath, or a tempfile after a successful SoX conversion. Files are
+        read through a memory-mapped `wavefile.MappedWave`. Time ranges are
+        applied by offsetting the mapping of native files, and by trimming
+        during conversion otherwise.
 
         Note: This could probably be pulled out into a standalone function,
         but using class members makes this a little cleaner. Something to
@@ -83,40 +132,144 @@ class AudioFile(object):
         self._CONVERT = False
         if self._mode == 'r':
             try:
-                self._wave_handle = wave.open(filepath, 'r')
+                self._wave_handle = wavefile.MappedWave(
+                    filepath, info=ops.parse_header(filepath))
                 if bytedepth and self.bytedepth != bytedepth:
                     self._CONVERT = True
                 if samplerate and self.samplerate != samplerate:
                     self._CONVERT = True
                 if channels and self.channels != channels:
                     self._CONVERT = True
-            except wave.Error:
+            except ValueError:
                 self._CONVERT = True
 
             if self._CONVERT:
-                # TODO: Catch status, raise on != 0
-                assert sox.convert(input_file=filepath,
-                                   output_file=self._temp_filepath,
-                                   samplerate=samplerate,
-                                   bytedepth=bytedepth,
-                                   channels=channels), \
-                    "SoX Conversion failed for '%s'." % filepath
-                self._wave_handle = wave.open(self._temp_filepath, 'r')
+                if self._wave_handle:
+                    self._wave_handle.close()
+                self._conversion = dict(
+                    samplerate=samplerate, channels=channels,
+                    bytedepth=bytedepth, start_time=start, duration=duration)
+                # A cached conversion, if any, is preferable to a stream.
+                conversion_cache = cache.get_default()
+                cached = conversion_cache is not None and \
+                    conversion_cache.lookup(filepath, **self._conversion)
+                if self._stream and not cached:
+                    self._wave_handle = soxstream.SoxStream(
+                        filepath, samplerate=samplerate, channels=channels,
+                        bytedepth=bytedepth, start=start, duration=duration)
+                else:
+                    self._convert()
+            elif start or duration is not None:
+                first = int(np.round((start or 0) * self.samplerate))
+                last = None
+                if duration is not None:
+                    last = first + int(np.round(duration * self.samplerate))
+                self._wave_handle = wavefile.MappedWave(
+                    filepath, info=self._wave_handle.info,
+                    start=first, stop=last)
         else:
             fmt_ext = os.path.splitext(self.filepath)[-1].strip('.')
-            if fmt_ext == formats.WAVE:
-                self._wave_handle = wave.open(self.filepath, self._mode)
-            else:
+            wave_filepath = self.filepath
+            if fmt_ext != formats.WAVE:
                 # To write out non-wave files, need a temp wave object first.
                 self._CONVERT = True
-                self._wave_handle = wave.open(
-                    self._temp_filepath, self._mode)
+                self._converted_filepath = self._temp_filepath
+                wave_filepath = self._temp_filepath
+            self._wave_handle = wavefile.WaveWriter(
+                wave_filepath, samplerate, channels, bytedepth,
+                append=self._mode == 'a')
+
+    def write(self, signal):
+        """Encode and append a block of samples to a file open for writing.
+
+        Parameters
+        ----------
+        signal : np.ndarray, ndim in [1,2]
+            Samples shaped (num_samples, channels), in [-1.0, 1.0).
+        """
+        if self._mode == 'r':
+            raise ValueError("File not open for writing: {}"
+                             "".format(self.filepath))
+        self._wave_handle.write(signal)
+
+    def _convert(self):
+        """Convert the source file to a wave file, and open it.
+
+        Conversions are taken from the active `cache.ConversionCache`, if any,
+        and written to a temporary file otherwise.
+        """
+        conversion_cache = cache.get_default()
+        if conversion_cache is not None:
+            self._converted_filepath, self._wave_handle = \
+                conversion_cache.open(self.filepath, wavefile.MappedWave,
+                                      **self._conversion)
+        else:
+            sox.check_convert(self.filepath, self._temp_filepath,
+                              **self._conversion)
+            self._converted_filepath = self._temp_filepath
+            self._wave_handle = wavefile.MappedWave(self._converted_filepath)
+
+    def _read_samples(self, start, count, dtype=np.float64, out=None):
+        """Decode up to `count` samples of the open file, from `start`.
+
+        Parameters
+        ----------
+        start : int
+            Index of the first sample, on [0, num_samples].
+
+        count : int
+            Maximum number of samples to decode.
+
+        dtype : np.dtype, default=np.float64
+            Data type of the returned array; see `pcm.decode`.
+
+        out : np.ndarray, default=None
+            If given, decode into this array, which must have shape
+            (N, channels) for the number of samples N actually available.
+
+        Returns
+        -------
+        samples : np.ndarray
+            Array with shape (N, channels), for N <= count.
+        """
+        try:
+            return self._wave_handle.read(int(start), int(count), dtype=dtype,
+                                          out=out)
+        except soxstream.SeekError:
+            # Random access into a stream; spool everything to disk.
+            logger.debug(util.classy_print(
+                AudioFile, "Out-of-order read; converting to temp file."))
+            self._wave_handle.close()
+            self._stream = False
+            self._convert()
+            return self._read_samples(start, count, dtype=dtype, out=out)
+
+    def read_into(self, out, start=0):
+        """Decode samples into a pre-allocated array, in bounded blocks.
+
+        Parameters
+        ----------
+        out : np.ndarray, shape=(N, channels)
+            Destination array; may be memory-mapped.
 
-            # Set file parameters
-            # TODO: Encapsulate?
-            self._wave_handle.setframerate(samplerate)
-            self._wave_handle.setsampwidth(bytedepth)
-            self._wave_handle.setnchannels(channels)
+        start : int, default=0
+            Index of the first sample to read.
+
+        Returns
+        -------
+        num_samples : int
+            Number of samples written to `out`, i.e. min(N, available).
+        """
+        if out.ndim != 2 or out.shape[1] != self.channels:
+            raise ValueError("Expected an array shaped (N, {}), received {}"
+                             "".format(self.channels, out.shape))
+        start = int(start)
+        num_samples = max(0, min(len(out), self.num_samples - start))
+        for index in range(0, num_samples, BLOCK_SIZE):
+            count = min(BLOCK_SIZE, num_samples - index)
+            self._read_samples(start + index, count,
+                               out=out[index:index + count])
+        return num_samples
 
     def reset(self):
         """
@@ -134,7 +287,8 @@ class AudioFile(object):
         logger.debug(util.classy_print(AudioFile, "Cleaning up."))
         if self._wave_handle:
             self._wave_handle.close()
-        if self._mode == 'w' and self._CONVERT:
+        if self._mode == 'w' and self._CONVERT and \
+                os.path.exists(self._temp_filepath):
             logger.debug(
                 util.classy_print(AudioFile,
                                   "Conversion required for writing."))
@@ -149,6 +303,12 @@ class AudioFile(object):
                                            "Temporary file deleted."))
             os.remove(self._temp_filepath)
 
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
     def __del__(self):
         """Implicit destructor."""
         self.close()
@@ -197,7 +357,8 @@ class AudioFile(object):
         """Return the filename of the active (opened) wave file.
         """
         if self._CONVERT:
-            return self._temp_filepath
+            # None while samples are piped from SoX.
+            return self._converted_filepath
         else:
             return self._filepath
 
@@ -228,7 +389,7 @@ class FramedAudioFile(AudioFile):
     def __init__(self, filepath, framesize,
                  samplerate=None, channels=None, bytedepth=None, mode='r',
                  time_points=None, framerate=None, stride=None, overlap=0.5,
-                 alignment='center', offset=0):
+                 alignment='center', offset=0, stream=False):
         """Frame-based audio file parsing.
 
         Parameters
@@ -269,6 +430,9 @@ class FramedAudioFile(AudioFile):
         offset : scalar, default = 0
             Time in seconds to shift the alignment of a frame.
 
+        stream : bool, default = False
+            Stream files that require conversion from SoX; see AudioFile.
+
         Notes
         -----
         For frame-based audio processing, there are a few roughly equivalent
@@ -296,7 +460,7 @@ class FramedAudioFile(AudioFile):
         logger.debug(util.classy_print(FramedAudioFile, "Constructor."))
         super(FramedAudioFile, self).__init__(
             filepath, samplerate=samplerate, channels=channels,
-            bytedepth=bytedepth, mode=mode)
+            bytedepth=bytedepth, mode=mode, stream=stream)
 
         self._framesize = framesize
         self._alignment = alignment
@@ -379,7 +543,7 @@ class FramedAudioFile(AudioFile):
             vector of times, or "uniform"
         """
 
-        if time_points == 'uniform':
+        if isinstance(time_points, str) and time_points == 'uniform':
             # If uniform, compute fixed stride.
             time_points = self._compute_uniform_time_points()
 
@@ -526,34 +690,74 @@ class FramedAudioFile(AudioFile):
 
         time_point = self._time_points[self._time_index]
         self._time_index += 1
+        return float(self._align_time_points(time_point))
 
+    def _align_time_points(self, time_points):
+        """Convert time points to LEFT-ALIGNED frame start times.
+
+        Parameters
+        ----------
+        time_points : scalar or array_like
+            Absolute points in time, in seconds.
+
+        Returns
+        -------
+        start_times : np.ndarray
+            Frame start times, accounting for alignment and offset.
+        """
+        start_times = np.asarray(time_points, dtype=float)
         if self.alignment == 'center':
-            time_point -= 0.5 * self.framesize / self.samplerate
+            start_times = start_times - 0.5 * self.framesize / self.samplerate
         elif self.alignment == 'right':
-            time_point -= self.framesize / self.samplerate
+            start_times = start_times - self.framesize / self.samplerate
 
-        time_point += self.offset
-        return time_point
+        return start_times + self.offset
 
     def _time_point_to_sample_index(self, time_point):
         """Convert a floating-point time to integert samples."""
         return int(np.round(time_point * self.samplerate))
 
+    def _time_points_to_sample_indices(self, time_points):
+        """Vectorized counterpart to `_time_point_to_sample_index`."""
+        return np.round(np.asarray(time_points) *
+                        self.samplerate).astype(np.int64)
+
 
 class FramedAudioReader(FramedAudioFile):
     """TODO(ejhumphrey): Write me."""
     def __init__(self, filepath, framesize,
                  samplerate=None, channels=None, bytedepth=None,
                  overlap=0.5, stride=None, framerate=None, time_points=None,
-                 alignment='center', offset=0):
+                 alignment='center', offset=0, stream=False,
+                 dtype=np.float64):
+        """Frame-based audio file reading; see FramedAudioFile.
 
+        Parameters
+        ----------
+        dtype : np.dtype, default=np.float64
+            Data type of the frames read. Floating-point types are scaled to
+            [-1.0, 1.0); signed integer types receive the stored sample
+            values as-is, and must be at least `bytedepth` bytes wide.
+        """
         # Always read.
         mode = 'r'
         logger.debug(util.classy_print(FramedAudioReader, "Constructor."))
         self._wave_handle = None
+        self._dtype = np.dtype(dtype)
         super(FramedAudioReader, self).__init__(
             filepath, framesize, samplerate, channels, bytedepth, mode,
-            time_points, framerate, stride, overlap, alignment, offset)
+            time_points, framerate, stride, overlap, alignment, offset,
+            stream)
+
+    @property
+    def dtype(self):
+        """
+        Returns
+        -------
+        dtype : np.dtype
+            Data type of the frames read.
+        """
+        return self._dtype
 
     def read_frame_at_index(self, sample_index, framesize=None):
         """Read 'framesize' samples starting at 'sample_index'.
@@ -571,7 +775,7 @@ class FramedAudioReader(FramedAudioFile):
             framesize = self.framesize
 
         frame_index = 0
-        frame = np.zeros([framesize, self.channels])
+        frame = np.zeros([framesize, self.channels], dtype=self.dtype)
 
         # Check boundary conditions
         if sample_index < 0 and sample_index + framesize > 0:
@@ -585,11 +789,8 @@ class FramedAudioReader(FramedAudioFile):
 
         logger.debug(util.classy_print(
             FramedAudioReader, "sample_index = %d" % sample_index))
-        self._wave_handle.setpos(sample_index)
-        newdata = util.byte_string_to_array(
-            byte_string=self._wave_handle.readframes(int(framesize)),
-            channels=self.channels,
-            bytedepth=self.bytedepth)
+        newdata = self._read_samples(sample_index, framesize,
+                                     dtype=frame.dtype)
 
         # Place new data within the frame
         frame[frame_index:frame_index + newdata.shape[0]] = newdata
@@ -610,6 +811,116 @@ class FramedAudioReader(FramedAudioFile):
         return self.read_frame_at_index(
             self._time_point_to_sample_index(time_point), framesize)
 
+    def read_frames_at_indices(self, sample_indices, framesize=None):
+        """Read a batch of frames starting at arbitrary sample indices.
+
+        Memory-mapped files are gathered with a single vectorized index and
+        decode. Streams are read in runs of overlapping or abutting frames,
+        such that each distinct region is decoded exactly once, regardless of
+        the order in which indices are given.
+
+        Parameters
+        ----------
+        sample_indices : array_like of int
+            Index of the first sample of each frame; may be unordered, and
+            may fall outside the bounds of the file.
+
+        framesize : int, default=None
+            Number of samples per frame; defaults to the current framesize.
+
+        Returns
+        -------
+        frames : np.ndarray
+            Array with shape (len(sample_indices), framesize, channels), in
+            the order of `sample_indices`.
+        """
+        if not framesize:
+            framesize = self.framesize
+        framesize = int(framesize)
+
+        start_indices = np.asarray(sample_indices, dtype=np.int64).ravel()
+        frames = np.zeros([len(start_indices), framesize, self.channels],
+                          dtype=self.dtype)
+
+        # Windows entirely outside the file stay zero.
+        in_range = np.flatnonzero((start_indices + framesize > 0) &
+                                  (start_indices < self.num_samples))
+        if not len(in_range):
+            return frames
+
+        if isinstance(self._wave_handle, wavefile.MappedWave):
+            frames[in_range] = self._wave_handle.read_frames(
+                start_indices[in_range], framesize, dtype=self.dtype)
+            return frames
+
+        # Sort the windows of a stream, and split wherever one begins after
+        # the previous one ends; each resulting run is a single read.
+        order = in_range[np.argsort(start_indices[in_range],
+                                    kind='mergesort')]
+        sorted_starts = start_indices[order]
+        run_bounds = np.flatnonzero(
+            sorted_starts[1:] > sorted_starts[:-1] + framesize) + 1
+        run_bounds = np.concatenate([[0], run_bounds, [len(order)]])
+
+        for first, last in zip(run_bounds[:-1], run_bounds[1:]):
+            read_start = max(sorted_starts[first], 0)
+            read_stop = min(sorted_starts[last - 1] + framesize,
+                            self.num_samples)
+            signal = self._read_samples(read_start, read_stop - read_start,
+                                        dtype=self.dtype)
+            frames[order[first:last]] = _frame_signal(
+                signal, sorted_starts[first:last] - read_start, framesize)
+        return frames
+
+    def read_frames_at_times(self, time_points):
+        """Read a batch of frames aligned to arbitrary points in time.
+
+        Time points are aligned exactly as when iterating over `time_points`,
+        i.e. subject to the current alignment and offset.
+
+        Parameters
+        ----------
+        time_points : array_like
+            Absolute points in time, in seconds; may be unordered.
+
+        Returns
+        -------
+        frames : np.ndarray
+            Array with shape (len(time_points), framesize, channels), in the
+            order of `time_points`.
+        """
+        return self.read_frames_at_indices(
+            self._time_points_to_sample_indices(
+                self._align_time_points(time_points)))
+
+    def read_frames(self):
+        """Read every frame on the current time grid at once.
+
+        The file is decoded a single time, directly into a buffer with room
+        for any zero-padding where frames extend past either end of the file,
+        and frames are sliced out of that buffer.
+
+        Returns
+        -------
+        frames : np.ndarray
+            Array with shape (num_frames, framesize, channels). When frames
+            are evenly spaced, this is a read-only strided view, and adjacent
+            frames share memory.
+        """
+        start_indices = self._time_points_to_sample_indices(
+            self._align_time_points(self.time_points))
+        padding = _frame_padding(start_indices, self.framesize,
+                                 self.num_samples)
+        if padding is None:
+            signal = self._read_samples(0, self.num_samples, dtype=self.dtype)
+            return _frame_signal(signal, start_indices, self.framesize)
+
+        pad_left, pad_right = padding
+        buffer = np.zeros([pad_left + self.num_samples + pad_right,
+                           self.channels], dtype=self.dtype)
+        self.read_into(buffer[pad_left:pad_left + self.num_samples])
+        return _frame_signal(buffer, start_indices + pad_left, self.framesize)
+
     def next(self):
         # For python 2.
         if not self.end_of_file:
@@ -626,8 +937,221 @@ class FramedAudioReader(FramedAudioFile):
         return self.next()
 
 
-def read(filepath, samplerate=None, channels=None, bytedepth=None):
-    """Read the entirety of a sound file into memory.
+class FramedAudioWriter(FramedAudioFile):
+    """Overlap-add frames of audio into a file, with bounded memory.
+
+    Frames are summed into a ring buffer of `framesize` samples. Since frames
+    are written in time order, everything before the start of the latest
+    frame is complete, and is flushed to disk as soon as it is.
+    """
+    def __init__(self, filepath, framesize, samplerate, channels,
+                 bytedepth=2, overlap=0.5, stride=None, framerate=None,
+                 time_points=None, alignment='center', offset=0):
+        """Open a file for frame-based writing.
+
+        Frames are placed on the same grid as by a FramedAudioReader with
+        equivalent parameters; see FramedAudioFile. Uniform grids are
+        unbounded, and the file ends with the last frame written.
+        """
+        # Always write.
+        mode = 'w'
+        logger.debug(util.classy_print(FramedAudioWriter, "Constructor."))
+        self._wave_handle = None
+        super(FramedAudioWriter, self).__init__(
+            filepath, framesize, samplerate, channels, bytedepth, mode,
+            time_points, framerate, stride, overlap, alignment, offset)
+
+        self._ring = np.zeros(self.frameshape)
+        # Samples before this index have been written to disk.
+        self._flushed = 0
+        # End of the latest frame written into the buffer.
+        self._end = 0
+
+    def _ring_slices(self, sample_index, count):
+        """Map `count` samples from `sample_index` onto the ring buffer.
+
+        Returns
+        -------
+        slices : list of tuples
+            (ring_slice, offset) pairs, where `offset` is the position within
+            the mapped range of the start of `ring_slice`.
+        """
+        size = len(self._ring)
+        first = sample_index % size
+        head = min(count, size - first)
+        return [(slice(first, first + head), 0),
+                (slice(0, count - head), head)]
+
+    def flush(self, sample_index=None):
+        """Write out all samples before `sample_index`.
+
+        Parameters
+        ----------
+        sample_index : int, default=None
+            Index up to which the output is complete; defaults to the end of
+            the last frame written. No frame may be written before it later.
+        """
+        sample_index = self._end if sample_index is None else sample_index
+        while self._flushed < sample_index:
+            count = min(sample_index - self._flushed, len(self._ring))
+            for ring_slice, _ in self._ring_slices(self._flushed, count):
+                self._wave_handle.write(self._ring[ring_slice])
+                self._ring[ring_slice] = 0
+            self._flushed += count
+
+    def write_frame_at_index(self, frame, sample_index):
+        """Overlap-add a frame beginning at `sample_index`.
+
+        Parameters
+        ----------
+        frame : np.ndarray
+            Frame shaped (framesize, channels); a 1D frame is treated as a
+            single channel. Samples before the start of the file are dropped.
+
+        sample_index : int
+            Index of the first sample of the frame.
+        """
+        frame = np.asarray(frame)
+        if frame.ndim == 1:
+            frame = frame[:, np.newaxis]
+        if frame.shape != self.frameshape:
+            raise ValueError("Expected a frame shaped {}, received {}"
+                             "".format(self.frameshape, frame.shape))
+        sample_index = int(sample_index)
+        if sample_index < 0:
+            frame = frame[-sample_index:]
+            sample_index = 0
+        if sample_index < self._flushed:
+            raise ValueError("Frames must be written in time order; sample "
+                             "{} has already been flushed.".format(
+                                 sample_index))
+
+        self.flush(sample_index)
+        for ring_slice, offset in self._ring_slices(sample_index, len(frame)):
+            self._ring[ring_slice] += frame[offset:offset + len(
+                self._ring[ring_slice])]
+        self._end = max(self._end, sample_index + len(frame))
+
+    def write_frame_at_time(self, frame, time_point):
+        """Overlap-add a frame at `time_point`, in seconds; the counterpart
+        to FramedAudioReader.read_frame_at_time.
+        """
+        self.write_frame_at_index(
+            frame, self._time_point_to_sample_index(time_point))
+
+    def write_frame(self, frame):
+        """Overlap-add a frame at the next point of the time grid."""
+        if self._framerate is None:
+            if self.end_of_file:
+                raise ValueError("Every time point has been written.")
+            time_point = self._time_points[self._time_index]
+        else:
+            time_point = self._time_index / self.framerate
+        self._time_index += 1
+        self.write_frame_at_time(
+            frame, float(self._align_time_points(time_point)))
+
+    def close(self):
+        """Flush any buffered samples, and close the file."""
+        if self._wave_handle is not None and self._mode == 'w':
+            self.flush()
+        super(FramedAudioWriter, self).close()
+
+
+def _frame_padding(start_indices, framesize, num_samples):
+    """Zero-padding required to frame a signal in place.
+
+    Parameters
+    ----------
+    start_indices : np.ndarray, dtype=int
+        Sample index of the first sample in each frame.
+
+    framesize : int
+        Number of samples per frame.
+
+    num_samples : int
+        Length of the signal.
+
+    Returns
+    -------
+    padding : tuple of int, or None
+        Samples to pad before and after the signal, or None if some frame
+        falls more than a frame beyond either end, such that padding would
+        grow with its distance.
+    """
+    if not len(start_indices):
+        return 0, 0
+    pad_left = max(0, -int(np.min(start_indices)))
+    pad_right = max(0, int(np.max(start_indices)) + framesize - num_samples)
+    if max(pad_left, pad_right) > framesize:
+        return None
+    return pad_left, pad_right
+
+
+def _frame_signal(signal, start_indices, framesize):
+    """Slice a signal into frames beginning at the given sample indices.
+
+    Parameters
+    ----------
+    signal : np.ndarray
+        Array with shape (num_samples, channels).
+
+    start_indices : np.ndarray, dtype=int
+        Sample index of the first sample in each frame; may fall outside the
+        bounds of the signal.
+
+    framesize : int
+        Number of samples per frame.
+
+    Returns
+    -------
+    frames : np.ndarray
+        Array with shape (len(start_indices), framesize, channels), with
+        zeros wherever a frame falls outside the signal. Evenly spaced frames
+        are returned as a read-only strided view, unless some fall more than
+        a frame beyond either end of the signal.
+    """
+    framesize = int(framesize)
+    start_indices = np.asarray(start_indices, dtype=np.int64)
+    num_frames = len(start_indices)
+    if num_frames == 0:
+        return np.zeros([0, framesize, signal.shape[1]], dtype=signal.dtype)
+
+    padding = _frame_padding(start_indices, framesize, len(signal))
+    if padding is None:
+        # Padding would grow with the distance to the farthest frame; copy
+        # only the samples each frame overlaps instead.
+        indices = start_indices[:, np.newaxis] + np.arange(framesize)
+        valid = (indices >= 0) & (indices < len(signal))
+        frames = np.zeros([num_frames, framesize, signal.shape[1]],
+                          dtype=signal.dtype)
+        frames[valid] = signal[indices[valid]]
+        return frames
+
+    pad_left, pad_right = padding
+    if pad_left or pad_right:
+        padded = np.zeros([pad_left + len(signal) + pad_right,
+                           signal.shape[1]], dtype=signal.dtype)
+        padded[pad_left:pad_left + len(signal)] = signal
+        signal = padded
+        start_indices = start_indices + pad_left
+
+    hops = np.diff(start_indices)
+    if num_frames == 1 or (hops >= 0).all() and (hops == hops[0]).all():
+        hop = int(hops[0]) if num_frames > 1 else 0
+        signal = signal[start_indices[0]:]
+        return np.lib.stride_tricks.as_strided(
+            signal, shape=(num_frames, framesize, signal.shape[1]),
+            strides=(hop * signal.strides[0],) + signal.strides,
+            writeable=False)
+
+    # Irregular spacing (e.g. fractional strides) requires a gather.
+    return signal[start_indices[:, np.newaxis] + np.arange(framesize)]
+
+
+def read(filepath, samplerate=None, channels=None, bytedepth=None,
+         start=None, duration=None, dtype=np.float64):
+    """Read a sound file, or a time range of it, into memory.
 
     Parameters
     ----------
@@ -640,6 +1164,17 @@ def read(filepath, samplerate=None, channels=None, bytedepth=None):
     channels: int, or None for file's default
         Number of channels for the returned audio signal.
 
+    start: scalar, or None for the beginning of the file
+        Time in seconds at which to begin reading.
+
+    duration: scalar, or None for the remainder of the file
+        Maximum duration in seconds to read.
+
+    dtype: np.dtype, default=np.float64
+        Data type of the returned signal. Floating-point types are scaled to
+        [-1.0, 1.0); signed integer types, e.g. np.int16 for 16-bit audio,
+        receive the stored sample values as-is.
+
     Returns
     -------
     signal: np.ndarray
@@ -648,20 +1183,238 @@ def read(filepath, samplerate=None, channels=None, bytedepth=None):
     samplerate: float
         Samplerate of the audio signal.
     """
-    def_framesize = 50000
-    reader = FramedAudioReader(
-        filepath, framesize=def_framesize, samplerate=samplerate,
-        channels=channels, bytedepth=bytedepth, overlap=0, alignment='left')
-    signal = np.zeros([reader.num_frames * reader.framesize,
-                       reader.channels])
-    # Step through the file
-    for idx, frame in enumerate(reader):
-        signal[idx * reader.framesize:(idx + 1) * reader.framesize] = frame
+    audio_file = AudioFile(filepath, samplerate=samplerate,
+                           channels=channels, bytedepth=bytedepth,
+                           start=start, duration=duration)
+    signal = np.empty([audio_file.num_samples, audio_file.channels],
+                      dtype=dtype)
+    audio_file.read_into(signal)
+    samplerate = audio_file.samplerate
+    audio_file.close()
+    return signal, samplerate
+
+
+def read_into(filepath, out, samplerate=None, channels=None, bytedepth=None,
+              start=None, duration=None):
+    """Read a sound file, or a time range of it, into a pre-allocated array.
+
+    Parameters
+    ----------
+    filepath: str
+        Path to an audio file.
+
+    out : np.ndarray, shape=(N, num_channels)
+        Destination array, e.g. an np.memmap; float dtypes receive samples
+        scaled to [-1.0, 1.0), and signed integer dtypes the stored sample
+        values. At most N samples are read.
+
+    samplerate: scalar, or None for file's default
+        Samplerate for the returned audio signal.
+
+    channels: int, or None for file's default
+        Number of channels for the returned audio signal.
+
+    start: scalar, or None for the beginning of the file
+        Time in seconds at which to begin reading.
+
+    duration: scalar, or None for the remainder of the file
+        Maximum duration in seconds to read.
+
+    Returns
+    -------
+    num_samples: int
+        Number of samples written to `out`.
+
+    samplerate: float
+        Samplerate of the audio signal.
+    """
+    audio_file = AudioFile(filepath, samplerate=samplerate,
+                           channels=channels, bytedepth=bytedepth,
+                           start=start, duration=duration)
+    num_samples = audio_file.read_into(out)
+    samplerate = audio_file.samplerate
+    audio_file.close()
+    return num_samples, samplerate
+
+
+def _shared_memory():
+    """Import shared memory support on demand, as few callers need it.
+
+    Returns
+    -------
+    shared_memory, resource_tracker : module
+        The `multiprocessing` modules, or None for each where unavailable.
+    """
+    try:
+        from multiprocessing import resource_tracker, shared_memory
+    except ImportError:
+        return None, None
+    return shared_memory, resource_tracker
+
+
+def _read_worker(filepath, samplerate, channels, bytedepth, start, duration,
+                 dtype, shared_memory_threshold):
+    """Read a file in a worker process for `read_many`.
+
+    Returns
+    -------
+    signal : np.ndarray, or tuple
+        The signal itself, or the (name, shape, dtype) of a shared memory
+        block holding it, which the caller must unlink.
+
+    samplerate : float
+        Samplerate of the audio signal.
+    """
+    audio_file = AudioFile(filepath, samplerate=samplerate,
+                           channels=channels, bytedepth=bytedepth,
+                           start=start, duration=duration)
+    try:
+        shape = (audio_file.num_samples, audio_file.channels)
+        dtype = np.dtype(dtype)
+        num_bytes = int(np.prod(shape)) * dtype.itemsize
+        shared_memory = _shared_memory()[0]
+        if shared_memory is None or num_bytes < shared_memory_threshold:
+            signal = np.empty(shape, dtype=dtype)
+            num_samples = audio_file.read_into(signal)
+            return signal[:num_samples], audio_file.samplerate
+
+        # Ownership passes to the parent process, which unlinks the block.
+        block = shared_memory.SharedMemory(create=True, size=num_bytes)
+        try:
+            num_samples = audio_file.read_into(
+                np.ndarray(shape, dtype=dtype, buffer=block.buf))
+        except BaseException:
+            block.unlink()
+            raise
+        finally:
+            block.close()
+        return ((block.name, (num_samples, shape[1]), dtype.str),
+                audio_file.samplerate)
+    finally:
+        audio_file.close()
+
+
+def _collect(future):
+    """Fetch the signal of a finished `_read_worker`, freeing shared memory.
+
+    Signals are copied out of shared memory, so that the block can be freed
+    at once; peak memory use is briefly twice the size of each such signal.
+    """
+    signal, samplerate = future.result()
+    if isinstance(signal, np.ndarray):
+        return signal, samplerate
+
+    name, shape, dtype = signal
+    block = _shared_memory()[0].SharedMemory(name=name)
+    try:
+        signal = np.array(np.ndarray(shape, dtype=dtype, buffer=block.buf))
+    finally:
+        block.close()
+        block.unlink()
+    return signal, samplerate
+
+
+def _discard(future):
+    """Cancel a `_read_worker` call, or free the result it already has."""
+    if future.cancel():
+        return
+    try:
+        _collect(future)
+    except Exception:
+        pass
 
-    return signal[:reader.num_samples], reader.samplerate
 
+def read_many(filepaths, samplerate=None, channels=None, bytedepth=None,
+              start=None, duration=None, workers=None, ordered=True,
+              max_in_flight=None, dtype=np.float64,
+              shared_memory_threshold=None):
+    """Read many sound files in parallel, across a pool of processes.
 
-def write(filepath, signal, samplerate=44100, bytedepth=2):
+    Decoding and any SoX conversions run in the worker processes; large
+    signals are passed back through shared memory rather than pickled. Each
+    such signal is copied out of shared memory as it is yielded, so peak
+    memory use is briefly twice its size.
+
+    Parameters
+    ----------
+    filepaths: iterable of str
+        Paths to audio files.
+
+    samplerate, channels, bytedepth, start, duration, dtype:
+        Applied to every file; see `read`.
+
+    workers: int, or None for the number of CPUs
+        Number of worker processes.
+
+    ordered: bool, default=True
+        If True, yield results in the order of `filepaths`; otherwise, yield
+        each as soon as it is ready.
+
+    max_in_flight: int, or None for twice the number of workers
+        Maximum number of files being read, or read but not yet consumed, at
+        any time; bounds memory use when consumers are slow.
+
+    shared_memory_threshold: int, or None for SHARED_MEMORY_THRESHOLD
+        Size in bytes from which signals are passed back through shared
+        memory; smaller ones are pickled.
+
+    Yields
+    ------
+    filepath: str
+        Path to the audio file.
+
+    signal: np.ndarray
+        Audio signal, shaped (num_samples, num_channels).
+
+    samplerate: float
+        Samplerate of the audio signal.
+    """
+    import concurrent.futures
+    import multiprocessing
+
+    workers = workers or multiprocessing.cpu_count()
+    if shared_memory_threshold is None:
+        shared_memory_threshold = SHARED_MEMORY_THRESHOLD
+    max_in_flight = max(1, max_in_flight or 2 * workers)
+    filepaths = iter(filepaths)
+    in_flight = collections.OrderedDict()
+    resource_tracker = _shared_memory()[1]
+    if resource_tracker is not None:
+        # Workers started after this process's resource tracker share it, so
+        # a block a worker creates is unregistered when it is unlinked here.
+        resource_tracker.ensure_running()
+
+    with concurrent.futures.ProcessPoolExecutor(workers) as executor:
+
+        def submit():
+            for filepath in filepaths:
+                future = executor.submit(_read_worker, filepath, samplerate,
+                                         channels, bytedepth, start, duration,
+                                         dtype, shared_memory_threshold)
+                in_flight[future] = filepath
+                return True
+            return False
+
+        try:
+            while len(in_flight) < max_in_flight and submit():
+                pass
+            while in_flight:
+                if ordered:
+                    future = next(iter(in_flight))
+                else:
+                    future = next(iter(concurrent.futures.wait(
+                        in_flight,
+                        return_when=concurrent.futures.FIRST_COMPLETED)[0]))
+                filepath = in_flight.pop(future)
+                submit()
+                signal, file_samplerate = _collect(future)
+                yield filepath, signal, file_samplerate
+        finally:
+            for future in in_flight:
+                _discard(future)
+
+
+def write(filepath, signal, samplerate=44100, bytedepth=2, floating=False):
     """Write an audio signal to disk.
 
     Parameters
@@ -676,24 +1429,197 @@ def write(filepath, signal, samplerate=44100, bytedepth=2):
         Samplerate for the returned audio signal.
 
     bytedepth : int, default=2
-        Number of bytes for the audio signal; must be 2.
+        Number of bytes per sample; one of [1, 2, 3, 4], or 4 for floats.
+
+    floating : bool, default=False
+        If True, write 32-bit IEEE float samples.
     """
-    if bytedepth != 2:
-        raise NotImplementedError("Currently only 16-bit audio is supported.")
+    signal = np.asarray(signal)
+    signal = signal.reshape(-1, 1) if signal.ndim == 1 else signal
+    # Encode in blocks, bounding the size of intermediate buffers.
+    blocks = (signal[index:index + BLOCK_SIZE]
+              for index in range(0, len(signal), BLOCK_SIZE))
+    write_blocks(filepath, blocks, samplerate, channels=signal.shape[-1],
+                 bytedepth=bytedepth, floating=floating)
+
+
+def write_blocks(filepath, blocks, samplerate=44100, channels=None,
+                 bytedepth=2, floating=False, append=False):
+    """Write a stream of signal blocks to disk, with constant memory.
+
+    Parameters
+    ----------
+    filepath: str
+        Path to an audio file.
+
+    blocks : iterable of np.ndarray, ndim in [1,2]
+        Successive blocks of the signal, e.g. from a generator.
+
+    samplerate: scalar, default=44100
+        Samplerate of the signal.
 
-    tmp_file = util.temp_file(formats.WAVE)
+    channels : int, or None for that of the first block
+        Number of channels of the signal.
+
+    bytedepth : int, default=2
+        Number of bytes per sample; one of [1, 2, 3, 4], or 4 for floats.
+
+    floating : bool, default=False
+        If True, write 32-bit IEEE float samples.
+
+    append : bool, default=False
+        If True and `filepath` exists, append the blocks to it rather than
+        overwriting it; only wave files in the same sample format may be
+        appended to.
+
+    Returns
+    -------
+    num_samples : int
+        Total number of samples in the file.
+    """
+    if floating and bytedepth != 4:
+        raise ValueError("Floating-point audio requires a bytedepth of 4.")
+
+    blocks = iter(blocks)
+    if channels is None:
+        first = next(blocks, None)
+        if first is None:
+            raise ValueError("Channels are required to write no blocks.")
+        first = np.asarray(first)
+        channels = 1 if first.ndim == 1 else first.shape[-1]
+        blocks = itertools.chain([first], blocks)
+
+    tmp_file = _wave_output_path(filepath)
+    if append and tmp_file != filepath:
+        raise ValueError("Only wave files may be appended to: {}"
+                         "".format(filepath))
+    try:
+        with wavefile.WaveWriter(tmp_file, samplerate, channels, bytedepth,
+                                 floating=floating, append=append) as writer:
+            for block in blocks:
+                writer.write(block)
+    except BaseException:
+        _discard_output(tmp_file, filepath)
+        raise
+    _publish_output(tmp_file, filepath)
+    return writer.num_samples
+
+
+def _wave_output_path(filepath):
+    """Path at which to write wave data destined for `filepath`."""
     if formats.WAVE == os.path.splitext(filepath)[-1].strip('.'):
-        tmp_file = filepath
+        return filepath
+    return util.temp_file(formats.WAVE)
 
-    signal = np.asarray(signal)
-    signal = signal.reshape(-1, 1) if signal.ndim == 1 else signal
 
-    fp = wave.open(tmp_file, 'w')
-    fp.setnchannels(signal.shape[-1])
-    fp.setsampwidth(bytedepth)
-    fp.setframerate(samplerate)
-    fp.writeframes(util.array_to_byte_string(signal, bytedepth))
-    fp.close()
+def _publish_output(tmp_file, filepath):
+    """Convert wave data written by `_wave_output_path` to `filepath`.
 
+    On failure the wave data is kept at `tmp_file`, which is reported in the
+    raised ValueError.
+    """
     if tmp_file != filepath:
-        sox.convert(tmp_file, filepath)
+        if not sox.convert(tmp_file, filepath):
+            raise ValueError("Failed to convert to '{}'; wave data kept at "
+                             "'{}'.".format(filepath, tmp_file))
+        os.remove(tmp_file)
+
+
+def _discard_output(tmp_file, filepath):
+    """Remove partial wave data written by `_wave_output_path`."""
+    if tmp_file != filepath and os.path.exists(tmp_file):
+        os.remove(tmp_file)
+
+
+# A track of `mix`: an audio file, scaled by a linear `gain` and starting
+# `offset` seconds into the output.
+MixSource = collections.namedtuple('MixSource', ['filepath', 'gain', 'offset'])
+MixSource.__new__.__defaults__ = (1.0, 0.0)
+
+
+def mix(sources, filepath, samplerate=None, channels=None, bytedepth=2,
+        floating=False, stream=False):
+    """Mix audio files to disk, with constant memory.
+
+    Sources are decoded block by block and summed into a float32 buffer of
+    BLOCK_SIZE samples, which is written out as each block completes; memory
+    use is independent of the number and length of the sources.
+
+    Parameters
+    ----------
+    sources : list of MixSource, tuple or str
+        Tracks to mix, as MixSource fields, or bare filepaths at unity gain
+        and no offset.
+
+    filepath : str
+        Path to the output file.
+
+    samplerate : scalar, or None for that of the first source
+        Samplerate of the output; other sources are resampled to match.
+
+    channels : int, or None for that of the first source
+        Number of output channels; other sources are remixed to match.
+
+    bytedepth : int, default=2
+        Number of bytes per output sample.
+
+    floating : bool, default=False
+        If True, write 32-bit IEEE float samples.
+
+    stream : bool, default=False
+        If True, sources requiring conversion are streamed from SoX rather
+        than converted to temporary files; see AudioFile.
+    """
+    sources = [MixSource(source) if isinstance(source, six.string_types)
+               else MixSource(*source) for source in sources]
+    if not sources:
+        raise ValueError("At least one source is required.")
+
+    audio_files = []
+    try:
+        for source in sources:
+            audio_file = AudioFile(source.filepath, samplerate=samplerate,
+                                   channels=channels, stream=stream)
+            # The first source determines any unspecified output format.
+            samplerate = samplerate or audio_file.samplerate
+            channels = channels or audio_file.channels
+            audio_files.append(audio_file)
+
+        offsets = [int(np.round(source.offset * samplerate))
+                   for source in sources]
+        if min(offsets) < 0:
+            raise ValueError("Source offsets must be non-negative.")
+        num_samples = max(offset + audio_file.num_samples
+                          for offset, audio_file in zip(offsets, audio_files))
+
+        tmp_file = _wave_output_path(filepath)
+        try:
+            with wavefile.WaveWriter(tmp_file, samplerate, channels,
+                                     bytedepth, floating=floating) as writer:
+                _mix_blocks(writer, sources, offsets, audio_files,
+                            num_samples)
+        except BaseException:
+            _discard_output(tmp_file, filepath)
+            raise
+    finally:
+        for audio_file in audio_files:
+            audio_file.close()
+    _publish_output(tmp_file, filepath)
+
+
+def _mix_blocks(writer, sources, offsets, audio_files, num_samples):
+    """Sum `num_samples` of the sources into `writer`, block by block."""
+    block = np.empty([BLOCK_SIZE, writer.channels], dtype=np.float32)
+    for index in range(0, num_samples, BLOCK_SIZE):
+        count = min(BLOCK_SIZE, num_samples - index)
+        block[:count] = 0
+        for source, offset, audio_file in zip(sources, offsets, audio_files):
+            start = max(index - offset, 0)
+            end = min(index + count - offset, audio_file.num_samples)
+            if end <= start:
+                continue
+            samples = audio_file._read_samples(start, end - start,
+                                               dtype=np.float32)
+            first = offset + start - index
+            block[first:first + len(samples)] += samples * source.gain
+        writer.write(block[:count])
@@ -1 +1,77 @@
+"""Audio file formats, and identification of containers by content."""
+
 WAVE = 'wav'
+AIFF = 'aiff'
+AIFC = 'aifc'
+FLAC = 'flac'
+OGG = 'ogg'
+MP3 = 'mp3'
+AAC = 'aac'
+MP4 = 'mp4'
+AU = 'au'
+CAF = 'caf'
+SVX = '8svx'
+
+# Containers read without SoX.
+NATIVE_FORMATS = set([WAVE, AIFF, AIFC])
+
+# Number of leading bytes needed to identify any known container.
+SNIFF_SIZE = 12
+
+
+def sniff(filepath):
+    """Identify the container of an audio file from its leading bytes.
+
+    Parameters
+    ----------
+    filepath : str
+        Path to an existing file.
+
+    Returns
+    -------
+    fmt : str, or None
+        One of the format names in this module, or None if unrecognized.
+    """
+    with open(filepath, 'rb') as fp:
+        header = fp.read(SNIFF_SIZE)
+    return sniff_bytes(header)
+
+
+def sniff_bytes(header):
+    """Identify a container from the first SNIFF_SIZE bytes of a file.
+
+    Parameters
+    ----------
+    header : bytes
+        Leading bytes of the file.
+
+    Returns
+    -------
+    fmt : str, or None
+        One of the format names in this module, or None if unrecognized.
+    """
+    magic, form = header[:4], header[8:12]
+    if magic in [b'RIFF', b'RF64', b'BW64'] and form == b'WAVE':
+        return WAVE
+    elif magic == b'FORM':
+        return {b'AIFF': AIFF, b'AIFC': AIFC, b'8SVX': SVX}.get(form)
+    elif magic == b'fLaC':
+        return FLAC
+    elif magic == b'OggS':
+        return OGG
+    elif magic == b'.snd':
+        return AU
+    elif magic == b'caff':
+        return CAF
+    elif header[4:8] == b'ftyp':
+        return MP4
+    elif header[:3] == b'ID3':
+        return MP3
+    elif len(header) >= 2 and bytearray(header)[0] == 0xFF:
+        # Frame sync; ADTS (AAC) headers have a zero layer field.
+        second = bytearray(header)[1]
+        if second & 0xF6 == 0xF0:
+            return AAC
+        elif second & 0xE0 == 0xE0:
+            return MP3
+    return None
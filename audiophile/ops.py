@@ -0,0 +1,626 @@
+"""Native, vectorized equivalents of the SoX editing operations.
+
+Each operation is provided for in-memory signals, shaped (num_samples,
+channels), and as a `*_file` variant that processes natively readable files
+(see `formats.NATIVE_FORMATS`) block by block, writing a wave file. The
+semantics follow SoX, such that `audiophile.sox` uses the file variants in
+place of a subprocess whenever `supports` allows.
+"""
+
+import numpy as np
+import os
+
+import audiophile.aifffile as aifffile
+import audiophile.formats as formats
+import audiophile.wavefile as wavefile
+
+# Number of samples processed at a time by the file operations.
+BLOCK_SIZE = 2 ** 16
+
+FADE_SHAPES = ['q', 'h', 't', 'l', 'p']
+
+
+def parse_header(filepath):
+    """Parse the header of any natively readable (uncompressed) file.
+
+    Parameters
+    ----------
+    filepath : str
+        Path to an audio file.
+
+    Returns
+    -------
+    info : wavefile.WaveInfo
+        Sample format and location of the sample data.
+
+    Raises
+    ------
+    ValueError
+        If the file cannot be read without conversion.
+    """
+    if formats.sniff(filepath) in [formats.AIFF, formats.AIFC]:
+        return aifffile.parse_header(filepath)
+    return wavefile.parse_header(filepath)
+
+
+def supports(input_files, output_file, match_channels=True):
+    """Determine if an operation can run natively on the given files.
+
+    Parameters
+    ----------
+    input_files : list of str
+        Input audio files, which must share a sample format.
+
+    output_file : str
+        Output path, which must name a wave file.
+
+    match_channels : bool, default=True
+        If False, inputs may differ in their number of channels.
+
+    Returns
+    -------
+    status : bool
+        True if every input is natively readable and compatible, and none is
+        the output; inputs are memory-mapped while the output is written.
+    """
+    if os.path.splitext(output_file)[-1].strip('.').lower() != formats.WAVE:
+        return False
+    if any(_same_file(f, output_file) for f in input_files):
+        return False
+    try:
+        infos = [parse_header(f) for f in input_files]
+    except (IOError, OSError, ValueError):
+        return False
+    return len(set(_sample_format(info, match_channels)
+                   for info in infos)) == 1
+
+
+def _same_file(filepath, other):
+    """Determine if two paths name the same file."""
+    if os.path.realpath(filepath) == os.path.realpath(other):
+        return True
+    try:
+        return os.path.samefile(filepath, other)
+    except (AttributeError, OSError):
+        return False
+
+
+def _sample_format(info, match_channels=True):
+    return (info.samplerate, info.channels if match_channels else None,
+            info.bytedepth, info.floating)
+
+
+def _writer(output_file, info, num_samples=0, channels=None):
+    """Open a WaveWriter in the sample format of an input.
+
+    Files too large for a RIFF header, given the expected `num_samples`, are
+    written as RF64. The number of channels may be overridden.
+    """
+    channels = channels or info.channels
+    try:
+        wavefile.pack_header(info.samplerate, channels, info.bytedepth,
+                             info.floating, num_samples)
+        rf64 = False
+    except ValueError:
+        rf64 = True
+    return wavefile.WaveWriter(output_file, info.samplerate, channels,
+                               info.bytedepth, floating=info.floating,
+                               rf64=rf64)
+
+
+def _blocks(mapped, start=0, stop=None):
+    """Yield (index, samples) for consecutive blocks of a MappedWave."""
+    stop = mapped.getnframes() if stop is None else stop
+    for index in range(start, stop, BLOCK_SIZE):
+        yield index, mapped.read(index, min(BLOCK_SIZE, stop - index))
+
+
+def _time_to_samples(time, samplerate):
+    return int(np.round(time * samplerate))
+
+
+def trim(signal, samplerate, start_time, end_time):
+    """Excerpt a clip from a signal, given a start and end time.
+
+    Parameters
+    ----------
+    signal : np.ndarray
+        Signal shaped (num_samples, channels).
+
+    samplerate : float
+        Samplerate of the signal.
+
+    start_time, end_time : float
+        Start and end times of the clip, in seconds.
+
+    Returns
+    -------
+    clip : np.ndarray
+        View of the signal within [start_time, end_time).
+    """
+    assert start_time >= 0, "The value for 'start_time' must be positive."
+    assert end_time >= 0, "The value for 'end_time' must be positive."
+    return signal[_time_to_samples(start_time, samplerate):
+                  _time_to_samples(end_time, samplerate)]
+
+
+def pad(signal, samplerate, start_duration=0, end_duration=0):
+    """Add silence to the beginning or end of a signal.
+
+    Parameters
+    ----------
+    signal : np.ndarray
+        Signal shaped (num_samples, channels).
+
+    samplerate : float
+        Samplerate of the signal.
+
+    start_duration, end_duration : float
+        Seconds of silence to add to the beginning and end.
+
+    Returns
+    -------
+    padded : np.ndarray
+    """
+    assert start_duration >= 0, "Start duration must be positive."
+    assert end_duration >= 0, "End duration must be positive."
+    return np.pad(signal, [(_time_to_samples(start_duration, samplerate),
+                            _time_to_samples(end_duration, samplerate)),
+                           (0, 0)], mode='constant')
+
+
+def fade_gain(position, shape='q'):
+    """Gain of a fade at fractional positions through it, as in SoX.
+
+    Parameters
+    ----------
+    position : np.ndarray
+        Positions on [0, 1], where 0 is silent and 1 is unity gain.
+
+    shape : str, default='q'
+        'q' for quarter sine, 'h' for half sine, 't' for linear, 'l' for
+        logarithmic, or 'p' for inverted parabola.
+
+    Returns
+    -------
+    gain : np.ndarray
+    """
+    assert shape in FADE_SHAPES, "Invalid fade shape."
+    position = np.asarray(position, dtype=np.float64)
+    if shape == 'q':
+        return np.sin(position * np.pi / 2)
+    elif shape == 'h':
+        return (1 - np.cos(position * np.pi)) / 2
+    elif shape == 't':
+        return position
+    elif shape == 'l':
+        # Spans 100dB.
+        return np.power(0.1, (1 - position) * 5)
+    return 1 - (1 - position) ** 2
+
+
+def _fade_envelope(indices, num_samples, fade_in, fade_out, shape):
+    """Fade gains at sample indices of a signal of `num_samples`."""
+    gain = np.ones(len(indices))
+    if fade_in:
+        head = indices < fade_in
+        gain[head] *= fade_gain(indices[head] / float(fade_in), shape)
+    if fade_out:
+        tail = indices >= num_samples - fade_out
+        gain[tail] *= fade_gain(
+            (num_samples - indices[tail]) / float(fade_out), shape)
+    return gain[:, np.newaxis]
+
+
+def fade(signal, samplerate, fade_in_time=1, fade_out_time=8,
+         fade_shape='q'):
+    """Add a fade in and fade out to a signal.
+
+    Parameters
+    ----------
+    signal : np.ndarray
+        Signal shaped (num_samples, channels).
+
+    samplerate : float
+        Samplerate of the signal.
+
+    fade_in_time, fade_out_time : float
+        Seconds of fade at the beginning and end of the signal.
+
+    fade_shape : str, default='q'
+        Shape of the fades; see `fade_gain`.
+
+    Returns
+    -------
+    faded : np.ndarray
+    """
+    assert fade_in_time >= 0, "Fade in time must be nonnegative."
+    assert fade_out_time >= 0, "Fade out time must be nonnegative."
+    envelope = _fade_envelope(
+        np.arange(len(signal)), len(signal),
+        _time_to_samples(fade_in_time, samplerate),
+        _time_to_samples(fade_out_time, samplerate), fade_shape)
+    return signal * envelope
+
+
+def normalize(signal, db_level=-3):
+    """Scale a signal such that its peak is at `db_level` dBFS.
+
+    Parameters
+    ----------
+    signal : np.ndarray
+        Signal, scaled to [-1.0, 1.0).
+
+    db_level : float, default=-3
+        Peak level of the output.
+
+    Returns
+    -------
+    normalized : np.ndarray
+        The scaled signal; silence is returned unchanged.
+    """
+    peak = np.abs(signal).max() if signal.size else 0
+    if not peak:
+        return signal.copy()
+    return signal * (10 ** (db_level / 20.0) / peak)
+
+
+def mix(signals):
+    """Mix signals as SoX does, averaging them sample by sample.
+
+    Parameters
+    ----------
+    signals : list of np.ndarray
+        Signals shaped (num_samples, channels), with equal channels; shorter
+        signals are padded with silence.
+
+    Returns
+    -------
+    mixed : np.ndarray
+    """
+    _check_channels(signals)
+    mixed = np.zeros([max(len(x) for x in signals), signals[0].shape[1]])
+    for signal in signals:
+        mixed[:len(signal)] += signal
+    mixed /= len(signals)
+    return mixed
+
+
+def concatenate(signals):
+    """Concatenate signals end to end.
+
+    Parameters
+    ----------
+    signals : list of np.ndarray
+        Signals shaped (num_samples, channels), with equal channels.
+
+    Returns
+    -------
+    concatenated : np.ndarray
+    """
+    _check_channels(signals)
+    return np.concatenate(signals, axis=0)
+
+
+def split_channels(signal):
+    """Split a signal into mono signals, one per channel.
+
+    Parameters
+    ----------
+    signal : np.ndarray
+        Signal shaped (num_samples, channels).
+
+    Returns
+    -------
+    signals : list of np.ndarray
+        Views of each channel, shaped (num_samples, 1).
+    """
+    return [signal[:, channel:channel + 1]
+            for channel in range(signal.shape[1])]
+
+
+def interleave(signals):
+    """Merge signals into one multichannel signal, as `sox -M` does.
+
+    Parameters
+    ----------
+    signals : list of np.ndarray
+        Signals shaped (num_samples, channels); shorter signals are padded
+        with silence.
+
+    Returns
+    -------
+    merged : np.ndarray
+        Signal with the channels of each input in turn.
+    """
+    if not len(signals):
+        raise ValueError("At least one signal is required.")
+    merged = np.zeros([max(len(x) for x in signals),
+                       sum(x.shape[1] for x in signals)])
+    channel = 0
+    for signal in signals:
+        merged[:len(signal), channel:channel + signal.shape[1]] = signal
+        channel += signal.shape[1]
+    return merged
+
+
+def _check_channels(signals):
+    if not len(signals):
+        raise ValueError("At least one signal is required.")
+    elif len(set(x.shape[1] for x in signals)) != 1:
+        raise ValueError("Signals must have the same number of channels: "
+                         "{}".format([x.shape for x in signals]))
+
+
+def trim_file(input_file, output_file, start_time, end_time):
+    """Native `sox.trim` of a file; see `trim`.
+
+    Wave files are excerpted by copying the bytes of the clip verbatim.
+
+    Returns
+    -------
+    status : bool
+        True on success.
+    """
+    assert start_time >= 0, "The value for 'start_time' must be positive."
+    assert end_time >= 0, "The value for 'end_time' must be positive."
+    info = parse_header(input_file)
+    mapped = wavefile.MappedWave(
+        input_file, info=info,
+        start=_time_to_samples(start_time, info.samplerate),
+        stop=_time_to_samples(end_time, info.samplerate))
+    writer = _writer(output_file, info, mapped.getnframes())
+    _copy_samples(writer, input_file, mapped)
+    writer.close()
+    mapped.close()
+    return True
+
+
+def pad_file(input_file, output_file, start_duration=0, end_duration=0):
+    """Native `sox.pad` of a file; see `pad`.
+
+    Returns
+    -------
+    status : bool
+        True on success.
+    """
+    assert start_duration >= 0, "Start duration must be positive."
+    assert end_duration >= 0, "End duration must be positive."
+    info = parse_header(input_file)
+    mapped = wavefile.MappedWave(input_file, info=info)
+    head = _time_to_samples(start_duration, info.samplerate)
+    tail = _time_to_samples(end_duration, info.samplerate)
+    writer = _writer(output_file, info, head + info.num_samples + tail)
+    _write_silence(writer, head)
+    for _, block in _blocks(mapped):
+        writer.write(block)
+    _write_silence(writer, tail)
+    writer.close()
+    mapped.close()
+    return True
+
+
+def _copy_samples(writer, filepath, mapped):
+    """Append all samples of a MappedWave, verbatim where possible."""
+    if writer.can_copy(mapped.info):
+        writer.copy_samples(filepath, mapped.info)
+        return
+    for _, block in _blocks(mapped):
+        writer.write(block)
+
+
+def _write_silence(writer, num_samples):
+    silence = np.zeros([min(num_samples, BLOCK_SIZE), writer.channels])
+    for index in range(0, num_samples, BLOCK_SIZE):
+        writer.write(silence[:num_samples - index])
+
+
+def fade_file(input_file, output_file, fade_in_time=1, fade_out_time=8,
+              fade_shape='q'):
+    """Native `sox.fade` of a file; see `fade`.
+
+    Returns
+    -------
+    status : bool
+        True on success.
+    """
+    assert fade_shape in FADE_SHAPES, "Invalid fade shape."
+    assert fade_in_time >= 0, "Fade in time must be nonnegative."
+    assert fade_out_time >= 0, "Fade out time must be nonnegative."
+    info = parse_header(input_file)
+    mapped = wavefile.MappedWave(input_file, info=info)
+    fade_in = _time_to_samples(fade_in_time, info.samplerate)
+    fade_out = _time_to_samples(fade_out_time, info.samplerate)
+    writer = _writer(output_file, info, info.num_samples)
+    for index, block in _blocks(mapped):
+        writer.write(block * _fade_envelope(
+            np.arange(index, index + len(block)), info.num_samples,
+            fade_in, fade_out, fade_shape))
+    writer.close()
+    mapped.close()
+    return True
+
+
+def normalize_file(input_file, output_file, db_level=-3):
+    """Native `sox.normalize` of a file; see `normalize`.
+
+    The file is read twice: once to find its peak, and once to scale it.
+
+    Returns
+    -------
+    status : bool
+        True on success.
+    """
+    info = parse_header(input_file)
+    mapped = wavefile.MappedWave(input_file, info=info)
+    peak = max([np.abs(block).max() for _, block in _blocks(mapped)
+                if block.size] or [0])
+    gain = 10 ** (db_level / 20.0) / peak if peak else 1.0
+    writer = _writer(output_file, info, info.num_samples)
+    for _, block in _blocks(mapped):
+        writer.write(block * gain)
+    writer.close()
+    mapped.close()
+    return True
+
+
+def mix_files(file_list, output_file):
+    """Native `sox.mix` of files sharing a sample format; see `mix`.
+
+    Returns
+    -------
+    status : bool
+        True on success.
+    """
+    mapped = [wavefile.MappedWave(f, info=parse_header(f)) for f in file_list]
+    _check_formats(mapped, file_list)
+    num_samples = max(m.getnframes() for m in mapped)
+    writer = _writer(output_file, mapped[0].info, num_samples)
+    for index in range(0, num_samples, BLOCK_SIZE):
+        block = np.zeros([min(BLOCK_SIZE, num_samples - index),
+                          writer.channels])
+        for m in mapped:
+            samples = m.read(index, len(block))
+            block[:len(samples)] += samples
+        writer.write(block / len(mapped))
+    writer.close()
+    for m in mapped:
+        m.close()
+    return True
+
+
+def concatenate_files(file_list, output_file):
+    """Native `sox.concatenate` of files sharing a sample format.
+
+    The samples of wave files are copied verbatim, at the speed of the disk.
+
+    Returns
+    -------
+    status : bool
+        True on success.
+    """
+    mapped = [wavefile.MappedWave(f, info=parse_header(f)) for f in file_list]
+    _check_formats(mapped, file_list)
+    writer = _writer(output_file, mapped[0].info,
+                     sum(m.getnframes() for m in mapped))
+    for filepath, m in zip(file_list, mapped):
+        _copy_samples(writer, filepath, m)
+        m.close()
+    writer.close()
+    return True
+
+
+def split_channels_file(input_file, output_files, channels=None):
+    """Split a file into mono files, reading it once.
+
+    Parameters
+    ----------
+    input_file : str
+        Path to a multichannel audio file.
+
+    output_files : list of str
+        Paths to mono wave files, one per channel.
+
+    channels : list of int, default=None
+        Channel indices (from 0) to write to each output in turn; defaults
+        to every channel of the input.
+
+    Returns
+    -------
+    status : bool
+        True on success.
+    """
+    info = parse_header(input_file)
+    channels = list(range(info.channels)) if channels is None else channels
+    if len(channels) != len(output_files):
+        raise ValueError("Expected {} output files, received {}"
+                         "".format(len(channels), len(output_files)))
+    elif not all(0 <= channel < info.channels for channel in channels):
+        raise ValueError("Channels {} out of range for a file with {}"
+                         "".format(channels, info.channels))
+
+    mapped = wavefile.MappedWave(input_file, info=info)
+    writers = [_writer(output_file, info, info.num_samples, channels=1)
+               for output_file in output_files]
+    mono_info = info._replace(channels=1)
+    for index in range(0, info.num_samples, BLOCK_SIZE):
+        if writers[0].can_copy(mono_info):
+            # Deinterleave the stored samples, without decoding them.
+            block = mapped.samples[index:index + BLOCK_SIZE]
+            for writer, channel in zip(writers, channels):
+                writer.write_samples(block[:, channel:channel + 1])
+            continue
+        block = mapped.read(index, BLOCK_SIZE)
+        for writer, channel in zip(writers, channels):
+            writer.write(block[:, channel])
+    for writer in writers:
+        writer.close()
+    mapped.close()
+    return True
+
+
+def interleave_files(file_list, output_file):
+    """Native `sox -M` of files that differ at most in their channels.
+
+    Parameters
+    ----------
+    file_list : list of str
+        Paths to audio files, whose channels are written in turn; shorter
+        files are padded with silence.
+
+    output_file : str
+        Path to the multichannel output file.
+
+    Returns
+    -------
+    status : bool
+        True on success.
+    """
+    mapped = [wavefile.MappedWave(f, info=parse_header(f)) for f in file_list]
+    _check_formats(mapped, file_list, match_channels=False)
+    num_samples = max(m.getnframes() for m in mapped)
+    writer = _writer(output_file, mapped[0].info, num_samples,
+                     channels=sum(m.getnchannels() for m in mapped))
+    # Interleave stored samples directly when no decoding is needed.
+    verbatim = all(writer.can_copy(m.info._replace(channels=writer.channels))
+                   for m in mapped)
+    if verbatim:
+        block = np.empty([BLOCK_SIZE, writer.channels],
+                         dtype=mapped[0].samples.dtype)
+        # Silence, in the stored format.
+        silence = np.zeros(1, dtype=block.dtype)
+        if mapped[0].info.bytedepth == 1:
+            silence = np.full(1, 128, dtype=block.dtype)
+    else:
+        block = np.empty([BLOCK_SIZE, writer.channels])
+    for index in range(0, num_samples, BLOCK_SIZE):
+        count = min(BLOCK_SIZE, num_samples - index)
+        channel = 0
+        for m in mapped:
+            columns = block[:count, channel:channel + m.getnchannels()]
+            available = max(0, min(count, m.getnframes() - index))
+            if verbatim:
+                columns[:available] = m.samples[index:index + available]
+                columns[available:] = silence
+            else:
+                # Decode each input directly into its columns of the block.
+                m.read(index, available, out=columns[:available])
+                columns[available:] = 0
+            channel += m.getnchannels()
+        if verbatim:
+            writer.write_samples(block[:count])
+        else:
+            writer.write(block[:count])
+    writer.close()
+    for m in mapped:
+        m.close()
+    return True
+
+
+def _check_formats(mapped, file_list, match_channels=True):
+    if not mapped:
+        raise ValueError("At least one file is required.")
+    elif len(set(_sample_format(m.info, match_channels)
+                 for m in mapped)) != 1:
+        raise ValueError("Files must share a sample format: {}"
+                         "".format(file_list))
@@ -0,0 +1,187 @@
+"""Vectorized codecs for interleaved PCM sample data.
+
+All conversions operate on whole buffers via `np.frombuffer` and dtype views,
+rather than unpacking samples one at a time.
+"""
+
+import numpy as np
+
+# Integer sample formats, keyed by bytedepth.
+INT_DTYPES = {1: np.uint8, 2: np.int16, 4: np.int32}
+
+# Floating-point sample formats, keyed by bytedepth.
+FLOAT_DTYPES = {4: np.float32, 8: np.float64}
+
+
+def _scale(bytedepth):
+    """Full-scale magnitude of an integer sample with the given bytedepth."""
+    return 2.0 ** (8 * bytedepth - 1)
+
+
+def _unpack_int24(raw, byteorder='<'):
+    """Unpack 3-byte samples into an int32 array.
+
+    Parameters
+    ----------
+    raw : np.ndarray, dtype=np.uint8
+        Flat array of packed bytes, with length divisible by 3.
+
+    byteorder : str, default='<'
+        Byte order of the packed samples, one of ['<', '>'].
+
+    Returns
+    -------
+    samples : np.ndarray, dtype=np.int32
+        Sign-extended sample values.
+    """
+    packed = raw.reshape(-1, 3)
+    wide = np.zeros([packed.shape[0], 4], dtype=np.uint8)
+    # Place each sample in the most significant three bytes, then shift
+    # down arithmetically to recover the sign.
+    if byteorder == '<':
+        wide[:, 1:] = packed
+    else:
+        wide[:, :3] = packed
+    return wide.view(byteorder + 'i4').reshape(-1) >> 8
+
+
+def decode(byte_string, channels, bytedepth, dtype=np.float64,
+           floating=False, out=None, byteorder='<', signed=None):
+    """Decode interleaved PCM bytes into a numpy array.
+
+    Parameters
+    ----------
+    byte_string : bytes-like
+        Raw, interleaved sample data; anything supporting the buffer protocol.
+
+    channels : int
+        Number of interleaved channels.
+
+    bytedepth : int
+        Bytes per sample; one of [1, 2, 3, 4] for integer data, or [4, 8] for
+        floating-point data.
+
+    dtype : np.dtype, default=np.float64
+        Data type of the returned array. Floating-point types are scaled to
+        [-1.0, 1.0); signed integer types receive the stored sample values
+        as-is, and must be at least `bytedepth` bytes wide.
+
+    floating : bool, default=False
+        If True, samples are IEEE floats rather than integers.
+
+    out : np.ndarray, default=None
+        If given, decode into this array, which must have shape
+        (num_samples, channels); `dtype` is then taken from `out`.
+
+    byteorder : str, default='<'
+        Byte order of the samples, one of ['<', '>'].
+
+    signed : bool, default=None
+        Whether integer samples are signed. By default, 8-bit samples are
+        unsigned (as in wave files) and all others are signed.
+
+    Returns
+    -------
+    array : np.ndarray
+        Array with shape (num_samples, channels); `out`, if given.
+
+    Raises
+    ------
+    ValueError
+        If the samples cannot be represented in the requested integer dtype.
+    """
+    dtype = np.dtype(dtype) if out is None else out.dtype
+    if dtype.kind != 'f' and (floating or dtype.kind != 'i' or
+                              dtype.itemsize < bytedepth):
+        raise ValueError("Cannot decode {}-byte {} samples as {}".format(
+            bytedepth, 'float' if floating else 'integer', dtype))
+    channels = int(channels)
+    raw = np.frombuffer(byte_string, dtype=np.uint8)
+    # Drop any trailing partial frame.
+    raw = raw[:raw.size - raw.size % (channels * bytedepth)]
+
+    if floating:
+        if bytedepth not in FLOAT_DTYPES:
+            raise ValueError("Unsupported float bytedepth: {}"
+                             "".format(bytedepth))
+        samples = raw.view(np.dtype(FLOAT_DTYPES[bytedepth]).newbyteorder(
+            byteorder)).reshape(-1, channels)
+        if out is not None:
+            np.copyto(out, samples, casting='same_kind')
+            return out
+        return samples.astype(dtype, copy=False)
+
+    if signed is None:
+        signed = bytedepth != 1
+
+    if bytedepth == 3:
+        samples = _unpack_int24(raw, byteorder)
+    elif bytedepth == 1 and signed:
+        samples = raw.view(np.int8)
+    elif bytedepth == 1:
+        # Unsigned 8-bit PCM is centered on 128.
+        samples = raw.astype(np.int16) - 128
+    elif bytedepth in INT_DTYPES:
+        samples = raw.view(np.dtype(INT_DTYPES[bytedepth]).newbyteorder(
+            byteorder))
+    else:
+        raise ValueError("Unsupported bytedepth: {}".format(bytedepth))
+
+    samples = samples.reshape(-1, channels)
+    if dtype.kind == 'f':
+        return np.multiply(samples, 1.0 / _scale(bytedepth), dtype=dtype,
+                           out=out)
+    elif out is not None:
+        np.copyto(out, samples, casting='same_kind')
+        return out
+    return samples.astype(dtype, copy=False)
+
+
+def encode(array, bytedepth, floating=False):
+    """Encode an array of samples as interleaved PCM data.
+
+    Parameters
+    ----------
+    array : np.ndarray
+        Array with shape (num_samples, channels), bounded on [-1.0, 1.0); a 1D
+        array is treated as a single channel. Integer encodings clip values
+        outside this range.
+
+    bytedepth : int
+        Bytes per sample; one of [1, 2, 3, 4] for integer data, or [4, 8] for
+        floating-point data.
+
+    floating : bool, default=False
+        If True, encode samples as IEEE floats rather than integers.
+
+    Returns
+    -------
+    data : np.ndarray
+        C-contiguous array whose buffer holds the encoded, interleaved bytes.
+        Pass it directly to any `write` accepting a bytes-like object, or call
+        `.tobytes()` for a byte string.
+    """
+    array = np.asarray(array)
+    if floating:
+        if bytedepth not in FLOAT_DTYPES:
+            raise ValueError("Unsupported float bytedepth: {}"
+                             "".format(bytedepth))
+        return np.ascontiguousarray(array, dtype=FLOAT_DTYPES[bytedepth])
+
+    if bytedepth not in [1, 2, 3, 4]:
+        raise ValueError("Unsupported bytedepth: {}".format(bytedepth))
+
+    scale = _scale(bytedepth)
+    samples = np.multiply(array, scale, dtype=np.float64)
+    np.rint(samples, out=samples)
+    np.clip(samples, -scale, scale - 1, out=samples)
+
+    if bytedepth == 1:
+        # 8-bit PCM is unsigned, centered on 128.
+        samples += 128
+        return np.ascontiguousarray(samples, dtype=np.uint8)
+    elif bytedepth == 3:
+        # Keep the low three bytes of each little-endian int32.
+        wide = samples.astype('<i4').reshape(-1, 1).view(np.uint8)
+        return np.ascontiguousarray(wide[:, :3]).reshape(-1)
+    return np.ascontiguousarray(samples, dtype=INT_DTYPES[bytedepth])
@@ -5,16 +5,29 @@ For more information, refer to http://sox.sourceforge.net/
 Note: Most uncompressed audio formats are supported out of the box. However,
 for mp3, aac, mp4, and so forth, various steps must be taken to first build
 the codec libraries, and *then* compile sox from source.
+
+Editing operations (trim, pad, fade, normalize, mix and concatenate) on
+natively readable files with a wave output run in-process instead, via
+`audiophile.ops`. Asynchronous counterparts of the SoX operations, for use
+with asyncio, are in `audiophile.asox`.
 """
 from __future__ import print_function
 
+import collections
+import errno
 import logging
 import os
 import subprocess
 from subprocess import CalledProcessError
-import yaml
+import tempfile
+import threading
+import time
+
+import numpy as np
 
 import audiophile.formats as formats
+import audiophile.ops as ops
+import audiophile.pcm as pcm
 import audiophile.util as util
 
 
@@ -30,16 +43,82 @@ __NO_SOX__ = """SoX could not be found!
     path variables."""
 
 
+# Output of `sox -h`, or '' if SoX could not be run; populated on first use.
+__SOX_HELP__ = None
+
+# File extensions supported by SoX; populated by `supported_formats`.
+__SOX_FORMATS__ = None
+
+# Outcomes of a conversion job in `convert_many`.
+SUCCEEDED = 'succeeded'
+FAILED = 'failed'
+SKIPPED = 'skipped'
+CANCELLED = 'cancelled'
+
+# Seconds between checks for cancellation while a conversion runs.
+POLL_INTERVAL = 0.1
+
+# Number of bytes written to or read from a SoX pipe at a time.
+CHUNK_SIZE = 2 ** 16
+
+# Errors writing to a pipe whose reader has exited; EINVAL on Windows.
+PIPE_ERRNOS = (errno.EPIPE, errno.EINVAL)
+
+# Report on a single job of `convert_many`.
+ConversionResult = collections.namedtuple(
+    'ConversionResult', ['input_file', 'output_file', 'status', 'returncode',
+                         'elapsed', 'stderr'])
+
+
+def _sox_help(refresh=False):
+    """Return the (cached) help text of SoX, probing it on first use."""
+    global __SOX_HELP__
+    if __SOX_HELP__ is None or refresh:
+        try:
+            __SOX_HELP__ = subprocess.check_output(
+                ['sox', '-h'], stderr=subprocess.STDOUT).decode('utf-8')
+        except (OSError, CalledProcessError):
+            __SOX_HELP__ = ''
+        if not _sox_check():
+            logger.warning(__NO_SOX__)
+    return __SOX_HELP__
+
+
 def _sox_check():
     """Test for SoX."""
-    sox_res = subprocess.check_output(['sox', '-h'])
-    status = 'SPECIAL FILENAMES' in str(sox_res)
-    if not status:
-        logger.warning(__NO_SOX__)
-    return status
+    return 'SPECIAL FILENAMES' in _sox_help()
+
+
+class _SoxFlag(object):
+    """Whether SoX is available, probed on first use rather than on import.
+
+    Evaluates like the boolean `has_sox` once was, e.g. `if sox.has_sox:`,
+    and may also be called, as `sox.has_sox()`.
+    """
+
+    def __call__(self):
+        return _sox_check()
+
+    def __bool__(self):
+        return _sox_check()
+
+    # For python 2.
+    __nonzero__ = __bool__
+
+    def __eq__(self, other):
+        return _sox_check() == other
 
+    def __ne__(self, other):
+        return not self == other
 
-has_sox = _sox_check()
+    def __hash__(self):
+        return hash(_sox_check())
+
+    def __repr__(self):
+        return repr(_sox_check())
+
+
+has_sox = _SoxFlag()
 
 
 def enquote_filepath(fpath):
@@ -52,11 +131,37 @@ def enquote_filepath(fpath):
 
 def assert_sox():
     """Assert that SoX is present and can be called."""
-    if has_sox:
+    if has_sox():
         return
     assert False, "SoX assertion failed.\n{}".format(__NO_SOX__)
 
 
+def _native(operation, *args):
+    """Run a native `ops` file operation in place of SoX.
+
+    Failures are logged and reported by status, as for `_sox`, rather than
+    raised.
+
+    Parameters
+    ----------
+    operation : callable
+        File operation of `audiophile.ops`, e.g. `ops.trim_file`.
+
+    args : list
+        Arguments to `operation`.
+
+    Returns
+    -------
+    status : bool
+        True on success.
+    """
+    try:
+        return operation(*args)
+    except (ValueError, IOError, OSError) as error_msg:
+        logger.error("%s failed: %s", operation.__name__, error_msg)
+        return False
+
+
 def split_stereo(input_file, output_file_left, output_file_right):
     """Split a stereo file into separate mono files.
 
@@ -76,9 +181,50 @@ def split_stereo(input_file, output_file_left, output_file_right):
     status : bool
         True on success.
     """
-    left_args = ['sox', '-D', input_file, output_file_left, 'remix', '1']
-    right_args = ['sox', '-D', input_file, output_file_right, 'remix', '2']
-    return _sox(left_args) and _sox(right_args)
+    return split_channels(input_file, [output_file_left, output_file_right],
+                          channels=[0, 1])
+
+
+def split_channels(input_file, output_files, channels=None):
+    """Split a multichannel file into separate mono files.
+
+    Natively readable inputs are read once, writing every output in the same
+    pass; otherwise SoX is run once per output.
+
+    Parameters
+    ----------
+    input_file : str
+        Path to a multichannel audio file.
+
+    output_files : list of str
+        Paths to mono outputs, one per channel.
+
+    channels : list of int, default=None
+        Channel indices (from 0) to write to each output in turn; defaults to
+        every channel of the input.
+
+    Returns
+    -------
+    status : bool
+        True on success.
+
+    Raises
+    ------
+    ValueError
+        If `channels` and `output_files` differ in length.
+    """
+    if channels is not None and len(channels) != len(output_files):
+        raise ValueError("Expected {} output files, received {}"
+                         "".format(len(channels), len(output_files)))
+    if all(ops.supports([input_file], output_file)
+           for output_file in output_files):
+        return _native(ops.split_channels_file, input_file, output_files,
+                       channels)
+
+    channels = range(len(output_files)) if channels is None else channels
+    return all(_sox(['sox', '-D', input_file, output_file,
+                     'remix', '%d' % (channel + 1)])
+               for output_file, channel in zip(output_files, channels))
 
 
 def combine_as_stereo(left_channel, right_channel, output_file):
@@ -101,7 +247,28 @@ def combine_as_stereo(left_channel, right_channel, output_file):
     status : bool
         True on success.
     """
-    return _sox(['sox', '-M', left_channel, right_channel, output_file])
+    return combine_channels([left_channel, right_channel], output_file)
+
+
+def combine_channels(file_list, output_file):
+    """Create a multichannel audio file from the channels of many files.
+
+    Parameters
+    ----------
+    file_list : list of str
+        Paths to audio files, whose channels are written in turn.
+
+    output_file : str
+        Path to the multichannel output file.
+
+    Returns
+    -------
+    status : bool
+        True on success.
+    """
+    if ops.supports(file_list, output_file, match_channels=False):
+        return _native(ops.interleave_files, file_list, output_file)
+    return _sox(['sox', '-M'] + list(file_list) + [output_file])
 
 
 def trim(input_file, output_file, start_time, end_time):
@@ -126,19 +293,27 @@ def trim(input_file, output_file, start_time, end_time):
     status : bool
         True on success.
     """
-    assert start_time >= 0, "The value for 'start_time' must be positive."
-    assert end_time >= 0, "The value for 'end_time' must be positive."
     inplace = not bool(output_file)
     if inplace:
         output_file = util.temp_file(os.path.splitext(input_file)[-1])
 
-    status = _sox(['sox', input_file, output_file, 'trim',
-                   '%0.8f' % start_time, '%0.8f' % (end_time - start_time)])
-    if inplace:
+    if ops.supports([input_file], output_file):
+        status = _native(ops.trim_file, input_file, output_file, start_time,
+                         end_time)
+    else:
+        status = _sox(_trim_args(input_file, output_file, start_time,
+                                 end_time))
+    if inplace and status:
         os.rename(output_file, input_file)
     return status
 
 
+def _trim_args(input_file, output_file, start_time, end_time):
+    assert end_time >= 0, "The value for 'end_time' must be positive."
+    return ['sox', input_file, output_file] + EffectsChain().trim(
+        start_time, end_time - start_time).args()
+
+
 def pad(input_file, output_file, start_duration=0, end_duration=0):
     """Add silence to the beginning or end of a file.
 
@@ -162,10 +337,16 @@ def pad(input_file, output_file, start_duration=0, end_duration=0):
         True on success.
 
     """
-    assert start_duration >= 0, "Start duration must be positive."
-    assert end_duration >= 0, "End duration must be positive."
-    return _sox(['sox', input_file, output_file, 'pad',
-                 '%0.8f' % start_duration, '%0.8f' % end_duration])
+    if ops.supports([input_file], output_file):
+        return _native(ops.pad_file, input_file, output_file,
+                       start_duration, end_duration)
+    return _sox(_pad_args(input_file, output_file, start_duration,
+                          end_duration))
+
+
+def _pad_args(input_file, output_file, start_duration, end_duration):
+    return ['sox', input_file, output_file] + EffectsChain().pad(
+        start_duration, end_duration).args()
 
 
 def fade(input_file, output_file, fade_in_time=1, fade_out_time=8,
@@ -196,16 +377,22 @@ def fade(input_file, output_file, fade_in_time=1, fade_out_time=8,
     status : bool
         True on success.
     """
-    fade_shapes = ['q', 'h', 't', 'l', 'p']
-    assert fade_shape in fade_shapes, "Invalid fade shape."
-    assert fade_in_time >= 0, "Fade in time must be nonnegative."
-    assert fade_out_time >= 0, "Fade out time must be nonnegative."
-    return _sox(['sox', input_file, output_file, 'fade', '%s' % fade_shape,
-                 '%0.8f' % fade_in_time, '0', '%0.8f' % fade_out_time])
+    if ops.supports([input_file], output_file):
+        return _native(ops.fade_file, input_file, output_file,
+                       fade_in_time, fade_out_time, fade_shape)
+    return _sox(_fade_args(input_file, output_file, fade_in_time,
+                           fade_out_time, fade_shape))
+
+
+def _fade_args(input_file, output_file, fade_in_time, fade_out_time,
+               fade_shape):
+    return ['sox', input_file, output_file] + EffectsChain().fade(
+        fade_in_time, fade_out_time, fade_shape).args()
 
 
 def convert(input_file, output_file,
-            samplerate=None, channels=None, bytedepth=None):
+            samplerate=None, channels=None, bytedepth=None,
+            start_time=None, duration=None):
     """Converts one audio file to another on disk.
 
     Parameters
@@ -225,27 +412,361 @@ def convert(input_file, output_file,
     bytedepth : int, default=None
         Desired bytedepth. If None, defaults to the same as input.
 
+    start_time : float, default=None
+        Time in seconds of the input at which to begin the output.
+
+    duration : float, default=None
+        Maximum duration in seconds of the output.
+
     Returns
     -------
     status : bool
         True on success.
+
+    Note: Trimming precedes resampling, so only the requested range of the
+    input is ever resampled.
     """
-    args = ['sox', '--no-dither', input_file]
+    if output_file is None:
+        output_file = util.temp_file(formats.WAVE)
+    return _sox(_convert_args(input_file, output_file, samplerate=samplerate,
+                              channels=channels, bytedepth=bytedepth,
+                              start_time=start_time, duration=duration))
+
+
+def check_convert(input_file, output_file, **conversion):
+    """Convert one audio file to another on disk, raising on failure.
+
+    Parameters
+    ----------
+    input_file : str
+        Input file to convert.
+
+    output_file : str
+        Output file to write.
+
+    conversion : dict
+        Further keyword arguments to `convert`.
+
+    Raises
+    ------
+    ValueError
+        If SoX fails, with its error output.
+    """
+    status, stderr = _run_sox(_convert_args(input_file, output_file,
+                                            **conversion))
+    if not status:
+        raise ValueError("SoX conversion failed for '{}': {}"
+                         "".format(input_file, stderr.strip()))
 
+
+def _convert_args(input_file, output_file, samplerate=None, channels=None,
+                  bytedepth=None, start_time=None, duration=None):
+    """Build the SoX argument list for a conversion; see `convert`."""
+    args = ['sox', '--no-dither', input_file]
     if bytedepth:
         assert bytedepth in [1, 2, 3, 4, 8]
         args += ['-b%d' % (bytedepth * 8)]
     if channels:
-        args += ['-c %d' % channels]
-    if output_file is None:
-        output_file = util.temp_file(formats.WAVE)
-
+        args += ['-c', '%d' % channels]
     args += [output_file]
+    args += _conversion_effects(samplerate, start_time, duration)
+    return args
+
+
+def _is_up_to_date(input_file, output_file):
+    """True if `output_file` exists and is newer than `input_file`."""
+    try:
+        return os.path.getmtime(output_file) >= os.path.getmtime(input_file)
+    except OSError:
+        return False
 
+
+def _run_conversion(job, skip_existing, cancel_event):
+    """Run one job of `convert_many`, returning its ConversionResult."""
+    job = dict(job)
+    input_file, output_file = job.pop('input_file'), job.pop('output_file')
+    result = dict(input_file=input_file, output_file=output_file,
+                  returncode=None, elapsed=0.0, stderr='')
+    if cancel_event is not None and cancel_event.is_set():
+        return ConversionResult(status=CANCELLED, **result)
+    elif skip_existing and _is_up_to_date(input_file, output_file):
+        return ConversionResult(status=SKIPPED, **result)
+
+    output_dir, output_name = os.path.split(os.path.abspath(output_file))
+    start = time.time()
+    status = FAILED
+    temp_file = None
+    try:
+        # Convert to a hidden sibling, so that an interrupted or failed job
+        # never leaves behind an output that looks up to date.
+        handle, temp_file = tempfile.mkstemp(
+            prefix='.', suffix=os.path.splitext(output_name)[-1],
+            dir=output_dir)
+        os.close(handle)
+
+        args = _convert_args(input_file, temp_file, **job)
+        logger.debug("Executing: %s", " ".join(args))
+        # Spool stderr to a file, such that waiting on the process can never
+        # deadlock on a full pipe.
+        with open(os.devnull, 'wb') as devnull, \
+                tempfile.TemporaryFile() as stderr_file:
+            process = subprocess.Popen(args, stdout=devnull,
+                                       stderr=stderr_file)
+            if cancel_event is None:
+                process.wait()
+            while process.poll() is None:
+                cancel_event.wait(POLL_INTERVAL)
+                if cancel_event.is_set():
+                    process.kill()
+                    process.wait()
+                    status = CANCELLED
+            stderr_file.seek(0)
+            stderr = stderr_file.read()
+        result.update(returncode=process.returncode,
+                      stderr=stderr.decode('utf-8', 'replace'))
+        if status != CANCELLED and process.returncode == 0:
+            os.rename(temp_file, output_file)
+            status = SUCCEEDED
+    except OSError as error_msg:
+        result.update(stderr=str(error_msg))
+    finally:
+        if temp_file is not None and os.path.exists(temp_file):
+            os.remove(temp_file)
+
+    result.update(elapsed=time.time() - start)
+    if status == FAILED:
+        logger.error("SoX failed to convert %s: %s", input_file,
+                     result['stderr'].strip())
+    return ConversionResult(status=status, **result)
+
+
+def convert_many(jobs, max_workers=None, skip_existing=True,
+                 cancel_event=None, callback=None):
+    """Run many conversions concurrently.
+
+    Parameters
+    ----------
+    jobs : iterable of dict
+        Keyword arguments to `convert` for each job; each must provide an
+        `input_file` and `output_file`.
+
+    max_workers : int, default=None
+        Maximum number of concurrent SoX processes; defaults to the number of
+        CPUs.
+
+    skip_existing : bool, default=True
+        If True, skip jobs whose output is newer than their input.
+
+    cancel_event : threading.Event, default=None
+        When set, running conversions are killed and pending ones are not
+        started; their status is CANCELLED.
+
+    callback : callable, default=None
+        Called with each ConversionResult as its job finishes, e.g. to report
+        progress.
+
+    Returns
+    -------
+    results : list of ConversionResult
+        One report per job, in the order given; `status` is one of SUCCEEDED,
+        FAILED, SKIPPED or CANCELLED. Outputs are only written on success.
+    """
+    import concurrent.futures
+    import multiprocessing
+
+    assert_sox()
+    jobs = list(jobs)
+    for job in jobs:
+        if job.get('output_file') is None:
+            raise ValueError("Every job requires an output_file: {}"
+                             "".format(job))
+
+    max_workers = max_workers or multiprocessing.cpu_count()
+    results = [None] * len(jobs)
+    # SoX runs in subprocesses, so threads suffice to keep every core busy.
+    with concurrent.futures.ThreadPoolExecutor(max_workers) as executor:
+        futures = dict(
+            (executor.submit(_run_conversion, job, skip_existing,
+                             cancel_event), index)
+            for index, job in enumerate(jobs))
+        for future in concurrent.futures.as_completed(futures):
+            results[futures[future]] = future.result()
+            if callback is not None:
+                callback(future.result())
+    return results
+
+
+def _conversion_effects(samplerate=None, start_time=None, duration=None):
+    """Build the effects arguments shared by `convert` and `stream`.
+
+    Trimming precedes resampling, so only the requested range is resampled.
+    """
+    chain = EffectsChain()
+    if start_time or duration is not None:
+        chain.trim(start_time or 0, duration)
     if samplerate:
-        args += ['rate', '-I', '%f' % samplerate]
+        chain.rate(samplerate)
+    return chain.args()
 
-    return _sox(args)
+
+def stream(input_file, channels, bytedepth, samplerate=None,
+           start_time=None, duration=None):
+    """Decode an audio file to raw, little-endian PCM on a pipe.
+
+    Parameters
+    ----------
+    input_file : str
+        Input file to decode.
+
+    channels : int
+        Number of interleaved channels to output.
+
+    bytedepth : int
+        Bytes per output sample, one of [1, 2, 3, 4]. 8-bit data is unsigned,
+        as in wave files; everything else is signed.
+
+    samplerate : float, default=None
+        Desired samplerate. If None, defaults to the same as input.
+
+    start_time : float, default=None
+        Time in seconds of the input at which to begin the output.
+
+    duration : float, default=None
+        Maximum duration in seconds of the output.
+
+    Returns
+    -------
+    process : subprocess.Popen
+        Running SoX process; samples are read from `process.stdout`.
+    """
+    assert_sox()
+    assert bytedepth in [1, 2, 3, 4]
+    encoding = 'unsigned-integer' if bytedepth == 1 else 'signed-integer'
+    args = ['sox', '--no-dither', input_file,
+            '-t', 'raw', '-e', encoding, '-b', '%d' % (bytedepth * 8),
+            '-c', '%d' % channels, '-L', '-']
+    args += _conversion_effects(samplerate, start_time, duration)
+
+    logger.debug("Executing: %s", " ".join(args))
+    # The child keeps its own descriptor of devnull once started.
+    with open(os.devnull, 'wb') as devnull:
+        return subprocess.Popen(args, stdout=subprocess.PIPE, stderr=devnull)
+
+
+def transform(array, samplerate, effects, dtype=None):
+    """Apply SoX effects to an in-memory signal, without temporary files.
+
+    Samples are piped to SoX in raw form and read back the same way; the two
+    ends of the pipe are serviced concurrently, so arbitrarily long signals
+    cannot deadlock. Float64 signals are piped as 64-bit floats, other float
+    signals as 32-bit floats, and integer signals as integers of the same
+    width, so no precision is lost in transport.
+
+    Parameters
+    ----------
+    array : np.ndarray
+        Signal shaped (num_samples, channels); a 1D array is treated as a
+        single channel. Float signals are in [-1.0, 1.0), and integer signals
+        (int8, int16 or int32) hold full-scale sample values.
+
+    samplerate : float
+        Samplerate of the signal.
+
+    effects : EffectsChain
+        Effects to apply.
+
+    dtype : np.dtype, default=None
+        Data type of the returned signal, or None for that of `array`; see
+        `pcm.decode` for how samples are scaled.
+
+    Returns
+    -------
+    signal : np.ndarray
+        Processed signal, shaped (num_samples, channels).
+
+    samplerate : float
+        Samplerate of the processed signal.
+
+    Raises
+    ------
+    ValueError
+        If the array is not 1D or 2D or has an unsupported dtype, or SoX
+        fails.
+    """
+    assert_sox()
+    array = np.asarray(array)
+    if array.ndim == 1:
+        array = array[:, np.newaxis]
+    if array.ndim != 2:
+        raise ValueError("Expected a 1D or 2D array, received {} dimensions"
+                         "".format(array.ndim))
+
+    floating = array.dtype.kind == 'f'
+    if floating:
+        bytedepth = 8 if array.dtype == np.float64 else 4
+    elif array.dtype.kind == 'i' and array.dtype.itemsize in [1, 2, 4]:
+        bytedepth = array.dtype.itemsize
+    else:
+        raise ValueError("Unsupported dtype: {}".format(array.dtype))
+    data = np.ascontiguousarray(array, dtype='<{}{}'.format(
+        'f' if floating else 'i', bytedepth))
+    output_samplerate, output_channels = effects.output_format(
+        samplerate, array.shape[1])
+
+    raw = ['-t', 'raw', '-e', 'floating-point' if floating else
+           'signed-integer', '-b', '%d' % (bytedepth * 8), '-L']
+    args = ['sox', '--no-dither'] + raw + [
+        '-r', '%f' % samplerate, '-c', '%d' % array.shape[1], '-']
+    args += raw + ['-r', '%f' % output_samplerate,
+                   '-c', '%d' % output_channels, '-']
+    args += effects.args()
+
+    logger.debug("Executing: %s", " ".join(args))
+    process = subprocess.Popen(args, stdin=subprocess.PIPE,
+                               stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    stderr = []
+
+    def write():
+        try:
+            view = memoryview(data.reshape(-1).view(np.uint8))
+            for offset in range(0, len(view), CHUNK_SIZE):
+                process.stdin.write(view[offset:offset + CHUNK_SIZE])
+        except IOError as error:
+            # SoX exited early; its status and stderr tell why.
+            if error.errno not in PIPE_ERRNOS:
+                raise
+        except ValueError:
+            # The pipe was closed underneath us, for the same reason.
+            pass
+        finally:
+            try:
+                process.stdin.close()
+            except IOError as error:
+                if error.errno not in PIPE_ERRNOS:
+                    raise
+
+    threads = [threading.Thread(target=write),
+               threading.Thread(target=lambda: stderr.append(
+                   process.stderr.read()))]
+    for thread in threads:
+        thread.daemon = True
+        thread.start()
+
+    output = bytearray()
+    for chunk in iter(lambda: process.stdout.read(CHUNK_SIZE), b''):
+        output += chunk
+    for thread in threads:
+        thread.join()
+    process.stdout.close()
+    process.stderr.close()
+    if process.wait() != 0:
+        raise ValueError("SoX failed with exit code {}: {}".format(
+            process.returncode, stderr[0].decode('utf-8', 'replace').strip()))
+
+    signal = pcm.decode(output, channels=output_channels, bytedepth=bytedepth,
+                        dtype=array.dtype if dtype is None else dtype,
+                        floating=floating, signed=True)
+    return signal, output_samplerate
 
 
 def mix(file_list, output_file):
@@ -264,12 +785,17 @@ def mix(file_list, output_file):
     status : bool
         True on success.
     """
+    if ops.supports(file_list, output_file):
+        return _native(ops.mix_files, file_list, output_file)
+    return _sox(_mix_args(file_list, output_file))
+
+
+def _mix_args(file_list, output_file):
     args = ["sox", "-m"]
     for fname in file_list:
         args.append(fname)
     args.append(output_file)
-
-    return _sox(args)
+    return args
 
 
 def concatenate(file_list, output_file):
@@ -288,13 +814,18 @@ def concatenate(file_list, output_file):
     status : bool
         True on success.
     """
+    if ops.supports(file_list, output_file):
+        return _native(ops.concatenate_files, file_list, output_file)
+    return _sox(_concatenate_args(file_list, output_file))
+
+
+def _concatenate_args(file_list, output_file):
     args = ["sox", "--combine"]
     args.append("concatenate")
     for fname in file_list:
         args.append(fname)
     args.append(output_file)
-
-    return _sox(args)
+    return args
 
 
 def normalize(input_file, output_file, db_level=-3):
@@ -315,7 +846,13 @@ def normalize(input_file, output_file, db_level=-3):
     status : bool
         True on success.
     """
-    return _sox(['sox', "--norm=%f" % db_level, input_file, output_file])
+    if ops.supports([input_file], output_file):
+        return _native(ops.normalize_file, input_file, output_file, db_level)
+    return _sox(_normalize_args(input_file, output_file, db_level))
+
+
+def _normalize_args(input_file, output_file, db_level):
+    return ['sox', "--norm=%f" % db_level, input_file, output_file]
 
 
 def remove_silence(input_file, output_file,
@@ -341,18 +878,9 @@ def remove_silence(input_file, output_file,
     status : bool
         True on success.
     """
-    args = [input_file, output_file]
-    args.append("silence")
-
-    args.append("1")
-    args.append("%f" % min_voicing_duration)
-    args.append("%f%%" % silence_threshold)
-
-    args.append("-1")
-    args.append("%f" % min_voicing_duration)
-    args.append("%f%%" % silence_threshold)
-
-    return _sox(args)
+    return EffectsChain().silence(
+        silence_threshold, min_voicing_duration).apply(input_file,
+                                                       output_file)
 
 
 def split_along_silence(input_file, output_file, min_silence_dur=0.5,
@@ -402,6 +930,149 @@ def split_along_silence(input_file, output_file, min_silence_dur=0.5,
     return _sox(args)
 
 
+class EffectsChain(object):
+    """A sequence of SoX effects, applied in a single SoX process.
+
+    Each method appends an effect and returns the chain, so that steps can be
+    composed fluently and run with one decode and one encode:
+
+    >>> chain = EffectsChain().trim(1.0, 30.0).rate(16000).remix(1, 2)
+    >>> chain.fade(0.5, 0.5).norm(-3).apply('in.mp3', 'out.wav')
+    """
+
+    def __init__(self):
+        self._effects = []
+        # Output samplerate and channel count, where set by an effect.
+        self._samplerate = None
+        self._channels = None
+
+    def _append(self, *args):
+        self._effects.append([str(arg) for arg in args])
+        return self
+
+    def args(self):
+        """Return the effects as a flat SoX argument list."""
+        return [arg for effect in self._effects for arg in effect]
+
+    def output_format(self, samplerate, channels):
+        """Samplerate and channel count after the chain, given the input's."""
+        return (self._samplerate or samplerate, self._channels or channels)
+
+    def trim(self, start_time, duration=None):
+        """Keep `duration` seconds (or the remainder) from `start_time`."""
+        assert start_time >= 0, "The value for 'start_time' must be positive."
+        args = ['trim', '%0.8f' % start_time]
+        if duration is not None:
+            assert duration >= 0, "The value for 'duration' must be positive."
+            args += ['%0.8f' % duration]
+        return self._append(*args)
+
+    def pad(self, start_duration=0, end_duration=0):
+        """Add seconds of silence to the beginning and end."""
+        assert start_duration >= 0, "Start duration must be positive."
+        assert end_duration >= 0, "End duration must be positive."
+        return self._append('pad', '%0.8f' % start_duration,
+                            '%0.8f' % end_duration)
+
+    def fade(self, fade_in_time, fade_out_time=0, fade_shape='q',
+             stop_time=None):
+        """Fade in, and out over the seconds preceding `stop_time`.
+
+        If `stop_time` is None, the fade out ends with the audio, whose length
+        must then be known to SoX. See `fade` for the available shapes.
+        """
+        fade_shapes = ['q', 'h', 't', 'l', 'p']
+        assert fade_shape in fade_shapes, "Invalid fade shape."
+        assert fade_in_time >= 0, "Fade in time must be nonnegative."
+        assert fade_out_time >= 0, "Fade out time must be nonnegative."
+        stop = '0' if stop_time is None else '%0.8f' % stop_time
+        return self._append('fade', fade_shape, '%0.8f' % fade_in_time, stop,
+                            '%0.8f' % fade_out_time)
+
+    def rate(self, samplerate):
+        """Resample to `samplerate`."""
+        self._samplerate = samplerate
+        return self._append('rate', '-I', '%f' % samplerate)
+
+    def remix(self, *channels):
+        """Map input channels (1-indexed) to output channels.
+
+        Each argument describes one output channel, as an input channel index
+        or a list of indices to mix; e.g. `remix([1, 2])` downmixes to mono.
+        """
+        assert channels, "At least one output channel is required."
+        self._channels = len(channels)
+        return self._append('remix', *[
+            ','.join(str(c) for c in channel)
+            if isinstance(channel, (list, tuple)) else channel
+            for channel in channels])
+
+    def gain(self, db_level):
+        """Amplify by `db_level` dB."""
+        return self._append('gain', '%f' % db_level)
+
+    def norm(self, db_level=-3):
+        """Normalize the peak level to `db_level` dB."""
+        return self._append('norm', '%f' % db_level)
+
+    def silence(self, silence_threshold=0.1, min_voicing_duration=0.5):
+        """Remove silence; see `remove_silence`."""
+        return self._append(
+            'silence', '1', '%f' % min_voicing_duration,
+            '%f%%' % silence_threshold, '-1', '%f' % min_voicing_duration,
+            '%f%%' % silence_threshold)
+
+    def _command(self, input_file, output_file, samplerate=None,
+                 channels=None, bytedepth=None):
+        args = _convert_args(input_file, output_file, bytedepth=bytedepth,
+                             channels=channels) + self.args()
+        if samplerate:
+            args += ['rate', '-I', '%f' % samplerate]
+        return args
+
+    def apply(self, input_file, output_file, samplerate=None, channels=None,
+              bytedepth=None):
+        """Run the chain over a file in a single SoX process.
+
+        Parameters
+        ----------
+        input_file : str
+            Audio file to process.
+
+        output_file : str
+            File for writing output.
+
+        samplerate, channels, bytedepth : default=None
+            Output format; see `convert`. The samplerate is applied after all
+            other effects.
+
+        Returns
+        -------
+        status : bool
+            True on success.
+        """
+        return _sox(self._command(input_file, output_file, samplerate,
+                                  channels, bytedepth))
+
+    def play(self, input_file):
+        """Play a file through the chain.
+
+        Returns
+        -------
+        status : bool
+            True if successful.
+        """
+        assert_sox()
+        assert is_valid_file_format(input_file), "Invalid file format."
+        args = ['play', '--norm', '--no-show-progress', input_file]
+        args += self.args()
+
+        logger.debug("Executing: %s", " ".join(args))
+        process_handle = subprocess.Popen(args, stderr=subprocess.PIPE)
+        status = process_handle.wait()
+        return status == 0
+
+
 def play_excerpt(input_file, duration=5, use_fade=False,
                  remove_silence=False):
     """Play an excerpt of an audio file.
@@ -420,19 +1091,13 @@ def play_excerpt(input_file, duration=5, use_fade=False,
     remove_silence: bool
         If true, forces entire segment to have sound by removing silence.
     """
-    ext = util.fileext(input_file)
-    tmp_file = util.temp_file(ext)
+    chain = EffectsChain()
     if remove_silence:
-        remove_silence(input_file, tmp_file)
-    else:
-        tmp_file = input_file
-
-    if not use_fade:
-        play(tmp_file, end_t=duration)
-    else:
-        tmp_file2 = util.temp_file(ext)
-        fade(tmp_file, tmp_file2, fade_in_time=0.5, fade_out_time=1)
-        play(tmp_file2, end_t=duration)
+        chain.silence()
+    chain.trim(0, duration)
+    if use_fade:
+        chain.fade(0.5, 1, stop_time=duration)
+    return chain.play(input_file)
 
 
 def play(input_file, start_t=0, end_t=None):
@@ -475,9 +1140,40 @@ def play(input_file, start_t=0, end_t=None):
     return status == 0
 
 
+def supported_formats(refresh=False):
+    """Return the file formats supported by SoX.
+
+    SoX is probed once per process; subsequent calls return the cached set.
+
+    Parameters
+    ----------
+    refresh : bool, default=False
+        If True, probe SoX again, e.g. after installing a codec.
+
+    Returns
+    -------
+    formats : frozenset of str
+        File extensions (without the dot) that SoX can read and write.
+    """
+    global __SOX_FORMATS__
+    if __SOX_FORMATS__ is None or refresh:
+        _sox_help(refresh=refresh)
+        assert_sox()
+        supported = set()
+        for line in _sox_help().splitlines():
+            # Find the entry with ASCII audio formats.
+            if line.count('AUDIO FILE FORMATS'):
+                supported.update(line.split(':', 1)[-1].split())
+        __SOX_FORMATS__ = frozenset(supported)
+    return __SOX_FORMATS__
+
+
 def is_valid_file_format(input_file):
     """Determine if a given file is supported by SoX based on its extension.
 
+    Files that already exist are also identified by content, such that
+    natively readable containers are recognized without consulting SoX.
+
     Parameters
     ----------
     input_file : str
@@ -495,26 +1191,22 @@ def is_valid_file_format(input_file):
     if not file_ext:
         return False
     # Remove dot-separator.
-    file_ext = file_ext.strip(".")
+    file_ext = file_ext.strip(".").lower()
     # Pure wave support
-    if file_ext == formats.WAVE:
+    if file_ext in formats.NATIVE_FORMATS:
+        return True
+    elif os.path.isfile(input_file) and \
+            formats.sniff(input_file) in formats.NATIVE_FORMATS:
         return True
 
     # Otherwise, check against SoX.
+    valid = file_ext in supported_formats()
+    if valid:
+        logger.debug("SoX supports '%s' files.", file_ext)
     else:
-        assert_sox()
-        status = os.popen('sox -h').readlines()
-        for state in status:
-            # Find the entry with ASCII audio formats.
-            if state.count('AUDIO FILE FORMATS'):
-                valid = file_ext in state
+        logger.debug("SoX does not support '%s' files.", file_ext)
 
-        if valid:
-            logger.debug("SoX supports '%s' files.", file_ext)
-        else:
-            logger.debug("SoX does not support '%s' files.", file_ext)
-
-        return valid
+    return valid
 
 
 def soxi_parse(key, value):
@@ -648,6 +1340,25 @@ def _sox(args):
     status : bool
         True on success.
     """
+    return _run_sox(args)[0]
+
+
+def _run_sox(args):
+    """Pass an argument list to SoX, collecting its error output.
+
+    Parameters
+    ----------
+    args : list
+        Argument list for SoX; see `_sox`.
+
+    Returns
+    -------
+    status : bool
+        True on success.
+
+    stderr : str
+        Error output of SoX, or why it could not be run.
+    """
     assert_sox()
     if args[0].lower() != "sox":
         args.insert(0, "sox")
@@ -657,14 +1368,16 @@ def _sox(args):
     try:
         logger.debug("Executing: %s", "".join(args))
         process_handle = subprocess.Popen(args, stderr=subprocess.PIPE)
-        status = process_handle.wait()
-        logger.debug(process_handle.stdout)
-        return status == 0
+        _, stderr = process_handle.communicate()
+        return (process_handle.returncode == 0,
+                stderr.decode('utf-8', 'replace'))
     except OSError as error_msg:
         logger.error("OSError: SoX failed! %s", error_msg)
+        stderr = str(error_msg)
     except TypeError as error_msg:
         logger.error("TypeError: %s", error_msg)
-    return False
+        stderr = str(error_msg)
+    return False, stderr
 
 
 SOXI_ARGS = ['b', 'c', 'a', 'D', 'e', 't', 's', 'r']
@@ -687,14 +1400,7 @@ def soxi(filepath, argument=None):
         Command line output of Soxi
     '''
 
-    if argument is not None and argument not in SOXI_ARGS:
-        raise ValueError("Invalid argument '{}' to Soxi".format(argument))
-
-    args = ['soxi']
-    if argument:
-        args.append("-{}".format(argument))
-    args.append(enquote_filepath(filepath))
-
+    args = _soxi_args(enquote_filepath(filepath), argument)
     try:
         shell_output = subprocess.check_output(
             " ".join(args),
@@ -705,10 +1411,81 @@ def soxi(filepath, argument=None):
         raise ValueError("Soxi failed with exit code {}"
                          "".format(cpe.returncode))
 
+    return _parse_soxi(shell_output, argument)
+
+
+def soxi_header(filepath):
+    """Read the header fields of an audio file with a single call to Soxi.
+
+    Parameters
+    ----------
+    filepath : str
+        Path to audio file.
+
+    Returns
+    -------
+    samplerate : float
+        Samplerate of the file.
+
+    channels : int
+        Number of channels.
+
+    bitdepth : int
+        Bits per stored sample, or 0 for formats without a fixed bitdepth
+        (e.g. mp3), as by `soxi -b`.
+
+    duration : float
+        Duration in seconds, or 0 if unknown.
+    """
+    try:
+        shell_output = subprocess.check_output(['soxi', filepath],
+                                               stderr=subprocess.PIPE)
+    except CalledProcessError as cpe:
+        logging.info("Soxi error message: {}".format(cpe.output))
+        raise ValueError("Soxi failed with exit code {}"
+                         "".format(cpe.returncode))
+    except OSError as error_msg:
+        raise ValueError("Soxi failed: {}".format(error_msg))
+    return _parse_soxi_header(shell_output.decode('utf-8', 'replace'))
+
+
+def _parse_soxi_header(report):
+    """Parse the full report of Soxi; see `soxi_header`."""
+    fields = {}
+    for line in report.splitlines():
+        key, separator, value = line.partition(':')
+        if separator:
+            key = key.strip()
+            fields.setdefault(key, soxi_parse(key, value.strip()))
+
+    # e.g. "16-bit Signed Integer PCM"; the bitdepth is omitted if unfixed.
+    encoding = fields.get('Sample Encoding', '').split('-bit ')
+    bitdepth = int(encoding[0]) if len(encoding) > 1 and \
+        encoding[0].isdigit() else 0
+    duration = fields.get('Duration')
+    duration = duration['seconds'] if isinstance(duration, dict) else 0.0
+    return (float(fields['Sample Rate']), int(fields['Channels']), bitdepth,
+            duration)
+
+
+def _soxi_args(filepath, argument=None):
+    if argument is not None and argument not in SOXI_ARGS:
+        raise ValueError("Invalid argument '{}' to Soxi".format(argument))
+
+    args = ['soxi']
+    if argument:
+        args.append("-{}".format(argument))
+    args.append(filepath)
+    return args
+
+
+def _parse_soxi(shell_output, argument=None):
     shell_output = shell_output.decode("utf-8")
 
     if argument is None:
-        result = yaml.load(str(shell_output))
+        # Only soxi's full report needs parsing; import yaml on demand.
+        import yaml
+        result = yaml.safe_load(str(shell_output))
     else:
         result = str(shell_output).strip('\n')
     return result
@@ -0,0 +1,178 @@
+"""Sequential access to SoX-decoded audio, streamed through a pipe."""
+
+import numpy as np
+
+import audiophile.ops as ops
+import audiophile.pcm as pcm
+import audiophile.sox as sox
+
+# Number of bytes requested from the pipe at a time.
+CHUNK_SIZE = 2 ** 16
+
+
+class SeekError(ValueError):
+    """Raised when reading samples a stream has already discarded."""
+
+
+def _header(filepath):
+    """Samplerate, channels, bitdepth and duration in seconds of a file.
+
+    Natively parseable headers are read directly; any other file requires a
+    single call to Soxi.
+    """
+    try:
+        info = ops.parse_header(filepath)
+    except (IOError, OSError, ValueError):
+        return sox.soxi_header(filepath)
+    return (float(info.samplerate), info.channels, 8 * info.bytedepth,
+            info.num_samples / float(info.samplerate))
+
+
+class SoxStream(object):
+    """Forward-only reader over the output of a running SoX process.
+
+    Provides the same interface as `wavefile.MappedWave`, except that reads
+    may not begin before the start of the previous read; such requests raise
+    a `SeekError`.
+    """
+
+    def __init__(self, filepath, samplerate=None, channels=None,
+                 bytedepth=None, start=None, duration=None):
+        """Start decoding an audio file.
+
+        Parameters
+        ----------
+        filepath : str
+            Path to any file SoX can read.
+
+        samplerate : float, default=None
+            Samplerate to decode to; defaults to that of the file.
+
+        channels : int, default=None
+            Number of channels to decode to; defaults to that of the file.
+
+        bytedepth : int, default=None
+            Bytedepth to decode to; defaults to that of the file, or 2 for
+            formats without a fixed bitdepth (e.g. mp3).
+
+        start : float, default=None
+            Time in seconds of the file at which to begin.
+
+        duration : float, default=None
+            Maximum duration in seconds to decode.
+        """
+        self._process = None
+        # The length is estimated from the header, since the stream itself
+        # is unbounded until the process exits; a given duration is trusted.
+        remaining = duration
+        if None in (samplerate, channels, bytedepth, duration):
+            file_samplerate, file_channels, bitdepth, file_duration = \
+                _header(filepath)
+            samplerate = samplerate or file_samplerate
+            channels = channels or file_channels
+            bytedepth = bytedepth or (bitdepth + 7) // 8 or 2
+            remaining = max(0.0, file_duration - (start or 0))
+            if duration is not None:
+                remaining = min(remaining, duration)
+
+        self._samplerate = samplerate
+        self._channels = int(channels)
+        self._bytedepth = int(bytedepth)
+        self._num_samples = int(np.round(remaining * samplerate))
+        self._block_align = self._channels * self._bytedepth
+
+        # Raw bytes held from sample `_buffer_start` onwards.
+        self._buffer = bytearray()
+        self._buffer_start = 0
+        self._process = sox.stream(filepath, channels=self._channels,
+                                   bytedepth=self._bytedepth,
+                                   samplerate=samplerate,
+                                   start_time=start, duration=duration)
+
+    def _fill(self, num_bytes):
+        """Read from the pipe until `num_bytes` are buffered, or EOF."""
+        while len(self._buffer) < num_bytes:
+            chunk = self._process.stdout.read(
+                max(CHUNK_SIZE, num_bytes - len(self._buffer)))
+            if not chunk:
+                break
+            self._buffer += chunk
+
+    def read(self, start, count, dtype=np.float64, out=None):
+        """Decode up to `count` samples beginning at `start`.
+
+        Samples before `start` are discarded; subsequent reads must not begin
+        earlier than this one.
+
+        Parameters
+        ----------
+        start : int
+            Index of the first sample.
+
+        count : int
+            Maximum number of samples to decode; fewer are returned at the end
+            of the stream.
+
+        dtype : np.dtype, default=np.float64
+            Data type of the returned array; see `pcm.decode`.
+
+        out : np.ndarray, default=None
+            If given, decode into this array, which must have shape
+            (count, channels); rows past the end of the stream are zeroed.
+
+        Returns
+        -------
+        samples : np.ndarray
+            Array with shape (N, channels), for N <= count.
+        """
+        if start < self._buffer_start:
+            raise SeekError("Cannot read sample {} from a stream at sample {}"
+                            "".format(start, self._buffer_start))
+
+        # Discard everything before `start`, reading through it if needed.
+        skip = (start - self._buffer_start) * self._block_align
+        while skip > len(self._buffer):
+            skip -= len(self._buffer)
+            del self._buffer[:]
+            self._fill(min(skip, CHUNK_SIZE))
+            if not self._buffer:
+                break
+        del self._buffer[:skip]
+        self._buffer_start = start
+
+        self._fill(count * self._block_align)
+        num_bytes = min(len(self._buffer), count * self._block_align)
+        data = self._buffer[:num_bytes - num_bytes % self._block_align]
+        if out is None:
+            return pcm.decode(data, channels=self._channels,
+                              bytedepth=self._bytedepth, dtype=dtype)
+
+        num_samples = len(data) // self._block_align
+        out[num_samples:] = 0
+        pcm.decode(data, channels=self._channels, bytedepth=self._bytedepth,
+                   out=out[:num_samples])
+        return out[:num_samples]
+
+    def close(self):
+        if self._process is None:
+            return
+        if self._process.poll() is None:
+            self._process.kill()
+        self._process.stdout.close()
+        self._process.wait()
+        self._process = None
+
+    def __del__(self):
+        self.close()
+
+    def getframerate(self):
+        return self._samplerate
+
+    def getnchannels(self):
+        return self._channels
+
+    def getsampwidth(self):
+        return self._bytedepth
+
+    def getnframes(self):
+        return self._num_samples
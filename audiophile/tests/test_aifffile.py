@@ -0,0 +1,84 @@
+import unittest
+import numpy as np
+import os
+import struct
+
+import audiophile.aifffile as aifffile
+import audiophile.fileio as fileio
+import audiophile.util as util
+import audiophile.wavefile as wavefile
+
+
+def write_aiff(filepath, data, bits, compression=None):
+    """Write a minimal AIFF (or AIFF-C, given a compression type) file."""
+    num_frames, channels = data.shape
+    # 8000 Hz as an 80-bit extended float.
+    samplerate = struct.pack('>HQ', 16383 + 12, 8000 << 51)
+    comm = struct.pack('>hIh', channels, num_frames, bits) + samplerate
+    if compression:
+        comm += compression + b'\x00\x00'
+    sound = struct.pack('>II', 0, 0) + data.tobytes()
+    body = b''.join([b'AIFC' if compression else b'AIFF',
+                     b'COMM', struct.pack('>I', len(comm)), comm,
+                     b'SSND', struct.pack('>I', len(sound)), sound])
+    with open(filepath, 'wb') as fp:
+        fp.write(b'FORM' + struct.pack('>I', len(body)) + body)
+
+
+class AIFFTests(unittest.TestCase):
+    test_dir = os.path.dirname(__file__)
+    signal = np.array([[0, -0.5], [0.5, 0.5], [-0.5, 0.0]])
+
+    def setUp(self):
+        self.input_file = util.temp_file('aiff')
+
+    def tearDown(self):
+        if os.path.exists(self.input_file):
+            os.remove(self.input_file)
+
+    def _read(self):
+        info = aifffile.parse_header(self.input_file)
+        self.assertEqual(info.samplerate, 8000)
+        self.assertEqual(info.channels, 2)
+        self.assertEqual(info.num_samples, len(self.signal))
+        return wavefile.MappedWave(self.input_file, info=info).read(0, 10)
+
+    def test_parse_sample(self):
+        info = aifffile.parse_header(os.path.join(self.test_dir,
+                                                  'sample.aiff'))
+        self.assertEqual(info.samplerate, 8000)
+        self.assertEqual(info.bytedepth, 2)
+        self.assertEqual(info.byteorder, '>')
+
+    def test_read_sample(self):
+        aiff_signal, fs_aiff = fileio.read(
+            os.path.join(self.test_dir, 'sample.aiff'))
+        wav_signal, fs_wav = fileio.read(
+            os.path.join(self.test_dir, 'sample.wav'))
+        np.testing.assert_array_equal(aiff_signal, wav_signal)
+        self.assertEqual(fs_aiff, fs_wav)
+
+    def test_read_int(self):
+        for bits, dtype in [(8, '>i1'), (16, '>i2'), (32, '>i4')]:
+            write_aiff(self.input_file,
+                       (self.signal * 2 ** (bits - 1)).astype(dtype), bits)
+            np.testing.assert_array_equal(self._read(), self.signal)
+
+    def test_read_sowt(self):
+        write_aiff(self.input_file, (self.signal * 2 ** 15).astype('<i2'),
+                   16, compression=b'sowt')
+        np.testing.assert_array_equal(self._read(), self.signal)
+
+    def test_read_float(self):
+        write_aiff(self.input_file, self.signal.astype('>f4'), 32,
+                   compression=b'fl32')
+        np.testing.assert_array_equal(self._read(), self.signal)
+
+    def test_compressed(self):
+        write_aiff(self.input_file, self.signal.astype('>f4'), 16,
+                   compression=b'ima4')
+        self.assertRaises(ValueError, aifffile.parse_header, self.input_file)
+
+
+if __name__ == "__main__":
+    unittest.main()
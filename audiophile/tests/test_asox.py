@@ -0,0 +1,84 @@
+import unittest
+import six
+import threading
+import wave
+
+try:
+    import asyncio
+    import audiophile.asox as asox
+except (ImportError, SyntaxError):
+    # Requires python 3.5 or later.
+    asox = None
+
+import audiophile.formats as formats
+import audiophile.sox as sox
+import audiophile.util as util
+
+
+@unittest.skipIf(asox is None, "asyncio subprocesses are unavailable.")
+class AsyncSoxTests(unittest.TestCase):
+    input_file = util.temp_file(formats.WAVE)
+    samplerate = 1000
+
+    def setUp(self):
+        wave_handle = wave.open(self.input_file, mode="w")
+        wave_handle.setframerate(self.samplerate)
+        wave_handle.setnchannels(1)
+        wave_handle.setsampwidth(2)
+        wave_handle.writeframes(
+            six.b("\x00\x00\x00@\x00\x00\x00\xc0") * 200)
+        wave_handle.close()
+        self.loop = asyncio.new_event_loop()
+
+    def tearDown(self):
+        self.loop.close()
+
+    def test_convert(self):
+        output_files = [util.temp_file(formats.WAVE) for _ in range(4)]
+        statuses = self.loop.run_until_complete(asyncio.gather(*[
+            asox.convert(self.input_file, output_file,
+                         samplerate=self.samplerate / 2)
+            for output_file in output_files]))
+        self.assertTrue(all(statuses))
+        for output_file in output_files:
+            self.assertEqual(
+                float(self.loop.run_until_complete(
+                    asox.soxi(output_file, 'r'))),
+                self.samplerate / 2)
+
+    def test_probe_off_loop(self):
+        threads = []
+        sox_help = sox._sox_help
+
+        def probe(*args, **kwargs):
+            threads.append(threading.current_thread())
+            return sox_help(*args, **kwargs)
+
+        sox.__SOX_HELP__, sox._sox_help = None, probe
+        try:
+            self.loop.run_until_complete(asox._assert_sox())
+        except AssertionError:
+            # SoX is absent; the probe itself still ran.
+            pass
+        finally:
+            sox._sox_help = sox_help
+        self.assertIsNot(threads[0], threading.current_thread())
+
+    def test_convert_timeout(self):
+        self.assertRaises(
+            asyncio.TimeoutError, self.loop.run_until_complete,
+            asox.convert(self.input_file, util.temp_file(formats.WAVE),
+                         timeout=0))
+
+    def test_apply(self):
+        output_file = util.temp_file(formats.WAVE)
+        chain = sox.EffectsChain().trim(0, 0.5).rate(500)
+        self.assertTrue(self.loop.run_until_complete(
+            asox.apply(chain, self.input_file, output_file)))
+        wav_handle = wave.open(output_file, mode='r')
+        self.assertEqual(wav_handle.getframerate(), 500)
+        self.assertEqual(wav_handle.getnframes(), 250)
+
+
+if __name__ == "__main__":
+    unittest.main()
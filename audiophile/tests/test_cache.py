@@ -0,0 +1,109 @@
+import unittest
+import os
+import shutil
+import tempfile
+import time
+
+import audiophile.cache as cache
+import audiophile.formats as formats
+import audiophile.sox as sox
+import audiophile.util as util
+
+
+class ConversionCacheTests(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.input_file = util.temp_file(formats.WAVE)
+        with open(self.input_file, 'wb') as fp:
+            fp.write(b'\x00' * 100)
+        self._convert = sox.convert
+        self.num_conversions = 0
+
+        def fake_convert(input_file, output_file, **kwargs):
+            self.num_conversions += 1
+            shutil.copy(input_file, output_file)
+            return True
+
+        sox.convert = fake_convert
+
+    def tearDown(self):
+        sox.convert = self._convert
+        cache.disable()
+        shutil.rmtree(self.directory)
+        os.remove(self.input_file)
+
+    def test_key(self):
+        conversion_cache = cache.ConversionCache(self.directory)
+        key = conversion_cache.key(self.input_file, samplerate=8000)
+        self.assertEqual(
+            key, conversion_cache.key(self.input_file, samplerate=8000))
+        self.assertNotEqual(
+            key, conversion_cache.key(self.input_file, samplerate=4000))
+
+        os.utime(self.input_file, (0, 0))
+        self.assertNotEqual(
+            key, conversion_cache.key(self.input_file, samplerate=8000))
+
+    def test_convert_once(self):
+        conversion_cache = cache.ConversionCache(self.directory)
+        self.assertIsNone(conversion_cache.lookup(self.input_file))
+        path = conversion_cache.convert(self.input_file, channels=1)
+        self.assertEqual(path, conversion_cache.convert(self.input_file,
+                                                        channels=1))
+        self.assertEqual(path, conversion_cache.lookup(self.input_file,
+                                                       channels=1))
+        self.assertEqual(self.num_conversions, 1)
+        self.assertEqual(conversion_cache.size(), 100)
+
+    def test_convert_failure(self):
+        sox.convert = lambda input_file, output_file, **kwargs: False
+        conversion_cache = cache.ConversionCache(self.directory)
+        self.assertRaises(ValueError, conversion_cache.convert,
+                          self.input_file)
+        self.assertEqual(conversion_cache.entries(), [])
+        self.assertEqual(os.listdir(self.directory), [])
+
+    def test_open_evicted(self):
+        conversion_cache = cache.ConversionCache(self.directory)
+        opened = []
+
+        def opener(path):
+            if not opened:
+                # Another process evicts the entry before it is opened.
+                os.remove(path)
+            opened.append(path)
+            return open(path, 'rb')
+
+        path, handle = conversion_cache.open(self.input_file, opener)
+        handle.close()
+        self.assertEqual(opened, [path, path])
+        self.assertEqual(self.num_conversions, 2)
+
+    def test_evict_lru(self):
+        conversion_cache = cache.ConversionCache(self.directory,
+                                                 max_bytes=300)
+        paths = []
+        for samplerate in [1000, 2000, 3000]:
+            paths.append(conversion_cache.convert(self.input_file,
+                                                  samplerate=samplerate))
+            time.sleep(0.01)
+
+        # Touch the oldest entry, then push out the least-recently used.
+        conversion_cache.lookup(self.input_file, samplerate=1000)
+        conversion_cache.convert(self.input_file, samplerate=4000)
+        remaining = [entry[0] for entry in conversion_cache.entries()]
+        self.assertEqual(len(remaining), 3)
+        self.assertIn(paths[0], remaining)
+        self.assertNotIn(paths[1], remaining)
+
+    def test_default(self):
+        self.assertIsNone(cache.get_default())
+        conversion_cache = cache.enable(self.directory)
+        self.assertIs(cache.get_default(), conversion_cache)
+        cache.disable()
+        self.assertIsNone(cache.get_default())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -11,6 +11,11 @@ import six
 import tempfile
 import wave
 
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = None
+
 import audiophile.formats as formats
 import audiophile.fileio as fileio
 import audiophile.util as util
@@ -143,6 +148,98 @@ class FileIOTests(unittest.TestCase):
                 np.testing.assert_array_equal(
                     frame_act, frame_exp, err_msg, True)
 
+    def test_FramedAudioReader_read_frames(self):
+        for alignment in ['left', 'center', 'right']:
+            for stride in [4, 3.5]:
+                af = fileio.FramedAudioReader(self.input_file,
+                                              framesize=8,
+                                              alignment=alignment,
+                                              stride=stride,
+                                              offset=0.01)
+                frames = af.read_frames()
+                self.assertEqual(frames.shape, (af.num_frames, 8, 1))
+                np.testing.assert_array_equal(frames, np.array(list(af)))
+
+    @unittest.skipIf(tracemalloc is None, "Requires tracemalloc.")
+    def test_FramedAudioReader_read_frames_memory(self):
+        num_samples = 2 ** 18
+        long_file = util.temp_file(formats.WAVE)
+        fileio.write(long_file, np.zeros([num_samples, 1]), self.samplerate)
+        for alignment in ['left', 'center']:
+            # Frames overrun the end, and the start when centered.
+            af = fileio.FramedAudioReader(long_file, framesize=1000,
+                                          alignment=alignment)
+            tracemalloc.start()
+            frames = af.read_frames()
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            self.assertLess(peak, 1.25 * num_samples * 8)
+            self.assertEqual(frames.shape, (af.num_frames, 1000, 1))
+            af.close()
+        os.remove(long_file)
+
+    def test_FramedAudioReader_dtype(self):
+        af = fileio.FramedAudioReader(self.input_file, framesize=8,
+                                      stride=4, dtype=np.float32)
+        frames = af.read_frames()
+        self.assertEqual(frames.dtype, np.float32)
+        self.assertEqual(af.read_frame_at_index(0).dtype, np.float32)
+        self.assertEqual(af.read_frames_at_indices([4, -2]).dtype,
+                         np.float32)
+
+        af = fileio.FramedAudioReader(self.input_file, framesize=8,
+                                      stride=4, dtype=np.int16)
+        np.testing.assert_array_equal(af.read_frames(),
+                                      frames * 2 ** 15)
+        self.assertRaises(ValueError, fileio.FramedAudioReader(
+            self.input_file, framesize=8, stride=4,
+            dtype=np.int8).read_frames)
+
+    def test_FramedAudioReader_read_frames_at_times(self):
+        af = fileio.FramedAudioReader(self.input_file,
+                                      framesize=8,
+                                      alignment='center',
+                                      overlap=0.5)
+        time_points = np.array([0.5, -1.0, 0.01, 0.0, 0.5, 0.52, 2.0, 0.99])
+        frames = af.read_frames_at_times(time_points)
+        self.assertEqual(frames.shape, (len(time_points), 8, 1))
+
+        af.time_points = time_points
+        np.testing.assert_array_equal(frames, np.array(list(af)))
+
+    def test_FramedAudioReader_read_frames_sparse(self):
+        af = fileio.FramedAudioReader(self.input_file, framesize=16)
+        # Non-overlapping windows, unordered, including both file ends.
+        indices = [300, 20, -5, 420, 100, af.num_samples - 3, 200]
+        frames = af.read_frames_at_indices(indices)
+        self.assertEqual(frames.shape, (len(indices), 16, 1))
+        for frame, index in zip(frames, indices):
+            np.testing.assert_array_equal(frame,
+                                          af.read_frame_at_index(index))
+
+    def test_FramedAudioReader_read_frames_far_out_of_range(self):
+        af = fileio.FramedAudioReader(self.input_file, framesize=64,
+                                      stride=32)
+        signal = af._read_samples(0, af.num_samples)
+        indices = [3 * 10 ** 7, -3 * 10 ** 7, -10, af.num_samples - 10]
+        if tracemalloc is not None:
+            tracemalloc.start()
+            af.read_frames_at_indices(indices)
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            # Zero frames cost no more than any others.
+            self.assertLess(peak, 2 ** 20)
+        frames = af.read_frames_at_indices(indices)
+        np.testing.assert_array_equal(frames[:2], 0)
+        np.testing.assert_array_equal(frames[2, 10:], signal[:54])
+        np.testing.assert_array_equal(frames[3, :10], signal[-10:])
+        np.testing.assert_array_equal(frames[2, :10], 0)
+        np.testing.assert_array_equal(frames[3, 10:], 0)
+
+        frames = fileio._frame_signal(signal, indices, 64)
+        np.testing.assert_array_equal(
+            frames, af.read_frames_at_indices(indices))
+
     def test_read_real_wave(self):
         wav_file = os.path.join(self.test_dir, 'sample.wav')
         signal, samplerate = fileio.read(wav_file)
@@ -155,6 +252,191 @@ class FileIOTests(unittest.TestCase):
         assert len(signal)
         assert samplerate
 
+    def test_read_dtype(self):
+        signal, _ = fileio.read(self.input_file)
+        for dtype in [np.float32, np.int16, np.int32]:
+            act, _ = fileio.read(self.input_file, dtype=dtype)
+            self.assertEqual(act.dtype, dtype)
+            scale = 1 if act.dtype.kind == 'f' else 2 ** 15
+            np.testing.assert_array_equal(act, signal * scale)
+
+    def test_read_into(self):
+        signal, samplerate = fileio.read(self.input_file)
+        out = np.zeros([len(signal) + 5, self.channels], dtype=np.float32)
+        num_samples, samplerate = fileio.read_into(self.input_file, out)
+        self.assertEqual(num_samples, len(signal))
+        self.assertEqual(samplerate, self.samplerate)
+        np.testing.assert_array_equal(out[:num_samples], signal)
+        np.testing.assert_array_equal(out[num_samples:], 0)
+
+    def test_read_into_bad_shape(self):
+        out = np.zeros([10, self.channels + 1])
+        self.assertRaises(ValueError, fileio.read_into, self.input_file, out)
+
+    def test_read_many(self):
+        signal, samplerate = fileio.read(self.input_file)
+        filepaths = [self.input_file,
+                     os.path.join(self.test_dir, 'sample.wav')] * 3
+        expected = [fileio.read(f)[0] for f in filepaths]
+        # Exercise both the pickled and the shared memory paths.
+        for threshold in [None, 0]:
+            results = list(fileio.read_many(
+                filepaths, workers=2, max_in_flight=3,
+                shared_memory_threshold=threshold))
+            self.assertEqual([r[0] for r in results], filepaths)
+            for (_, act, _), exp in zip(results, expected):
+                np.testing.assert_array_equal(act, exp)
+
+        for _, act, _ in fileio.read_many(filepaths[:2], workers=1,
+                                          dtype=np.int16,
+                                          shared_memory_threshold=0):
+            self.assertEqual(act.dtype, np.int16)
+
+        results = fileio.read_many(filepaths, workers=2, ordered=False)
+        self.assertEqual(sorted(r[0] for r in results), sorted(filepaths))
+
+    def test_read_many_error(self):
+        results = fileio.read_many([self.input_file, 'not_a_file.wav'],
+                                   workers=1)
+        self.assertEqual(next(results)[0], self.input_file)
+        self.assertRaises(Exception, next, results)
+
+    def test_mix(self):
+        signal, samplerate = fileio.read(self.input_file)
+        output_file = util.temp_file(formats.WAVE)
+        fileio.mix([self.input_file, (self.input_file, -0.5, 0.5),
+                    fileio.MixSource(self.input_file, offset=2.0)],
+                   output_file)
+        mixed, samplerate = fileio.read(output_file)
+        self.assertEqual(samplerate, self.samplerate)
+        self.assertEqual(len(mixed), 2 * self.samplerate + len(signal))
+
+        offset = self.samplerate // 2
+        expected = np.zeros_like(mixed)
+        expected[:len(signal)] += signal
+        expected[offset:offset + len(signal)] -= 0.5 * signal
+        expected[2 * self.samplerate:] += signal
+        np.testing.assert_array_equal(mixed, expected)
+        os.remove(output_file)
+
+    def test_AudioFile_conversion_failure(self):
+        bad_file = util.temp_file('flac')
+        with open(bad_file, 'wb') as fp:
+            fp.write(six.b('not audio'))
+        with self.assertRaises(ValueError) as context:
+            fileio.AudioFile(bad_file, samplerate=4000)
+        self.assertIn(bad_file, str(context.exception))
+        os.remove(bad_file)
+
+    def test_mix_conversion_failure(self):
+        output_file = util.temp_file('notaformat')
+        with self.assertRaises(ValueError) as context:
+            fileio.mix([self.input_file], output_file)
+        # The wave data survives, at the path given in the error.
+        tmp_file = str(context.exception).split("'")[3]
+        signal, samplerate = fileio.read(self.input_file)
+        mixed, samplerate = fileio.read(tmp_file)
+        np.testing.assert_array_equal(mixed, signal)
+        os.remove(tmp_file)
+
+    def test_FramedAudioWriter(self):
+        signal, samplerate = fileio.read(self.input_file)
+        output_file = util.temp_file(formats.WAVE)
+        framesize = 64
+        reader = fileio.FramedAudioReader(self.input_file, framesize,
+                                          overlap=0.5)
+        writer = fileio.FramedAudioWriter(
+            output_file, framesize, samplerate=samplerate,
+            channels=self.channels, bytedepth=self.bytedepth, overlap=0.5)
+        for frame in reader:
+            # Half-overlapping frames sum to twice the signal.
+            writer.write_frame(frame * 0.5)
+        self.assertRaises(ValueError, writer.write_frame_at_index,
+                          np.zeros([framesize, self.channels]), 0)
+        writer.close()
+
+        resynth, samplerate = fileio.read(output_file)
+        self.assertEqual(samplerate, self.samplerate)
+        self.assertGreaterEqual(len(resynth), len(signal))
+        np.testing.assert_array_equal(
+            resynth[framesize // 2:len(signal) - framesize],
+            signal[framesize // 2:-framesize])
+        os.remove(output_file)
+
+    def test_FramedAudioWriter_overlap_add(self):
+        framesize, hop, num_frames = 64, 24, 4000
+        output_file = util.temp_file(formats.WAVE)
+        reference_file = util.temp_file(formats.WAVE)
+
+        def frame(index):
+            # Exact in float, so the sums match regardless of order.
+            return np.full([framesize, self.channels], (index % 5 - 2) / 8.0)
+
+        if tracemalloc is not None:
+            tracemalloc.start()
+        writer = fileio.FramedAudioWriter(
+            output_file, framesize, samplerate=self.samplerate,
+            channels=self.channels, bytedepth=self.bytedepth)
+        for index in range(num_frames):
+            writer.write_frame_at_index(frame(index), index * hop)
+        writer.close()
+        if tracemalloc is not None:
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            # Memory scales with the frame, not the output length.
+            self.assertLess(peak, 256 * framesize * self.channels * 8)
+
+        expected = np.zeros([(num_frames - 1) * hop + framesize,
+                             self.channels])
+        for index in range(num_frames):
+            expected[index * hop:index * hop + framesize] += frame(index)
+        fileio.write(reference_file, expected, self.samplerate,
+                     bytedepth=self.bytedepth)
+        signal, samplerate = fileio.read(output_file)
+        reference, samplerate = fileio.read(reference_file)
+        np.testing.assert_array_equal(signal, reference)
+        os.remove(output_file)
+        os.remove(reference_file)
+
+    def test_read_time_range(self):
+        signal, samplerate = fileio.read(self.input_file)
+        excerpt, samplerate = fileio.read(self.input_file, start=0.1,
+                                          duration=0.25)
+        np.testing.assert_array_equal(excerpt, signal[44:154])
+
+        excerpt, samplerate = fileio.read(self.input_file, start=0.9)
+        np.testing.assert_array_equal(excerpt, signal[396:])
+
+        excerpt, samplerate = fileio.read(self.input_file, start=5.0)
+        self.assertEqual(excerpt.shape, (0, self.channels))
+
+    def test_FramedAudioReader_stream(self):
+        aiff_file = os.path.join(self.test_dir, 'sample.aiff')
+        # Resampling requires SoX, even for natively readable files.
+        kwargs = dict(framesize=8, alignment='left', overlap=0.5,
+                      samplerate=4000)
+        frames_exp = np.array(list(
+            fileio.FramedAudioReader(aiff_file, **kwargs)))
+        af = fileio.FramedAudioReader(aiff_file, stream=True, **kwargs)
+        self.assertIsNone(af.wavefile)
+
+        # Length is estimated when streaming; compare the common frames.
+        frames_act = np.array(list(af))
+        num_frames = min(len(frames_act), len(frames_exp))
+        assert num_frames
+        np.testing.assert_array_equal(frames_act[:num_frames],
+                                      frames_exp[:num_frames])
+
+    def test_FramedAudioReader_stream_native(self):
+        aiff_file = os.path.join(self.test_dir, 'sample.aiff')
+        kwargs = dict(framesize=8, alignment='left', overlap=0.5)
+        af = fileio.FramedAudioReader(aiff_file, stream=True, **kwargs)
+        # Nothing to convert, so nothing is streamed.
+        self.assertEqual(af.wavefile, aiff_file)
+        np.testing.assert_array_equal(
+            np.array(list(af)),
+            np.array(list(fileio.FramedAudioReader(aiff_file, **kwargs))))
+
     def test_write_wave(self):
         wav_file = os.path.join(self.test_dir, 'sample.wav')
         x, fs1 = fileio.read(wav_file)
@@ -165,6 +447,55 @@ class FileIOTests(unittest.TestCase):
         np.testing.assert_array_almost_equal(x, y)
         assert fs1 == fs2
 
+    def test_write_blocks(self):
+        wav_file = os.path.join(self.test_dir, 'sample.wav')
+        x, fs = fileio.read(wav_file)
+        output_file = util.temp_file(formats.WAVE)
+
+        blocks = (x[index:index + 1000] for index in range(0, len(x), 1000))
+        self.assertEqual(fileio.write_blocks(output_file, blocks, fs), len(x))
+        num_samples = fileio.write_blocks(output_file, iter([x[:10]]), fs,
+                                          append=True)
+        self.assertEqual(num_samples, len(x) + 10)
+        y, _ = fileio.read(output_file)
+        np.testing.assert_array_almost_equal(np.concatenate([x, x[:10]]), y)
+
+        self.assertRaises(ValueError, fileio.write_blocks, output_file, [], fs)
+        self.assertRaises(ValueError, fileio.write_blocks, output_file,
+                          [x[:10]], fs, bytedepth=4, append=True)
+        os.remove(output_file)
+
+    def test_write_blocks_error_cleanup(self):
+        x, fs = fileio.read(self.input_file)
+        temp_dir = tempfile.mkdtemp()
+        tempfile.tempdir, default_dir = temp_dir, tempfile.tempdir
+
+        def blocks():
+            yield x[:10]
+            raise ValueError("Block source failed.")
+
+        try:
+            # The partial wave data destined for SoX is removed.
+            self.assertRaises(ValueError, fileio.write_blocks,
+                              os.path.join(temp_dir, 'output.flac'),
+                              blocks(), fs)
+            self.assertEqual(os.listdir(temp_dir), [])
+        finally:
+            tempfile.tempdir = default_dir
+            os.rmdir(temp_dir)
+
+    def test_audio_file_append(self):
+        output_file = util.temp_file(formats.WAVE)
+        signal = np.array([[0.0, -0.5], [0.5, 0.5], [-0.5, 0.0]])
+        for mode, block in [('w', signal[:2]), ('a', signal[2:])]:
+            with fileio.AudioFile(output_file, samplerate=8000, channels=2,
+                                  bytedepth=2, mode=mode) as audio_file:
+                audio_file.write(block)
+        y, fs = fileio.read(output_file)
+        np.testing.assert_array_equal(signal, y)
+        self.assertEqual(fs, 8000)
+        os.remove(output_file)
+
 
 def test_read_empty_wav():
     sfile = os.path.join(os.path.dirname(__file__), 'empty.wav')
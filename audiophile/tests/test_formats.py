@@ -0,0 +1,41 @@
+import unittest
+import os
+import six
+
+import audiophile.formats as formats
+
+
+class SniffTests(unittest.TestCase):
+    test_dir = os.path.dirname(__file__)
+
+    def test_sniff_files(self):
+        self.assertEqual(
+            formats.sniff(os.path.join(self.test_dir, 'sample.wav')),
+            formats.WAVE)
+        self.assertEqual(
+            formats.sniff(os.path.join(self.test_dir, 'sample.aiff')),
+            formats.AIFF)
+
+    def test_sniff_bytes(self):
+        headers = {
+            six.b('RF64\xff\xff\xff\xffWAVE'): formats.WAVE,
+            six.b('FORM\x00\x00\x00\x00AIFC'): formats.AIFC,
+            six.b('fLaC\x00\x00\x00\x22\x10\x00\x10\x00'): formats.FLAC,
+            six.b('OggS\x00\x02\x00\x00\x00\x00\x00\x00'): formats.OGG,
+            six.b('ID3\x04\x00\x00\x00\x00\x00\x00\x00\x00'): formats.MP3,
+            six.b('\xff\xfb\x90\x64\x00\x00\x00\x00\x00\x00\x00\x00'):
+                formats.MP3,
+            six.b('\xff\xf1\x50\x80\x00\x00\x00\x00\x00\x00\x00\x00'):
+                formats.AAC,
+            six.b('\x00\x00\x00\x20ftypM4A '): formats.MP4,
+        }
+        for header, fmt in headers.items():
+            self.assertEqual(formats.sniff_bytes(header), fmt)
+
+    def test_sniff_unknown(self):
+        self.assertIsNone(formats.sniff_bytes(six.b('curious george')))
+        self.assertIsNone(formats.sniff_bytes(six.b('')))
+
+
+if __name__ == "__main__":
+    unittest.main()
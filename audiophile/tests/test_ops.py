@@ -0,0 +1,162 @@
+import unittest
+import numpy as np
+import os
+
+import audiophile.formats as formats
+import audiophile.ops as ops
+import audiophile.util as util
+import audiophile.wavefile as wavefile
+
+
+class OpsTests(unittest.TestCase):
+    samplerate = 100
+    signal = np.tile([[0.0, 0.5], [0.5, -0.5], [0.0, 0.25], [-0.5, 0.0]],
+                     (50, 1))
+
+    def test_trim(self):
+        np.testing.assert_array_equal(
+            ops.trim(self.signal, self.samplerate, 0.5, 1.25),
+            self.signal[50:125])
+
+    def test_pad(self):
+        padded = ops.pad(self.signal, self.samplerate, 0.1, 0.25)
+        self.assertEqual(padded.shape, (235, 2))
+        np.testing.assert_array_equal(padded[:10], 0)
+        np.testing.assert_array_equal(padded[10:210], self.signal)
+        np.testing.assert_array_equal(padded[210:], 0)
+
+    def test_fade_gain(self):
+        position = np.array([0.0, 0.5, 1.0])
+        for shape in ops.FADE_SHAPES:
+            gain = ops.fade_gain(position, shape)
+            self.assertAlmostEqual(gain[-1], 1.0)
+            self.assertTrue(np.all(np.diff(gain) > 0))
+        np.testing.assert_allclose(ops.fade_gain(position, 't'), position)
+        np.testing.assert_allclose(ops.fade_gain(position, 'p'),
+                                   [0.0, 0.75, 1.0])
+        self.assertRaises(AssertionError, ops.fade_gain, position, 'x')
+
+    def test_fade(self):
+        ones = np.ones([200, 1])
+        faded = ops.fade(ones, self.samplerate, 0.1, 0.5, fade_shape='t')
+        np.testing.assert_allclose(faded[:10, 0], np.arange(10) / 10.0)
+        np.testing.assert_array_equal(faded[10:150], 1)
+        np.testing.assert_allclose(faded[150:, 0],
+                                   np.arange(50, 0, -1) / 50.0)
+
+    def test_normalize(self):
+        normalized = ops.normalize(self.signal, db_level=-6)
+        self.assertAlmostEqual(np.abs(normalized).max(), 10 ** (-6 / 20.0))
+        np.testing.assert_array_equal(ops.normalize(np.zeros([4, 1])), 0)
+
+    def test_mix(self):
+        mixed = ops.mix([self.signal, self.signal[:100] * -1])
+        np.testing.assert_array_equal(mixed[:100], 0)
+        np.testing.assert_array_equal(mixed[100:], self.signal[100:] / 2)
+        self.assertRaises(ValueError, ops.mix,
+                          [self.signal, self.signal[:, :1]])
+
+    def test_concatenate(self):
+        np.testing.assert_array_equal(
+            ops.concatenate([self.signal[:10], self.signal[10:]]),
+            self.signal)
+
+    def test_split_and_interleave(self):
+        left, right = ops.split_channels(self.signal)
+        np.testing.assert_array_equal(left[:, 0], self.signal[:, 0])
+        np.testing.assert_array_equal(ops.interleave([left, right]),
+                                      self.signal)
+        merged = ops.interleave([self.signal, right[:10]])
+        self.assertEqual(merged.shape, (200, 3))
+        np.testing.assert_array_equal(merged[10:, 2], 0)
+
+
+class FileOpsTests(unittest.TestCase):
+    samplerate = 100
+    signal = OpsTests.signal
+
+    def setUp(self):
+        self.input_file = util.temp_file(formats.WAVE)
+        self.output_file = util.temp_file(formats.WAVE)
+        writer = wavefile.WaveWriter(self.input_file, self.samplerate,
+                                     channels=2, bytedepth=2)
+        writer.write(self.signal)
+        writer.close()
+        # Exercise block boundaries.
+        self.block_size = ops.BLOCK_SIZE
+        ops.BLOCK_SIZE = 64
+
+    def tearDown(self):
+        ops.BLOCK_SIZE = self.block_size
+        for filepath in [self.input_file, self.output_file]:
+            if os.path.exists(filepath):
+                os.remove(filepath)
+
+    def _output(self):
+        return wavefile.MappedWave(self.output_file).read(0, 10 ** 6)
+
+    def test_supports(self):
+        self.assertTrue(ops.supports([self.input_file], self.output_file))
+        self.assertFalse(ops.supports([self.input_file], 'out.flac'))
+        self.assertFalse(ops.supports(['not_a_file.wav'], self.output_file))
+        # Inputs are mapped while the output is written.
+        self.assertFalse(ops.supports([self.input_file], self.input_file))
+        self.assertFalse(ops.supports([os.path.relpath(self.input_file)],
+                                      self.input_file))
+
+    def test_trim_file(self):
+        self.assertTrue(ops.trim_file(self.input_file, self.output_file,
+                                      0.5, 1.25))
+        np.testing.assert_array_equal(
+            self._output(), ops.trim(self.signal, self.samplerate, 0.5, 1.25))
+
+    def test_pad_file(self):
+        ops.pad_file(self.input_file, self.output_file, 0.1, 1.0)
+        np.testing.assert_array_equal(
+            self._output(), ops.pad(self.signal, self.samplerate, 0.1, 1.0))
+
+    def test_fade_file(self):
+        for shape in ops.FADE_SHAPES:
+            ops.fade_file(self.input_file, self.output_file, 0.7, 0.9, shape)
+            np.testing.assert_allclose(
+                self._output(),
+                ops.fade(self.signal, self.samplerate, 0.7, 0.9, shape),
+                atol=2.0 ** -15)
+
+    def test_normalize_file(self):
+        ops.normalize_file(self.input_file, self.output_file, db_level=-1)
+        np.testing.assert_allclose(self._output(),
+                                   ops.normalize(self.signal, db_level=-1),
+                                   atol=2.0 ** -15)
+
+    def test_split_and_interleave_files(self):
+        output_files = [util.temp_file(formats.WAVE) for _ in range(3)]
+        ops.split_channels_file(self.input_file, output_files[:2])
+        ops.split_channels_file(self.input_file, output_files[2:],
+                                channels=[1])
+        self.assertRaises(ValueError, ops.split_channels_file,
+                          self.input_file, output_files[:1], channels=[2])
+        for output_file, channel in zip(output_files, [0, 1, 1]):
+            np.testing.assert_array_equal(
+                wavefile.MappedWave(output_file).read(0, 10 ** 6)[:, 0],
+                self.signal[:, channel])
+
+        ops.interleave_files([self.input_file] + output_files,
+                             self.output_file)
+        np.testing.assert_array_equal(
+            self._output(),
+            self.signal[:, [0, 1, 0, 1, 1]])
+        for output_file in output_files:
+            os.remove(output_file)
+
+    def test_mix_and_concatenate_files(self):
+        ops.mix_files([self.input_file, self.input_file], self.output_file)
+        np.testing.assert_array_equal(self._output(), self.signal)
+        ops.concatenate_files([self.input_file, self.input_file],
+                              self.output_file)
+        np.testing.assert_array_equal(
+            self._output(), ops.concatenate([self.signal, self.signal]))
+
+
+if __name__ == "__main__":
+    unittest.main()
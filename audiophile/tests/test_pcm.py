@@ -0,0 +1,131 @@
+import unittest
+import numpy as np
+import six
+
+import audiophile.pcm as pcm
+
+
+class DecodeTest(unittest.TestCase):
+
+    def setUp(self):
+        self.mono = np.array([0.0, 0.5, -0.5]).reshape(-1, 1)
+        self.stereo = np.array([[0, -0.5], [0.5, 0.5], [-0.5, 0.0]])
+
+    def test_decode_bytedepth1(self):
+        np.testing.assert_array_equal(
+            pcm.decode(six.b("\x80\xc0\x40"), channels=1, bytedepth=1),
+            self.mono)
+
+    def test_decode_bytedepth2(self):
+        np.testing.assert_array_equal(
+            pcm.decode(six.b("\x00\x00\x00@\x00\xc0"),
+                       channels=1, bytedepth=2),
+            self.mono)
+
+    def test_decode_bytedepth3(self):
+        np.testing.assert_array_equal(
+            pcm.decode(six.b("\x00\x00\x00\x00\x00@\x00\x00\xc0"),
+                       channels=1, bytedepth=3),
+            self.mono)
+
+    def test_decode_bytedepth3_extremes(self):
+        byte_string = six.b("\xff\xff\x7f\x00\x00\x80\xff\xff\xff")
+        np.testing.assert_array_equal(
+            pcm.decode(byte_string, channels=1, bytedepth=3, dtype=np.int32),
+            np.array([[2 ** 23 - 1], [-2 ** 23], [-1]]))
+
+    def test_decode_bytedepth4_stereo(self):
+        byte_string = six.b("\x00\x00\x00\x00\x00\x00\x00"
+                            "\xc0\x00\x00\x00@\x00\x00\x00@\x00\x00\x00"
+                            "\xc0\x00\x00\x00\x00")
+        np.testing.assert_array_equal(
+            pcm.decode(byte_string, channels=2, bytedepth=4),
+            self.stereo)
+
+    def test_decode_big_endian(self):
+        byte_strings = {
+            2: six.b("\x00\x00@\x00\xc0\x00"),
+            3: six.b("\x00\x00\x00@\x00\x00\xc0\x00\x00"),
+            4: six.b("\x00\x00\x00\x00@\x00\x00\x00\xc0\x00\x00\x00")}
+        for bytedepth, byte_string in byte_strings.items():
+            np.testing.assert_array_equal(
+                pcm.decode(byte_string, channels=1, bytedepth=bytedepth,
+                           byteorder='>'),
+                self.mono)
+
+    def test_decode_signed_bytedepth1(self):
+        np.testing.assert_array_equal(
+            pcm.decode(six.b("\x00\x40\xc0"), channels=1, bytedepth=1,
+                       signed=True),
+            self.mono)
+
+    def test_decode_float(self):
+        for bytedepth, dtype in pcm.FLOAT_DTYPES.items():
+            byte_string = self.stereo.astype(dtype).tobytes()
+            np.testing.assert_array_equal(
+                pcm.decode(byte_string, channels=2, bytedepth=bytedepth,
+                           floating=True),
+                self.stereo)
+
+    def test_decode_dtype(self):
+        byte_string = six.b("\x00\x00\x00@\x00\xc0")
+        act = pcm.decode(byte_string, channels=1, bytedepth=2,
+                         dtype=np.float32)
+        self.assertEqual(act.dtype, np.float32)
+        np.testing.assert_array_equal(act, self.mono)
+
+        act = pcm.decode(byte_string, channels=1, bytedepth=2,
+                         dtype=np.int16)
+        np.testing.assert_array_equal(
+            act, np.array([[0], [2 ** 14], [-2 ** 14]]))
+
+    def test_decode_bad_dtype(self):
+        byte_string = six.b("\x00\x00\x00@\x00\xc0")
+        for dtype in [np.int8, np.uint16]:
+            self.assertRaises(ValueError, pcm.decode, byte_string,
+                              channels=1, bytedepth=2, dtype=dtype)
+        self.assertRaises(ValueError, pcm.decode, byte_string[:4],
+                          channels=1, bytedepth=4, floating=True,
+                          dtype=np.int32)
+
+    def test_decode_partial_frame(self):
+        act = pcm.decode(six.b("\x00\x00\x00@\x00"), channels=1, bytedepth=2)
+        np.testing.assert_array_equal(act, self.mono[:2])
+
+    def test_decode_bad_bytedepth(self):
+        self.assertRaises(ValueError, pcm.decode, six.b("\x00" * 5), 1, 5)
+
+
+class EncodeTest(unittest.TestCase):
+
+    def setUp(self):
+        self.stereo = np.array([[0, -0.5], [0.5, 0.5], [-0.5, 0.0]])
+
+    def test_encode_bytedepth1(self):
+        self.assertEqual(pcm.encode(self.stereo[:, 1], 1).tobytes(),
+                         six.b("\x40\xc0\x80"))
+
+    def test_encode_bytedepth3(self):
+        self.assertEqual(pcm.encode(self.stereo[:, 0], 3).tobytes(),
+                         six.b("\x00\x00\x00\x00\x00@\x00\x00\xc0"))
+
+    def test_encode_clips(self):
+        data = pcm.encode(np.array([-2.0, 1.0, 2.0]), 2)
+        np.testing.assert_array_equal(data, [-2 ** 15, 2 ** 15 - 1,
+                                             2 ** 15 - 1])
+
+    def test_encode_float(self):
+        data = pcm.encode(self.stereo, 4, floating=True)
+        self.assertEqual(data.dtype, np.float32)
+        self.assertTrue(data.flags['C_CONTIGUOUS'])
+
+    def test_roundtrip(self):
+        for bytedepth in [1, 2, 3, 4]:
+            data = pcm.encode(self.stereo, bytedepth)
+            np.testing.assert_array_equal(
+                pcm.decode(data, channels=2, bytedepth=bytedepth),
+                self.stereo)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,11 +1,16 @@
+import numpy as np
 import os
 import unittest
 import shutil
 import six
+import subprocess
+import sys
+import tempfile
 import wave
 
 import audiophile.formats as formats
 import audiophile.sox as sox
+import audiophile.soxstream as soxstream
 import audiophile.util as util
 
 
@@ -28,6 +33,33 @@ class SoxTests(unittest.TestCase):
         self.wave_handle.writeframes(
             six.b("\x00\x00\x00@\x00\x00\x00\xc0") * 200)
         self.wave_handle.close()
+        self.empty_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.empty_dir)
+
+    def test_import_is_lazy(self):
+        # Importing must not run SoX (here, absent from the PATH) or any other
+        # process, nor load optional dependencies or the machinery only
+        # needed for concurrency; these dominate the cost of the import.
+        script = ("import subprocess, sys\n"
+                  "def fail(*args, **kwargs):\n"
+                  "    raise AssertionError('process run on import')\n"
+                  "popen, check_output = subprocess.Popen, "
+                  "subprocess.check_output\n"
+                  "subprocess.Popen = subprocess.check_output = fail\n"
+                  "import audiophile\n"
+                  "assert audiophile.sox.__SOX_HELP__ is None\n"
+                  "for name in ['yaml', 'asyncio', 'concurrent.futures',\n"
+                  "             'multiprocessing']:\n"
+                  "    assert name not in sys.modules, name\n"
+                  "subprocess.Popen, subprocess.check_output = "
+                  "popen, check_output\n"
+                  "assert not audiophile.sox.has_sox\n"
+                  "assert audiophile.sox.has_sox() is False\n"
+                  "assert audiophile.sox.__SOX_HELP__ == ''\n")
+        env = dict(os.environ, PATH=self.empty_dir)
+        subprocess.check_call([sys.executable, '-c', script], env=env)
 
     def test_formats(self):
         self.assertEqual(sox.is_valid_file_format("some.wav"),
@@ -40,6 +72,19 @@ class SoxTests(unittest.TestCase):
                          False,
                          "Invalid extension failed.")
 
+    def test_supported_formats_cached(self):
+        supported = sox.supported_formats()
+        self.assertIn(formats.WAVE, supported)
+        self.assertIs(sox.supported_formats(), supported)
+        self.assertEqual(sox.supported_formats(refresh=True), supported)
+
+    def test_formats_sniffed(self):
+        # A wave file with a foreign extension is still natively readable.
+        disguised_file = os.path.splitext(self.input_file)[0] + ".george"
+        shutil.copy(self.input_file, disguised_file)
+        self.assertTrue(sox.is_valid_file_format(disguised_file))
+        os.remove(disguised_file)
+
     def test_convert_samplerate(self):
         output_file = util.temp_file(formats.WAVE)
         self.assert_(
@@ -64,6 +109,144 @@ class SoxTests(unittest.TestCase):
                         bytedepth=self.bytedepth),
             "Conversion to .aif failed.")
 
+    def test_convert_many(self):
+        output_files = [util.temp_file(formats.WAVE) for _ in range(3)]
+        jobs = [dict(input_file=self.input_file, output_file=output_file,
+                     samplerate=self.samplerate / 2)
+                for output_file in output_files]
+        jobs.append(dict(input_file='not_a_file.wav',
+                         output_file=util.temp_file(formats.WAVE)))
+        results = sox.convert_many(jobs, max_workers=2)
+        self.assertEqual([r.status for r in results],
+                         [sox.SUCCEEDED] * 3 + [sox.FAILED])
+        self.assertTrue(results[-1].stderr)
+        self.assertFalse(os.path.exists(results[-1].output_file))
+        for output_file in output_files:
+            wav_handle = wave.open(output_file, mode='r')
+            self.assertEqual(self.samplerate / 2, wav_handle.getframerate())
+
+        results = sox.convert_many(jobs[:3])
+        self.assertEqual([r.status for r in results], [sox.SKIPPED] * 3)
+
+    def test_convert_many_bad_directory(self):
+        # A job that cannot create its output fails alone.
+        done_file = util.temp_file(formats.WAVE)
+        shutil.copy(self.input_file, done_file)
+        jobs = [dict(input_file=self.input_file, output_file=done_file),
+                dict(input_file=self.input_file,
+                     output_file=os.path.join(self.empty_dir, 'missing',
+                                              'output.wav')),
+                dict(input_file=self.input_file, output_file=done_file)]
+        results = sox.convert_many(jobs, max_workers=2)
+        self.assertEqual([r.status for r in results],
+                         [sox.SKIPPED, sox.FAILED, sox.SKIPPED])
+        self.assertTrue(results[1].stderr)
+        os.remove(done_file)
+
+    def test_parse_soxi_header(self):
+        report = ("\nInput File     : 'a: b.wav'\n"
+                  "Channels       : 2\n"
+                  "Sample Rate    : 44100\n"
+                  "Precision      : 24-bit\n"
+                  "Duration       : 00:01:02.50 = 2756250 samples = "
+                  "4687.5 CDDA sectors\n"
+                  "File Size      : 16.5M\n"
+                  "Bit Rate       : 2.12M\n"
+                  "Sample Encoding: 24-bit Signed Integer PCM\n")
+        self.assertEqual(sox._parse_soxi_header(report),
+                         (44100.0, 2, 24, 62.5))
+        report = report.replace("24-bit Signed Integer PCM",
+                                "MPEG audio (layer I, II or III)")
+        self.assertEqual(sox._parse_soxi_header(report)[2], 0)
+
+    def test_stream_native_header(self):
+        # Natively parseable headers are read without Soxi.
+        soxi_header, sox.soxi_header = sox.soxi_header, None
+        try:
+            stream = soxstream.SoxStream(self.input_file,
+                                         samplerate=2 * self.samplerate)
+        finally:
+            sox.soxi_header = soxi_header
+        self.assertEqual(stream.getnchannels(), self.channels)
+        self.assertEqual(stream.getsampwidth(), self.bytedepth)
+        self.assertEqual(stream.getnframes(), 2 * 800)
+        stream.close()
+
+    def test_effects_chain_args(self):
+        chain = sox.EffectsChain().trim(0.5, 1).rate(500).remix([1, 2])
+        chain.fade(0.1, 0.2, fade_shape='t').norm(-6)
+        self.assertEqual(chain.args(),
+                         ['trim', '0.50000000', '1.00000000',
+                          'rate', '-I', '500.000000', 'remix', '1,2',
+                          'fade', 't', '0.10000000', '0', '0.20000000',
+                          'norm', '-6.000000'])
+        self.assertRaises(AssertionError, chain.fade, 0.1, fade_shape='x')
+
+    def test_effects_chain_apply(self):
+        output_file = util.temp_file(formats.WAVE)
+        chain = sox.EffectsChain().trim(0, 0.5).pad(0.1, 0.1).rate(500)
+        self.assertTrue(chain.fade(0.1, 0.1).norm().apply(self.input_file,
+                                                          output_file))
+        wav_handle = wave.open(output_file, mode='r')
+        self.assertEqual(wav_handle.getframerate(), 500)
+        self.assertEqual(wav_handle.getnframes(), 350)
+
+    def test_transform(self):
+        signal = np.tile([[0.0, 0.25], [0.5, 0.25], [0.0, 0.25],
+                          [-0.5, 0.25]], (1000, 1))
+        output, samplerate = sox.transform(signal, 1000, sox.EffectsChain())
+        self.assertEqual(samplerate, 1000)
+        np.testing.assert_array_equal(output, signal)
+
+        # Float64 and integer signals round-trip in their own dtype.
+        for array in [signal + 1e-12, (signal * 2 ** 15).astype(np.int16),
+                      signal.astype(np.float32)]:
+            output, _ = sox.transform(array, 1000, sox.EffectsChain())
+            self.assertEqual(output.dtype, array.dtype)
+            np.testing.assert_array_equal(output, array)
+        output, _ = sox.transform((signal * 2 ** 15).astype(np.int16), 1000,
+                                  sox.EffectsChain(), dtype=np.float32)
+        np.testing.assert_array_equal(output, signal)
+        self.assertRaises(ValueError, sox.transform, signal.astype(np.uint8),
+                          1000, sox.EffectsChain())
+
+        chain = sox.EffectsChain().remix(1).rate(500)
+        output, samplerate = sox.transform(signal, 1000, chain)
+        self.assertEqual(samplerate, 500)
+        self.assertEqual(output.shape, (2000, 1))
+
+    def test_native_failure_status(self):
+        # Native operations report failure by status, like SoX.
+        output_files = [util.temp_file(formats.WAVE) for _ in range(2)]
+        self.assertFalse(sox.split_stereo(self.input_file, *output_files))
+        self.assertRaises(ValueError, sox.split_channels, self.input_file,
+                          output_files, channels=[0])
+
+        other_file = util.temp_file(formats.WAVE)
+        wave_handle = wave.open(other_file, mode="w")
+        wave_handle.setframerate(self.samplerate * 2)
+        wave_handle.setnchannels(self.channels)
+        wave_handle.setsampwidth(self.bytedepth)
+        wave_handle.writeframes(six.b("\x00\x00") * 10)
+        wave_handle.close()
+        for function in [sox.mix, sox.concatenate, sox.combine_channels]:
+            self.assertFalse(function([self.input_file, other_file],
+                                      output_files[0]))
+        os.remove(other_file)
+
+    def test_same_input_and_output(self):
+        another_file = util.temp_file(formats.WAVE)
+        shutil.copy(self.input_file, another_file)
+        with open(another_file, 'rb') as fp:
+            original = fp.read()
+        for function, args in [(sox.normalize, ()), (sox.trim, (0, 0.1))]:
+            if function(another_file, another_file, *args):
+                wave.open(another_file).close()
+            else:
+                with open(another_file, 'rb') as fp:
+                    self.assertEqual(fp.read(), original)
+        os.remove(another_file)
+
     def test_trim(self):
         output_file = util.temp_file(formats.WAVE)
         self.assert_(
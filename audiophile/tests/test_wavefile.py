@@ -0,0 +1,287 @@
+import unittest
+import numpy as np
+import os
+import struct
+import wave
+
+import audiophile.formats as formats
+import audiophile.pcm as pcm
+import audiophile.util as util
+import audiophile.wavefile as wavefile
+
+
+class WaveWriterTests(unittest.TestCase):
+    samplerate = 8000
+    signal = np.array([[0, -0.5], [0.5, 0.5], [-0.5, 0.0]])
+
+    def setUp(self):
+        self.output_file = util.temp_file(formats.WAVE)
+
+    def tearDown(self):
+        if os.path.exists(self.output_file):
+            os.remove(self.output_file)
+
+    def test_write_pcm(self):
+        for bytedepth in [1, 2, 3, 4]:
+            writer = wavefile.WaveWriter(self.output_file, self.samplerate,
+                                         channels=2, bytedepth=bytedepth)
+            writer.write(self.signal[:2])
+            writer.write(self.signal[2:])
+            writer.close()
+
+            handle = wave.open(self.output_file, 'r')
+            self.assertEqual(handle.getframerate(), self.samplerate)
+            self.assertEqual(handle.getsampwidth(), bytedepth)
+            self.assertEqual(handle.getnframes(), len(self.signal))
+            np.testing.assert_array_equal(
+                pcm.decode(handle.readframes(len(self.signal)),
+                           channels=2, bytedepth=bytedepth),
+                self.signal)
+            handle.close()
+
+    def test_write_float(self):
+        writer = wavefile.WaveWriter(self.output_file, self.samplerate,
+                                     channels=2, bytedepth=4, floating=True)
+        writer.write(self.signal)
+        writer.close()
+
+        with open(self.output_file, 'rb') as fp:
+            data = fp.read()
+        self.assertEqual(struct.unpack('<H', data[20:22])[0],
+                         wavefile.WAVE_FORMAT_IEEE_FLOAT)
+        self.assertEqual(struct.unpack('<I', data[4:8])[0], len(data) - 8)
+        np.testing.assert_array_equal(
+            np.frombuffer(data[-self.signal.size * 4:], dtype=np.float32),
+            self.signal.flatten())
+
+    def test_write_rf64(self):
+        writer = wavefile.WaveWriter(self.output_file, self.samplerate,
+                                     channels=2, bytedepth=2, rf64=True)
+        writer.write(self.signal)
+        writer.close()
+        with open(self.output_file, 'rb') as fp:
+            self.assertEqual(fp.read(4), b'RF64')
+        np.testing.assert_array_equal(
+            wavefile.MappedWave(self.output_file).read(0, 10), self.signal)
+        self.assertRaises(ValueError, wavefile.pack_header, self.samplerate,
+                          2, 2, num_samples=2 ** 30)
+
+    def test_copy_samples(self):
+        input_file = util.temp_file(formats.WAVE)
+        writer = wavefile.WaveWriter(input_file, self.samplerate,
+                                     channels=2, bytedepth=3)
+        writer.write(self.signal)
+        writer.close()
+        window = wavefile.MappedWave(input_file, start=1).info
+
+        copy_file_range = getattr(os, 'copy_file_range', None)
+        try:
+            # With and without kernel support for copying ranges.
+            for _ in range(2):
+                writer = wavefile.WaveWriter(self.output_file,
+                                             self.samplerate, channels=2,
+                                             bytedepth=3)
+                self.assertTrue(writer.can_copy(window))
+                writer.copy_samples(input_file, window)
+                writer.write(self.signal[:1])
+                writer.close()
+                np.testing.assert_array_equal(
+                    wavefile.MappedWave(self.output_file).read(0, 10),
+                    np.concatenate([self.signal[1:], self.signal[:1]]))
+                if hasattr(os, 'copy_file_range'):
+                    del os.copy_file_range
+        finally:
+            if copy_file_range is not None:
+                os.copy_file_range = copy_file_range
+            os.remove(input_file)
+
+        writer = wavefile.WaveWriter(self.output_file, self.samplerate,
+                                     channels=2, bytedepth=2)
+        self.assertFalse(writer.can_copy(window))
+        self.assertRaises(ValueError, writer.copy_samples, input_file,
+                          window)
+        writer.close()
+
+    def test_append(self):
+        for floating, rf64 in [(False, False), (True, False), (False, True)]:
+            with wavefile.WaveWriter(self.output_file, self.samplerate,
+                                     channels=2, bytedepth=4,
+                                     floating=floating, rf64=rf64) as writer:
+                writer.write(self.signal[:1])
+            with wavefile.WaveWriter(self.output_file, self.samplerate,
+                                     channels=2, bytedepth=4,
+                                     floating=floating,
+                                     append=True) as writer:
+                self.assertEqual(writer.num_samples, 1)
+                writer.write(self.signal[1:])
+            mapped = wavefile.MappedWave(self.output_file)
+            self.assertEqual(mapped.info.floating, floating)
+            np.testing.assert_array_equal(mapped.read(0, 10), self.signal)
+            mapped.close()
+
+            with open(self.output_file, 'rb') as fp:
+                data = fp.read()
+            self.assertEqual(data[:4], b'RF64' if rf64 else b'RIFF')
+            if not rf64:
+                self.assertEqual(struct.unpack('<I', data[4:8])[0],
+                                 len(data) - 8)
+
+    def test_append_odd_size(self):
+        with wavefile.WaveWriter(self.output_file, self.samplerate,
+                                 channels=1, bytedepth=1) as writer:
+            writer.write(self.signal[:, 0])
+        self.assertEqual(os.path.getsize(self.output_file), 48)
+        with wavefile.WaveWriter(self.output_file, self.samplerate,
+                                 channels=1, bytedepth=1,
+                                 append=True) as writer:
+            writer.write(self.signal[:, 1])
+        self.assertEqual(os.path.getsize(self.output_file), 50)
+        np.testing.assert_array_equal(
+            wavefile.MappedWave(self.output_file).read(0, 10).flatten(),
+            self.signal.T.flatten())
+
+    def test_append_invalid(self):
+        with wavefile.WaveWriter(self.output_file, self.samplerate,
+                                 channels=2, bytedepth=2) as writer:
+            writer.write(self.signal)
+        self.assertRaises(ValueError, wavefile.WaveWriter, self.output_file,
+                          self.samplerate, channels=1, bytedepth=2,
+                          append=True)
+
+        with open(self.output_file, 'ab') as fp:
+            fp.write(b'LIST' + struct.pack('<I', 0))
+        size = os.path.getsize(self.output_file)
+        self.assertRaises(ValueError, wavefile.WaveWriter, self.output_file,
+                          self.samplerate, channels=2, bytedepth=2,
+                          append=True)
+        self.assertEqual(os.path.getsize(self.output_file), size)
+
+    def test_flush(self):
+        writer = wavefile.WaveWriter(self.output_file, self.samplerate,
+                                     channels=2, bytedepth=2)
+        writer.write(self.signal)
+        writer.flush()
+        self.assertEqual(
+            wavefile.parse_header(self.output_file).num_samples,
+            len(self.signal))
+        writer.close()
+
+    def test_write_bad_shape(self):
+        writer = wavefile.WaveWriter(self.output_file, self.samplerate,
+                                     channels=1, bytedepth=2)
+        self.assertRaises(ValueError, writer.write, self.signal)
+        writer.close()
+
+
+class MappedWaveTests(unittest.TestCase):
+    samplerate = 8000
+    signal = np.array([[0, -0.5], [0.5, 0.5], [-0.5, 0.0], [0.25, -0.25]])
+
+    def setUp(self):
+        self.input_file = util.temp_file(formats.WAVE)
+
+    def tearDown(self):
+        if os.path.exists(self.input_file):
+            os.remove(self.input_file)
+
+    def _write(self, bytedepth, floating=False):
+        writer = wavefile.WaveWriter(self.input_file, self.samplerate,
+                                     channels=2, bytedepth=bytedepth,
+                                     floating=floating)
+        writer.write(self.signal)
+        writer.close()
+
+    def test_parse_header(self):
+        self._write(3)
+        info = wavefile.parse_header(self.input_file)
+        self.assertEqual(info.samplerate, self.samplerate)
+        self.assertEqual(info.channels, 2)
+        self.assertEqual(info.bytedepth, 3)
+        self.assertFalse(info.floating)
+        self.assertEqual(info.num_samples, len(self.signal))
+
+    def test_parse_header_not_wave(self):
+        with open(self.input_file, 'wb') as fp:
+            fp.write(b'FORM\x00\x00\x00\x04AIFF')
+        self.assertRaises(ValueError, wavefile.parse_header, self.input_file)
+
+    def _write_chunks(self, magic, fmt, data, ds64=None):
+        chunks = b''
+        if ds64 is not None:
+            chunks += b'ds64' + struct.pack('<I', len(ds64)) + ds64
+        chunks += b'fmt ' + struct.pack('<I', len(fmt)) + fmt
+        data_size = len(data) if ds64 is None else wavefile.RF64_SIZE_MARKER
+        chunks += b'data' + struct.pack('<I', data_size) + data
+        with open(self.input_file, 'wb') as fp:
+            fp.write(magic + struct.pack('<I', len(chunks) + 4) + b'WAVE' +
+                     chunks)
+
+    def test_parse_header_extensible(self):
+        data = self.signal.astype(np.float64).tobytes()
+        guid = b'\x00\x00\x00\x00\x10\x00\x80\x00\x00\xaa\x00\x38\x9b\x71'
+        fmt = struct.pack('<HHIIHHHHIH', wavefile.WAVE_FORMAT_EXTENSIBLE, 2,
+                          self.samplerate, self.samplerate * 16, 16, 64, 22,
+                          64, 0x3, wavefile.WAVE_FORMAT_IEEE_FLOAT) + guid
+        self._write_chunks(b'RIFF', fmt, data)
+        info = wavefile.parse_header(self.input_file)
+        self.assertTrue(info.floating)
+        self.assertEqual(info.bytedepth, 8)
+        self.assertEqual(info.channel_mask, 0x3)
+        np.testing.assert_array_equal(
+            wavefile.MappedWave(self.input_file).read(0, 10), self.signal)
+
+    def test_parse_header_rf64(self):
+        data = pcm.encode(self.signal, 2).tobytes()
+        fmt = struct.pack('<HHIIHH', wavefile.WAVE_FORMAT_PCM, 2,
+                          self.samplerate, self.samplerate * 4, 4, 16)
+        # Declare fewer samples in ds64 than are present.
+        ds64 = struct.pack('<QQQI', 0, 8, 2, 0)
+        self._write_chunks(b'RF64', fmt, data, ds64=ds64)
+        info = wavefile.parse_header(self.input_file)
+        self.assertEqual(info.num_samples, 2)
+        np.testing.assert_array_equal(
+            wavefile.MappedWave(self.input_file).read(0, 10), self.signal[:2])
+
+    def test_read(self):
+        for bytedepth, floating in [(1, False), (2, False), (3, False),
+                                    (4, False), (4, True), (8, True)]:
+            self._write(bytedepth, floating)
+            mapped = wavefile.MappedWave(self.input_file)
+            self.assertEqual(mapped.samples.shape, self.signal.shape)
+            np.testing.assert_array_equal(mapped.read(0, 10), self.signal)
+            np.testing.assert_array_equal(mapped.read(1, 2),
+                                          self.signal[1:3])
+            mapped.close()
+
+    def test_read_view(self):
+        self._write(2)
+        mapped = wavefile.MappedWave(self.input_file)
+        frame = mapped.read(1, 2, dtype=np.int16)
+        self.assertTrue(np.shares_memory(frame, mapped.samples))
+        np.testing.assert_array_equal(frame, self.signal[1:3] * 2 ** 15)
+
+    def test_read_frames(self):
+        padded = np.concatenate([np.zeros([2, 2]), self.signal,
+                                 np.zeros([6, 2])])
+        for bytedepth, floating in [(1, False), (3, False), (4, True)]:
+            self._write(bytedepth, floating)
+            mapped = wavefile.MappedWave(self.input_file)
+            for framesize in [2, 6]:
+                indices = [2, -1, 0, 3, -2, 1]
+                frames = mapped.read_frames(indices, framesize)
+                self.assertEqual(frames.shape, (len(indices), framesize, 2))
+                for frame, index in zip(frames, indices):
+                    np.testing.assert_array_equal(
+                        frame, padded[index + 2:index + 2 + framesize])
+            mapped.close()
+
+    def test_read_empty(self):
+        writer = wavefile.WaveWriter(self.input_file, self.samplerate,
+                                     channels=2, bytedepth=2)
+        writer.close()
+        mapped = wavefile.MappedWave(self.input_file)
+        self.assertEqual(mapped.read(0, 10).shape, (0, 2))
+
+
+if __name__ == "__main__":
+    unittest.main()
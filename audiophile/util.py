@@ -1,10 +1,11 @@
 """Utility methods for claudio."""
 
 import numpy as np
-import struct
 import tempfile as tmp
 import wave
 
+import audiophile.pcm as pcm
+
 
 def byte_string_to_array(byte_string, channels, bytedepth):
     """Convert a byte string into a numpy array.
@@ -25,20 +26,7 @@ def byte_string_to_array(byte_string, channels, bytedepth):
     array : np.ndarray of floats
         array with shape (num_samples, channels), bounded on [-1.0, 1.0)
     """
-    # Number of values per channel.
-    N = int(len(byte_string) / channels / bytedepth)
-    # Assume 2-byte encoding.
-    fmt = 'h'
-    if bytedepth == 3:
-        tmp = list(byte_string)
-        byte_string = "".join(
-            [tmp.insert(n * 4 + 3, struct.pack('b', 0)) for n in range(N)])
-
-    if bytedepth in [3, 4]:
-        fmt = "i"
-
-    array = np.array(struct.unpack('%d%s' % (N, fmt) * channels, byte_string))
-    return array.reshape([N, int(channels)]) / (2.0 ** (8 * bytedepth - 1))
+    return pcm.decode(byte_string, channels=channels, bytedepth=bytedepth)
 
 
 def array_to_byte_string(array, bytedepth):
@@ -62,20 +50,7 @@ def array_to_byte_string(array, bytedepth):
         array = array[:, np.newaxis]
     if not array.ndim == 2:
         raise ValueError("Arg 'array' must satisfy array.ndim in [1, 2].")
-    if bytedepth == 3:
-        # TODO: Fix this.
-        raise ValueError("Known error writing bytedepth=3 strings.")
-
-    channels = array.shape[1]
-    # Number of total values.
-    N = array.shape[0] * channels
-    data = (array.flatten() * np.power(2.0, 8 * bytedepth - 1)).astype(int)
-    # Assume 2-byte
-    fmt = "h"
-    if bytedepth in [3, 4]:
-        fmt = "i"
-
-    return struct.pack("%d%s" % (N, fmt), *data)
+    return pcm.encode(array, bytedepth).tobytes()
 
 
 def temp_file(ext):
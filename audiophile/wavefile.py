@@ -0,0 +1,709 @@
+"""Native reading and writing of RIFF/WAVE files."""
+
+import collections
+import numpy as np
+import os
+import struct
+
+import audiophile.pcm as pcm
+
+WAVE_FORMAT_PCM = 0x0001
+WAVE_FORMAT_IEEE_FLOAT = 0x0003
+WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+
+# Chunk sizes of RF64 / BW64 files are stored in a ds64 chunk when they
+# overflow 32 bits, in which case the 32-bit field holds this value.
+RF64_SIZE_MARKER = 0xFFFFFFFF
+
+# Number of bytes copied at a time where the kernel cannot copy ranges.
+COPY_SIZE = 2 ** 20
+
+# Sample format and data chunk location of an uncompressed audio file.
+WaveInfo = collections.namedtuple(
+    'WaveInfo', ['samplerate', 'channels', 'bytedepth', 'floating',
+                 'data_offset', 'num_samples', 'byteorder', 'signed',
+                 'channel_mask'])
+
+
+def _sample_dtype(info):
+    """Numpy dtype of a single stored sample."""
+    if info.floating:
+        dtype = pcm.FLOAT_DTYPES[info.bytedepth]
+    elif info.bytedepth == 3:
+        # No native 24-bit type; keep the packed bytes opaque.
+        return np.dtype('V3')
+    elif info.bytedepth == 1 and info.signed:
+        dtype = np.int8
+    else:
+        dtype = pcm.INT_DTYPES[info.bytedepth]
+    return np.dtype(dtype).newbyteorder(info.byteorder)
+
+
+def _copy_range(src, dst, offset, num_bytes):
+    """Copy a byte range of one file to the current position of another.
+
+    Uses `os.copy_file_range` where available, such that data need not pass
+    through user space (or is even shared, on filesystems with reflinks).
+
+    Parameters
+    ----------
+    src : file
+        Source, opened for binary reading.
+
+    dst : file
+        Destination, opened for binary writing and positioned for the copy.
+
+    offset : int
+        Position in `src` of the first byte to copy.
+
+    num_bytes : int
+        Number of bytes to copy.
+    """
+    dst.flush()
+    position = dst.tell()
+    end = position + num_bytes
+    copy_file_range = getattr(os, 'copy_file_range', None)
+    while position < end:
+        count = 0
+        if copy_file_range is not None:
+            try:
+                count = copy_file_range(src.fileno(), dst.fileno(),
+                                        end - position, offset, position)
+            except OSError:
+                # E.g. unsupported by the filesystem; copy in user space.
+                copy_file_range = None
+                continue
+        else:
+            src.seek(offset)
+            data = src.read(min(COPY_SIZE, end - position))
+            dst.seek(position)
+            dst.write(data)
+            count = len(data)
+        if not count:
+            raise ValueError("Unexpected end of file at byte {}"
+                             "".format(offset))
+        offset += count
+        position += count
+    dst.seek(position)
+
+
+def _iter_chunks(fp):
+    """Iterate over the chunks of a RIFF file, through the data chunk.
+
+    Parameters
+    ----------
+    fp : file
+        Binary file, positioned after the 12-byte RIFF header.
+
+    Yields
+    ------
+    chunk_id, chunk_size, offset : bytes, int, int
+        Identifier and size of each chunk, and the position of its body.
+    """
+    while True:
+        chunk_header = fp.read(8)
+        if len(chunk_header) < 8:
+            return
+        chunk_id, chunk_size = struct.unpack('<4sI', chunk_header)
+        offset = fp.tell()
+        yield chunk_id, chunk_size, offset
+        if chunk_id == b'data':
+            return
+        fp.seek(offset + chunk_size + chunk_size % 2)
+
+
+def parse_header(filepath):
+    """Parse the header of a RIFF/WAVE, RF64 or BW64 file.
+
+    Integer PCM and IEEE float samples are supported, either directly or as
+    the subformat of a WAVE_FORMAT_EXTENSIBLE header.
+
+    Parameters
+    ----------
+    filepath : str
+        Path to a wave file.
+
+    Returns
+    -------
+    info : WaveInfo
+        Sample format and location of the data chunk.
+
+    Raises
+    ------
+    ValueError
+        If the file is not a wave file this module can read.
+    """
+    file_size = os.path.getsize(filepath)
+    fmt, ds64 = None, None
+    with open(filepath, 'rb') as fp:
+        riff = fp.read(12)
+        if len(riff) < 12 or riff[:4] not in [b'RIFF', b'RF64', b'BW64'] or \
+                riff[8:] != b'WAVE':
+            raise ValueError("Not a RIFF/WAVE file: {}".format(filepath))
+
+        data_offset = None
+        for chunk_id, chunk_size, offset in _iter_chunks(fp):
+            if chunk_id == b'ds64':
+                ds64 = fp.read(chunk_size)
+                if len(ds64) < 24:
+                    raise ValueError("Truncated ds64 chunk: {}"
+                                     "".format(filepath))
+            elif chunk_id == b'fmt ':
+                fmt = fp.read(chunk_size)
+                if len(fmt) < 16:
+                    raise ValueError("Truncated fmt chunk: {}"
+                                     "".format(filepath))
+            elif chunk_id == b'data':
+                data_offset = offset
+
+    if data_offset is None:
+        raise ValueError("No data chunk found: {}".format(filepath))
+    if fmt is None:
+        raise ValueError("No fmt chunk before data: {}".format(filepath))
+
+    (format_tag, channels, samplerate,
+     _, block_align, bits) = struct.unpack('<HHIIHH', fmt[:16])
+    channel_mask = None
+    if format_tag == WAVE_FORMAT_EXTENSIBLE:
+        if len(fmt) < 40:
+            raise ValueError("Truncated extensible fmt chunk: {}"
+                             "".format(filepath))
+        # The subformat GUID begins with the equivalent format tag.
+        _, channel_mask, format_tag = struct.unpack('<HIH', fmt[18:26])
+
+    floating = format_tag == WAVE_FORMAT_IEEE_FLOAT
+    bytedepth = (bits + 7) // 8
+    if format_tag not in [WAVE_FORMAT_PCM, WAVE_FORMAT_IEEE_FLOAT]:
+        raise ValueError("Unsupported format tag 0x{:04x}: {}"
+                         "".format(format_tag, filepath))
+    elif floating and bytedepth not in pcm.FLOAT_DTYPES:
+        raise ValueError("Unsupported float bitdepth {}: {}"
+                         "".format(bits, filepath))
+    elif not floating and bytedepth not in [1, 2, 3, 4]:
+        raise ValueError("Unsupported bitdepth {}: {}".format(bits, filepath))
+    elif not channels or block_align != channels * bytedepth:
+        raise ValueError("Invalid block alignment: {}".format(filepath))
+
+    if chunk_size == RF64_SIZE_MARKER and ds64 is not None:
+        # The true data size: (riff_size, data_size, sample_count, ...).
+        chunk_size = struct.unpack('<QQQ', ds64[:24])[1]
+
+    # Truncated files are common; trust the file size over the header.
+    data_size = min(chunk_size, file_size - data_offset)
+    return WaveInfo(samplerate=samplerate, channels=channels,
+                    bytedepth=bytedepth, floating=floating,
+                    data_offset=data_offset,
+                    num_samples=data_size // block_align,
+                    byteorder='<', signed=bytedepth != 1,
+                    channel_mask=channel_mask)
+
+
+def pack_header(samplerate, channels, bytedepth, floating=False,
+                num_samples=0, rf64=False):
+    """Pack a canonical WAVE header for the given sample format.
+
+    Parameters
+    ----------
+    samplerate : scalar
+        Samplerate of the audio data.
+
+    channels : int
+        Number of interleaved channels.
+
+    bytedepth : int
+        Bytes per sample.
+
+    floating : bool, default=False
+        If True, describe IEEE float samples rather than integer PCM.
+
+    num_samples : int, default=0
+        Number of samples (per channel) in the data chunk.
+
+    rf64 : bool, default=False
+        If True, write an RF64 header, whose 64-bit sizes are held in a ds64
+        chunk; required for data of 4 GiB or more.
+
+    Returns
+    -------
+    header : bytes
+        Everything preceding the sample data, through the data chunk size.
+
+    Raises
+    ------
+    ValueError
+        If the data is too large for a RIFF header, and `rf64` is False.
+    """
+    block_align = channels * bytedepth
+    data_size = num_samples * block_align
+    format_tag = WAVE_FORMAT_IEEE_FLOAT if floating else WAVE_FORMAT_PCM
+    fmt_chunk = struct.pack('<HHIIHH', format_tag, channels,
+                            int(round(samplerate)),
+                            int(round(samplerate)) * block_align,
+                            block_align, bytedepth * 8)
+    if floating:
+        # Non-PCM formats carry an (empty) extension and a fact chunk.
+        fmt_chunk += struct.pack('<H', 0)
+    chunks = [b'fmt ' + struct.pack('<I', len(fmt_chunk)) + fmt_chunk]
+    if floating:
+        chunks.append(b'fact' + struct.pack(
+            '<II', 4, min(num_samples, RF64_SIZE_MARKER)))
+    if not rf64:
+        body = b'WAVE' + b''.join(chunks)
+        riff_size = len(body) + 8 + data_size + (data_size % 2)
+        if riff_size > RF64_SIZE_MARKER:
+            raise ValueError("{} bytes of data exceed the RIFF size limit"
+                             "".format(data_size))
+        return b'RIFF' + struct.pack('<I', riff_size) + body + \
+            b'data' + struct.pack('<I', data_size)
+
+    chunks.append(b'data' + struct.pack('<I', RF64_SIZE_MARKER))
+    # The ds64 chunk precedes all others, and its size is fixed.
+    body_size = 4 + 36 + sum(len(chunk) for chunk in chunks)
+    riff_size = body_size + data_size + (data_size % 2)
+    ds64 = b'ds64' + struct.pack('<IQQQI', 28, riff_size, data_size,
+                                 num_samples, 0)
+    return b'RF64' + struct.pack('<I', RF64_SIZE_MARKER) + b'WAVE' + \
+        ds64 + b''.join(chunks)
+
+
+class WaveWriter(object):
+    """Incrementally encode sample blocks to a WAVE file."""
+
+    def __init__(self, filepath, samplerate, channels, bytedepth,
+                 floating=False, rf64=False, append=False):
+        """Open a WAVE file for writing.
+
+        The writer may be used as a context manager, closing the file on exit.
+
+        Parameters
+        ----------
+        filepath : str
+            Path to the output file; any existing file is overwritten, unless
+            appending.
+
+        samplerate : scalar
+            Samplerate of the audio data.
+
+        channels : int
+            Number of channels to write.
+
+        bytedepth : int
+            Bytes per sample; one of [1, 2, 3, 4] for integer data, or [4, 8]
+            for floating-point data.
+
+        floating : bool, default=False
+            If True, write IEEE float samples rather than integer PCM.
+
+        rf64 : bool, default=False
+            If True, write an RF64 file, which may hold 4 GiB or more of
+            data; see `pack_header`.
+
+        append : bool, default=False
+            If True and `filepath` exists, append samples to its data chunk;
+            only the size fields of its header are updated. The file must be
+            in the given sample format, and end with its data chunk. Whether
+            the file is RF64 is then determined by the file itself.
+
+        Raises
+        ------
+        ValueError
+            If an existing file cannot be appended to in this format.
+        """
+        self._handle = None
+        if floating and bytedepth not in pcm.FLOAT_DTYPES:
+            raise ValueError("Unsupported float bytedepth: {}"
+                             "".format(bytedepth))
+        elif not floating and bytedepth not in [1, 2, 3, 4]:
+            raise ValueError("Unsupported bytedepth: {}".format(bytedepth))
+
+        self._filepath = filepath
+        self._samplerate = samplerate
+        self._channels = int(channels)
+        self._bytedepth = int(bytedepth)
+        self._floating = floating
+        self._rf64 = rf64
+        self._num_samples = 0
+        self._dtype = _sample_dtype(WaveInfo(
+            samplerate=samplerate, channels=channels, bytedepth=bytedepth,
+            floating=floating, data_offset=0, num_samples=0, byteorder='<',
+            signed=bytedepth != 1, channel_mask=None))
+        if append and os.path.exists(filepath) and os.path.getsize(filepath):
+            self._open_append()
+        else:
+            self._handle = open(filepath, 'w+b')
+            self._handle.write(pack_header(samplerate, channels, bytedepth,
+                                           floating, rf64=rf64))
+            self._locate_header()
+
+    def _locate_header(self):
+        """Find the size fields of the file's header, to patch on close.
+
+        Returns
+        -------
+        data_size : int
+            Size of the data chunk, as declared by the header.
+        """
+        self._handle.seek(12)
+        self._ds64_offset, self._fact_offset = None, None
+        data_size = 0
+        for chunk_id, chunk_size, offset in _iter_chunks(self._handle):
+            if chunk_id == b'ds64':
+                self._ds64_offset = offset
+                data_size = struct.unpack('<Q', self._handle.read(16)[8:])[0]
+            elif chunk_id == b'fact':
+                self._fact_offset = offset
+            elif chunk_id == b'data':
+                self._data_offset = offset
+                if chunk_size != RF64_SIZE_MARKER or \
+                        self._ds64_offset is None:
+                    data_size = chunk_size
+        self._rf64 = self._ds64_offset is not None
+        self._handle.seek(0, os.SEEK_END)
+        return data_size
+
+    def _open_append(self):
+        """Open an existing file, positioned at the end of its samples."""
+        info = parse_header(self._filepath)
+        if not self.can_copy(info):
+            raise ValueError("Cannot append to a file of a different format: "
+                             "{}".format(self._filepath))
+        self._handle = open(self._filepath, 'r+b')
+        data_size = self._locate_header()
+        if self._data_offset + data_size + data_size % 2 < \
+                self._handle.tell():
+            self._handle.close()
+            self._handle = None
+            raise ValueError("Cannot append to a file with chunks after its "
+                             "data: {}".format(self._filepath))
+        # Drop any pad byte or partial sample frame.
+        self._num_samples = info.num_samples
+        self._handle.truncate(
+            self._data_offset + info.num_samples * self._block_align)
+        self._handle.seek(0, os.SEEK_END)
+
+    @property
+    def _block_align(self):
+        return self._channels * self._bytedepth
+
+    def _reserve(self, num_samples):
+        """Check that `num_samples` more samples fit in the file's header."""
+        data_size = (self._num_samples + num_samples) * self._block_align
+        if not self._rf64 and self._data_offset - 8 + data_size + \
+                data_size % 2 > RF64_SIZE_MARKER:
+            raise ValueError("{} bytes of data exceed the RIFF size limit"
+                             "".format(data_size))
+
+    def _patch_header(self):
+        """Write the current sizes to the header, in place."""
+        data_size = self._num_samples * self._block_align
+        riff_size = self._data_offset - 8 + data_size + data_size % 2
+        position = self._handle.tell()
+        if self._rf64:
+            self._handle.seek(self._ds64_offset)
+            self._handle.write(struct.pack('<QQQ', riff_size, data_size,
+                                           self._num_samples))
+            riff_size = data_size = RF64_SIZE_MARKER
+        self._handle.seek(4)
+        self._handle.write(struct.pack('<I', riff_size))
+        self._handle.seek(self._data_offset - 4)
+        self._handle.write(struct.pack('<I', data_size))
+        if self._fact_offset is not None:
+            self._handle.seek(self._fact_offset)
+            self._handle.write(struct.pack(
+                '<I', min(self._num_samples, RF64_SIZE_MARKER)))
+        self._handle.seek(position)
+
+    def write(self, array):
+        """Encode and append a block of samples.
+
+        Parameters
+        ----------
+        array : np.ndarray
+            Array with shape (num_samples, channels); a 1D array is treated as
+            a single channel.
+        """
+        array = np.asarray(array)
+        if array.ndim == 1:
+            array = array[:, np.newaxis]
+        if array.ndim != 2 or array.shape[1] != self._channels:
+            raise ValueError("Expected an array shaped (N, {}), received {}"
+                             "".format(self._channels, array.shape))
+        self._reserve(array.shape[0])
+        self._handle.write(pcm.encode(array, self._bytedepth, self._floating))
+        self._num_samples += array.shape[0]
+
+    def write_samples(self, samples):
+        """Append samples already in the stored format, without encoding.
+
+        Parameters
+        ----------
+        samples : np.ndarray
+            Array shaped (num_samples, channels), e.g. a slice of the
+            `samples` of a MappedWave satisfying `can_copy`.
+        """
+        if samples.ndim != 2 or samples.shape[1] != self._channels or \
+                samples.dtype != self._dtype:
+            raise ValueError("Expected {} samples shaped (N, {}), received {} "
+                             "shaped {}".format(self._dtype, self._channels,
+                                                samples.dtype, samples.shape))
+        self._reserve(samples.shape[0])
+        self._handle.write(np.ascontiguousarray(samples).tobytes())
+        self._num_samples += samples.shape[0]
+
+    def can_copy(self, info):
+        """True if samples described by `info` can be copied verbatim.
+
+        Parameters
+        ----------
+        info : WaveInfo
+            Sample format of a source file.
+        """
+        return (info.samplerate == self._samplerate and
+                info.channels == self._channels and
+                info.bytedepth == self._bytedepth and
+                info.floating == self._floating and
+                info.byteorder == '<' and info.signed == (info.bytedepth != 1))
+
+    def copy_samples(self, filepath, info):
+        """Append the samples of a file without decoding them.
+
+        Parameters
+        ----------
+        filepath : str
+            Path to the source file.
+
+        info : WaveInfo
+            Location of the samples to copy, whose format must satisfy
+            `can_copy`; e.g. the `info` of a MappedWave window.
+        """
+        if not self.can_copy(info):
+            raise ValueError("Cannot copy samples of a different format: {}"
+                             "".format(info))
+        self._reserve(info.num_samples)
+        with open(filepath, 'rb') as src:
+            _copy_range(src, self._handle, info.data_offset,
+                        info.num_samples * info.channels * info.bytedepth)
+        self._num_samples += info.num_samples
+
+    def flush(self):
+        """Update the header and flush written samples to disk.
+
+        The file is then readable as it stands, e.g. should a long recording
+        be interrupted.
+        """
+        self._patch_header()
+        self._handle.flush()
+
+    def close(self):
+        """Finalize the header and close the file."""
+        if self._handle is None:
+            return
+        if self._num_samples * self._block_align % 2:
+            # RIFF chunks are word-aligned.
+            self._handle.write(b'\x00')
+        self._patch_header()
+        self._handle.close()
+        self._handle = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __del__(self):
+        self.close()
+
+    @property
+    def filepath(self):
+        return self._filepath
+
+    @property
+    def num_samples(self):
+        return self._num_samples
+
+    @property
+    def samplerate(self):
+        return self._samplerate
+
+    @property
+    def channels(self):
+        return self._channels
+
+    def getframerate(self):
+        return self._samplerate
+
+    def getnchannels(self):
+        return self._channels
+
+    def getsampwidth(self):
+        return self._bytedepth
+
+    def getnframes(self):
+        return self._num_samples
+
+
+class MappedWave(object):
+    """Read-only, memory-mapped access to the samples of a wave file.
+
+    Any uncompressed file described by a `WaveInfo`, e.g. from
+    `aifffile.parse_header`, may be mapped in the same way.
+
+    Provides the subset of the `wave.Wave_read` interface used by
+    `audiophile.fileio`, plus random access decoding via `read`.
+    """
+
+    def __init__(self, filepath, info=None, start=0, stop=None):
+        """Map a wave file into memory.
+
+        Parameters
+        ----------
+        filepath : str
+            Path to a wave file.
+
+        info : WaveInfo, default=None
+            Pre-parsed header; parsed from the file if not given.
+
+        start : int, default=0
+            First sample of the file to map.
+
+        stop : int, default=None
+            Sample index at which to stop mapping; defaults to the end of the
+            file. Only [start, stop) is visible through this object.
+        """
+        self._filepath = filepath
+        info = info if info is not None else parse_header(filepath)
+        start = min(max(int(start), 0), info.num_samples)
+        stop = info.num_samples if stop is None else int(stop)
+        stop = min(max(stop, start), info.num_samples)
+        block_align = info.channels * info.bytedepth
+        self._info = info._replace(
+            data_offset=info.data_offset + start * block_align,
+            num_samples=stop - start)
+        dtype = _sample_dtype(self._info)
+        shape = (self._info.num_samples, self._info.channels)
+        if self._info.num_samples:
+            self._samples = np.memmap(filepath, dtype=dtype, mode='r',
+                                      offset=self._info.data_offset,
+                                      shape=shape)
+        else:
+            # Empty files cannot be mapped.
+            self._samples = np.zeros(shape, dtype=dtype)
+
+    @property
+    def info(self):
+        return self._info
+
+    @property
+    def samples(self):
+        """Raw, memory-mapped samples, shaped (num_samples, channels)."""
+        return self._samples
+
+    def read(self, start, count, dtype=np.float64, out=None):
+        """Decode up to `count` samples beginning at `start`.
+
+        Parameters
+        ----------
+        start : int
+            Index of the first sample, on [0, num_samples].
+
+        count : int
+            Maximum number of samples to decode; fewer are returned at the end
+            of the file.
+
+        dtype : np.dtype, default=np.float64
+            Data type of the returned array; see `pcm.decode`.
+
+        out : np.ndarray, default=None
+            If given, decode into this array, which must have shape
+            (N, channels) for the number of samples N actually available.
+
+        Returns
+        -------
+        samples : np.ndarray
+            Array with shape (N, channels), for N <= count. When `dtype`
+            matches the stored format this is a read-only view of the file.
+        """
+        return pcm.decode(self._samples[start:start + count],
+                          channels=self._info.channels,
+                          bytedepth=self._info.bytedepth,
+                          dtype=dtype, floating=self._info.floating, out=out,
+                          byteorder=self._info.byteorder,
+                          signed=self._info.signed)
+
+    def read_frames(self, start_indices, framesize, dtype=np.float64):
+        """Decode frames beginning at arbitrary sample indices.
+
+        Frames within the file are gathered with a single fancy index over
+        the mapped samples, and decoded at once.
+
+        Parameters
+        ----------
+        start_indices : np.ndarray, dtype=int
+            Index of the first sample of each frame; may be unordered, and
+            may fall outside the bounds of the file.
+
+        framesize : int
+            Number of samples per frame.
+
+        dtype : np.dtype, default=np.float64
+            Data type of the returned array; see `pcm.decode`.
+
+        Returns
+        -------
+        frames : np.ndarray
+            Array with shape (len(start_indices), framesize, channels), with
+            zeros wherever a frame falls outside the file.
+        """
+        framesize = int(framesize)
+        start_indices = np.asarray(start_indices, dtype=np.int64)
+        samples = np.asarray(self._samples)
+        num_samples, channels = samples.shape
+        frames = np.zeros([len(start_indices), framesize, channels],
+                          dtype=dtype)
+
+        inner = (start_indices >= 0) & (start_indices + framesize <=
+                                         num_samples)
+        if inner.any():
+            windows = np.lib.stride_tricks.as_strided(
+                samples, shape=(num_samples - framesize + 1, framesize,
+                                channels),
+                strides=(samples.strides[0],) + samples.strides,
+                writeable=False)
+            raw = windows[start_indices[inner]]
+            if inner.all():
+                self._decode(raw, dtype, out=frames.reshape(-1, channels))
+            else:
+                frames[inner] = self._decode(raw, dtype).reshape(
+                    -1, framesize, channels)
+
+        # Frames overlapping either end of the file.
+        edges = np.flatnonzero(~inner)
+        indices = start_indices[edges, np.newaxis] + np.arange(framesize)
+        rows, cols = np.nonzero((indices >= 0) & (indices < num_samples))
+        if len(rows):
+            frames[edges[rows], cols] = self._decode(
+                samples[indices[rows, cols]], dtype)
+        return frames
+
+    def _decode(self, raw, dtype, out=None):
+        return pcm.decode(raw, channels=self._info.channels,
+                          bytedepth=self._info.bytedepth, dtype=dtype,
+                          floating=self._info.floating, out=out,
+                          byteorder=self._info.byteorder,
+                          signed=self._info.signed)
+
+    def close(self):
+        self._samples = None
+
+    def getframerate(self):
+        return self._info.samplerate
+
+    def getnchannels(self):
+        return self._info.channels
+
+    def getsampwidth(self):
+        return self._info.bytedepth
+
+    def getnframes(self):
+        return self._info.num_samples
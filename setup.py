@@ -32,6 +32,8 @@ setup(
         'numpy >= 1.8.0',
         'nose',
         'six',
-        'pyyaml'
+        'pyyaml',
+        # Backport of concurrent.futures.
+        'futures; python_version < "3"'
     ]
 )